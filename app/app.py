@@ -5,9 +5,16 @@ from flask import Flask
 from flask_cors import CORS
 
 from app import jwt_handlers
-from app.extensions import database, jwt
+from app.commands import create_indexes_command, create_schema_command, \
+    export_applications_command, prune_changes_command, \
+    refresh_summaries_command
+from app.extensions import applications_cache, compressor, database, \
+    event_broker, jwt, log_queue, replica_router, request_metrics
+from app.routes.admin_route import admin_bp
 from app.routes.applications_route import applications_bp
 from app.routes.error_handler import handle_all_unhandled_exceptions
+from app.utilities.json_provider import InstrumentedJSONProvider
+from app.utilities.pool_metrics import instrument_engine_options
 
 
 def create_app() -> Flask:
@@ -16,13 +23,15 @@ def create_app() -> Flask:
 
     This function creates a new Flask application, configures it from a
     configuration file, sets up CORS, logging, extensions, and registers
-    blueprints. Also sets up a global error handler for unhandled exceptions.
+    blueprints and CLI commands. Also sets up a global error handler for
+    unhandled exceptions.
 
     :returns: The configured Flask application.
     """
 
     recruiter_api = Flask(__name__)
     recruiter_api.config.from_pyfile('config.py')
+    recruiter_api.json = InstrumentedJSONProvider(recruiter_api)
     recruiter_api.errorhandler(Exception)(handle_all_unhandled_exceptions)
 
     CORS(recruiter_api, resources={r"/api/*": {
@@ -31,6 +40,7 @@ def create_app() -> Flask:
     setup_logging(recruiter_api)
     setup_extensions(recruiter_api)
     register_blueprints(recruiter_api)
+    register_commands(recruiter_api)
 
     return recruiter_api
 
@@ -41,7 +51,9 @@ def setup_logging(recruiter_api: Flask) -> None:
 
     This function sets up logging for the Flask application. If LOG_TO_STDOUT
     is enabled in the configuration, it sets up logging to stdout. Otherwise,
-    it configures logging to a file.
+    it configures logging to a file. Unless LOG_QUEUE_ENABLED is disabled,
+    records are written by a background thread, so logging never blocks
+    the request threads.
 
     :param recruiter_api: The Flask application.
     """
@@ -51,20 +63,18 @@ def setup_logging(recruiter_api: Flask) -> None:
             'LOG_FORMAT',
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+    output_handler: logging.Handler
     if recruiter_api.config.get('LOG_TO_STDOUT'):
-        stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(log_level)
-        stream_handler.setFormatter(logging.Formatter(log_format))
-        logging.getLogger().addHandler(stream_handler)
+        output_handler = logging.StreamHandler()
     else:
         log_dir = recruiter_api.config.get('LOG_DIR', 'logs')
         os.makedirs(log_dir, exist_ok=True)
-        file_handler = logging.FileHandler(recruiter_api.config.get(
+        output_handler = logging.FileHandler(recruiter_api.config.get(
                 'LOG_FILE', os.path.join(log_dir, 'app.log')))
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(logging.Formatter(log_format))
-        logging.getLogger().addHandler(file_handler)
+    output_handler.setLevel(log_level)
+    output_handler.setFormatter(logging.Formatter(log_format))
 
+    log_queue.init_app(recruiter_api, output_handler)
     logging.getLogger().setLevel(log_level)
 
 
@@ -72,19 +82,34 @@ def setup_extensions(recruiter_api: Flask) -> None:
     """
     Sets up extensions for the Flask application.
 
-    This function initializes the database and JWT extensions for the Flask
-    application, and registers JWT error handlers. It also creates all
-    database tables.
+    This function initializes the database, JWT, applications cache,
+    request metrics, response compression and application events
+    extensions for the Flask application, and registers JWT error
+    handlers. Database connection pools record checkout metrics if the
+    database is pooled in a QueuePool, and repository reads are routed to
+    the read replica, if one is configured. No database connection is
+    opened until the first request needs one; tables are created by the
+    create-schema command.
 
     :param recruiter_api: The Flask application.
     """
 
+    database_url = recruiter_api.config.get('SQLALCHEMY_DATABASE_URI')
+    if database_url:
+        instrument_engine_options(recruiter_api.config.setdefault(
+                'SQLALCHEMY_ENGINE_OPTIONS', {}), database_url)
+    for bind in recruiter_api.config.get('SQLALCHEMY_BINDS', {}).values():
+        if isinstance(bind, dict) and 'url' in bind:
+            instrument_engine_options(bind, bind['url'])
+
     database.init_app(recruiter_api)
+    replica_router.init_app(recruiter_api, database)
     jwt.init_app(recruiter_api)
     jwt_handlers.register_jwt_handlers(jwt)
-
-    with recruiter_api.app_context():
-        database.create_all()
+    applications_cache.init_app(recruiter_api)
+    request_metrics.init_app(recruiter_api)
+    compressor.init_app(recruiter_api)
+    event_broker.init_app(recruiter_api, database)
 
 
 def register_blueprints(recruiter_api: Flask) -> None:
@@ -99,6 +124,47 @@ def register_blueprints(recruiter_api: Flask) -> None:
 
     recruiter_api.register_blueprint(
             applications_bp, url_prefix='/api/applications')
+    recruiter_api.register_blueprint(admin_bp, url_prefix='/api/admin')
+
+
+def register_commands(recruiter_api: Flask) -> None:
+    """
+    Registers CLI commands for the Flask application.
+
+    This function registers the maintenance commands that can be run with
+    'flask --app app.app:create_app <command>'.
+
+    :param recruiter_api: The Flask application.
+    """
+
+    recruiter_api.cli.add_command(create_schema_command)
+    recruiter_api.cli.add_command(create_indexes_command)
+    recruiter_api.cli.add_command(refresh_summaries_command)
+    recruiter_api.cli.add_command(prune_changes_command)
+    recruiter_api.cli.add_command(export_applications_command)
+
+
+def reset_after_fork(recruiter_api: Flask) -> None:
+    """
+    Prepares an application created before forking for a worker process.
+
+    When gunicorn preloads the application, every worker inherits the
+    engines, the log queue and the caches of the master process. This
+    function drops the inherited pool connections without closing them,
+    as they belong to the master, restarts the log queue listener, whose
+    thread does not survive the fork, and discards the compile executor
+    and the application events listener for the same reason. It must be
+    called in the worker right after the fork.
+
+    :param recruiter_api: The Flask application.
+    """
+
+    with recruiter_api.app_context():
+        for engine in database.engines.values():
+            engine.dispose(close=False)
+    log_queue.after_fork()
+    event_broker.after_fork()
+    recruiter_api.extensions.pop('compile_executor', None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+import logging
+import os
+from typing import Optional
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import Connection, Engine, Index, MetaData, Table, \
+    create_mock_engine, inspect
+from sqlalchemy.schema import CreateIndex
+
+from app.extensions import database
+from app.services.change_service import prune_changes
+from app.services.export_service import EXCLUDABLE_COLUMNS, \
+    EXPORT_FORMATS, export_applications
+from app.services.summary_service import refresh_application_summaries
+
+
+def create_missing_tables() -> list[str]:
+    """
+    Creates the tables declared on the models that are missing in the
+    database.
+
+    Existing tables are left unchanged, and the read replica, if any, is
+    not touched. The triggers recording the change log are (re)created on
+    every run. The application does not create tables when it starts, so
+    this function has to run before the first deployment of a new model,
+    e.g. in the release phase.
+
+    :returns: The names of the created tables.
+    """
+
+    existing_tables = set(inspect(database.engine).get_table_names())
+    database.create_all(bind_key=None)
+    return [table.name for table in database.metadata.sorted_tables
+            if table.name not in existing_tables]
+
+
+def create_missing_indexes() -> list[str]:
+    """
+    Creates the indexes declared on the models that are missing in the
+    database.
+
+    Tables created by create_all already have all indexes, but tables that
+    existed before an index was declared do not. This function adds the
+    missing ones to existing tables. On PostgreSQL the indexes are built
+    concurrently, so the tables stay writable for other services while the
+    indexes are built. Indexes restricted to other database dialects are
+    skipped.
+
+    :returns: The names of the created indexes.
+    """
+
+    engine = database.engine
+    concurrently = engine.dialect.name == 'postgresql'
+    inspector = inspect(engine)
+    created_indexes = []
+
+    with engine.connect().execution_options(
+            isolation_level='AUTOCOMMIT') as connection:
+        for table in database.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_indexes = {index['name'] for index in
+                                inspector.get_indexes(table.name)}
+            indexes = sorted(table.indexes, key=lambda index: str(index.name))
+            for index in indexes:
+                if index.name in existing_indexes:
+                    continue
+
+                if create_index(connection, table, index, concurrently):
+                    logging.info('Created index %s on %s',
+                                 index.name, table.name)
+                    created_indexes.append(str(index.name))
+
+    return created_indexes
+
+
+def create_index(connection: Connection, table: Table, index: Index,
+                 concurrently: bool) -> bool:
+    """
+    Creates an index unless it already exists.
+
+    Like create_all, this function honours the ddl_if condition of the
+    index, so indexes declared for other database dialects are not created.
+    The index is built from a copy of its table, so building it
+    concurrently leaves the metadata of the models unchanged.
+
+    :param connection: The connection to create the index with. Must be in
+           autocommit mode if the index is built concurrently.
+    :param table: The table of the index.
+    :param index: The index to create.
+    :param concurrently: Whether to build the index concurrently, which is
+           only supported on PostgreSQL.
+    :returns: Whether the index applies to the database dialect.
+    """
+
+    if not _applies_to(index, connection.engine):
+        return False
+
+    copied_table = table.to_metadata(
+            MetaData(naming_convention=table.metadata.naming_convention))
+    copy = next(copied for copied in copied_table.indexes
+                if copied.name == index.name)
+    copy.dialect_options['postgresql']['concurrently'] = concurrently
+    connection.execute(CreateIndex(copy, if_not_exists=True))
+    return True
+
+
+@click.command('create-schema')
+@with_appcontext
+def create_schema_command() -> None:
+    """
+    Creates the missing tables of the models.
+    """
+
+    created_tables = create_missing_tables()
+    if created_tables:
+        click.echo(f'Created tables: {", ".join(created_tables)}')
+    else:
+        click.echo('All tables already exist.')
+
+
+@click.command('create-indexes')
+@with_appcontext
+def create_indexes_command() -> None:
+    """
+    Adds missing model indexes to an existing database.
+    """
+
+    created_indexes = create_missing_indexes()
+    if created_indexes:
+        click.echo(f'Created indexes: {", ".join(created_indexes)}')
+    else:
+        click.echo('All indexes already exist.')
+
+
+@click.command('refresh-summaries')
+@with_appcontext
+def refresh_summaries_command() -> None:
+    """
+    Recompiles the application summaries, e.g. from a scheduler.
+    """
+
+    state = refresh_application_summaries()
+    click.echo(f'Refreshed application summaries at {state.refreshed_at}.')
+
+
+@click.command('prune-changes')
+@with_appcontext
+def prune_changes_command() -> None:
+    """
+    Deletes changes older than the retention period from the change log.
+    """
+
+    retention = current_app.config['APPLICATION_CHANGES_RETENTION_DAYS']
+    deleted = prune_changes()
+    click.echo(f'Deleted {deleted} changes older than {retention:g} days.')
+
+
+@click.command('export-applications')
+@click.option('--format', 'export_format', type=click.Choice(EXPORT_FORMATS),
+              default='csv', show_default=True, help='The file format.')
+@click.option('--output', type=click.Path(dir_okay=False), required=True,
+              help='The file to write.')
+@click.option('--exclude', type=click.Choice(EXCLUDABLE_COLUMNS),
+              multiple=True, help='A personal column to leave out.')
+@click.option('--chunk-size', type=click.IntRange(min=1),
+              help='The number of applications read at once.')
+@with_appcontext
+def export_applications_command(export_format: str, output: str,
+                                exclude: tuple[str, ...],
+                                chunk_size: Optional[int]) -> None:
+    """
+    Exports all applications to a CSV, Parquet or Arrow file.
+
+    The export is written to a temporary file next to the output, which
+    replaces the output only once the export is complete.
+    """
+
+    if chunk_size is None:
+        chunk_size = current_app.config['APPLICATIONS_EXPORT_CHUNK_SIZE']
+    try:
+        chunks = export_applications(export_format, chunk_size, exclude)
+    except ValueError as exception:
+        raise click.UsageError(exception.args[0])
+
+    partial_output = f'{output}.partial'
+    try:
+        with open(partial_output, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(partial_output, output)
+    finally:
+        if os.path.exists(partial_output):
+            os.remove(partial_output)
+    click.echo(f'Exported applications to {output}.')
+
+
+def _applies_to(index: Index, engine: Engine) -> bool:
+    """
+    Checks whether create_all would create an index on a database.
+
+    The index is created on a mock engine of the same dialect, which only
+    records the statements it would execute.
+
+    :param index: The index.
+    :param engine: The engine of the database.
+    :returns: Whether a statement creating the index was recorded.
+    """
+
+    statements = []
+    mock_engine = create_mock_engine(
+            engine.url, lambda statement, *args, **kwargs:
+            statements.append(statement))
+    index.create(mock_engine)
+    return bool(statements)
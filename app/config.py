@@ -2,6 +2,11 @@ import os
 
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET')
 JWT_IDENTITY_CLAIM = 'id'
+JWT_CLAIMS_CACHE_ENABLED = os.environ.get(
+        'JWT_CLAIMS_CACHE_ENABLED', 'true').lower() == 'true'
+JWT_CLAIMS_CACHE_TTL = float(os.environ.get('JWT_CLAIMS_CACHE_TTL', 60))
+JWT_CLAIMS_CACHE_MAX_ENTRIES = int(
+        os.environ.get('JWT_CLAIMS_CACHE_MAX_ENTRIES', 1024))
 
 database_url = os.environ.get('DATABASE_URL')
 if database_url and database_url.startswith('postgres://'):
@@ -9,14 +14,175 @@ if database_url and database_url.startswith('postgres://'):
             'postgres://', 'postgresql://', 1)
 
 SQLALCHEMY_DATABASE_URI = database_url
-SQLALCHEMY_POOL_SIZE = 2
-SQLALCHEMY_MAX_OVERFLOW = 1
+
+# An optional read replica of the database. Repository reads go to the
+# replica unless it lags more than DATABASE_REPLICA_MAX_LAG seconds behind
+# the primary, which is checked every DATABASE_REPLICA_LAG_CHECK_INTERVAL
+# seconds, or a connection to it failed within the last
+# DATABASE_REPLICA_RETRY_INTERVAL seconds.
+database_replica_url = os.environ.get('DATABASE_REPLICA_URL')
+if database_replica_url and database_replica_url.startswith('postgres://'):
+    database_replica_url = database_replica_url.replace(
+            'postgres://', 'postgresql://', 1)
+
+DATABASE_REPLICA_MAX_LAG = float(
+        os.environ.get('DATABASE_REPLICA_MAX_LAG', 5))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = float(
+        os.environ.get('DATABASE_REPLICA_LAG_CHECK_INTERVAL', 5))
+DATABASE_REPLICA_RETRY_INTERVAL = float(
+        os.environ.get('DATABASE_REPLICA_RETRY_INTERVAL', 30))
+
+# Each gunicorn worker process has its own pool, and each request holds at
+# most one connection at a time. The pool is therefore sized from the
+# requests a worker serves at once: its threads, or with gevent workers its
+# greenlets, of which there are at most GUNICORN_WORKER_CONNECTIONS. Most
+# greenlets wait on their clients rather than the database, like the
+# subscribers of the application events, so the default size is capped at
+# MAX_DEFAULT_POOL_SIZE, and further requests wait for a connection. It is
+# also capped by the share of DATABASE_MAX_CONNECTIONS available to one
+# worker, if set.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 2))
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 4))
+GUNICORN_WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+GUNICORN_WORKER_CONNECTIONS = int(
+        os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+DATABASE_MAX_CONNECTIONS = int(os.environ.get('DATABASE_MAX_CONNECTIONS', 0))
+
+if GUNICORN_WORKER_CLASS == 'gevent':
+    WORKER_CONCURRENCY = GUNICORN_WORKER_CONNECTIONS
+else:
+    WORKER_CONCURRENCY = GUNICORN_THREADS
+
+MAX_DEFAULT_POOL_SIZE = 20
+default_pool_size = min(WORKER_CONCURRENCY + 1, MAX_DEFAULT_POOL_SIZE)
+if DATABASE_MAX_CONNECTIONS:
+    default_pool_size = max(
+            1, min(default_pool_size,
+                   DATABASE_MAX_CONNECTIONS // WEB_CONCURRENCY - 1))
+
+SQLALCHEMY_POOL_SIZE = int(
+        os.environ.get('SQLALCHEMY_POOL_SIZE', default_pool_size))
+SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', 1))
+SQLALCHEMY_POOL_TIMEOUT = float(os.environ.get('SQLALCHEMY_POOL_TIMEOUT', 10))
+SQLALCHEMY_POOL_RECYCLE = int(os.environ.get('SQLALCHEMY_POOL_RECYCLE', 1800))
+SQLALCHEMY_POOL_PRE_PING = os.environ.get(
+        'SQLALCHEMY_POOL_PRE_PING', 'true').lower() == 'true'
+SQLALCHEMY_POOL_USE_LIFO = os.environ.get(
+        'SQLALCHEMY_POOL_USE_LIFO', 'true').lower() == 'true'
+
+# The QueuePool options are dropped for databases that are not pooled in a
+# QueuePool, like in-memory SQLite databases.
+SQLALCHEMY_ENGINE_OPTIONS = {
+    'pool_size': SQLALCHEMY_POOL_SIZE,
+    'max_overflow': SQLALCHEMY_MAX_OVERFLOW,
+    'pool_timeout': SQLALCHEMY_POOL_TIMEOUT,
+    'pool_recycle': SQLALCHEMY_POOL_RECYCLE,
+    'pool_pre_ping': SQLALCHEMY_POOL_PRE_PING,
+    'pool_use_lifo': SQLALCHEMY_POOL_USE_LIFO
+}
+
+# The replica gets a pool of its own with the same options.
+SQLALCHEMY_BINDS = {}
+if database_replica_url:
+    SQLALCHEMY_BINDS['replica'] = dict(SQLALCHEMY_ENGINE_OPTIONS,
+                                       url=database_replica_url)
+
+APPLICATIONS_DEFAULT_PAGE_SIZE = int(
+        os.environ.get('APPLICATIONS_DEFAULT_PAGE_SIZE', 50))
+APPLICATIONS_MAX_PAGE_SIZE = int(
+        os.environ.get('APPLICATIONS_MAX_PAGE_SIZE', 500))
+APPLICATIONS_STREAM_CHUNK_SIZE = int(
+        os.environ.get('APPLICATIONS_STREAM_CHUNK_SIZE', 1000))
+# Exports read this many applications at once through a server-side cursor,
+# and write each chunk as one Parquet row group or Arrow record batch.
+APPLICATIONS_EXPORT_CHUNK_SIZE = int(
+        os.environ.get('APPLICATIONS_EXPORT_CHUNK_SIZE', 5000))
+# 'bulk' loads all applicants with a constant number of queries. 'serial'
+# and 'threaded' look up each applicant on its own, isolating failures to
+# that applicant; 'threaded' spreads the lookups over worker threads, which
+# are capped to the connections the pool has left besides the request
+# threads.
+APPLICATIONS_COMPILE_MODE = os.environ.get(
+        'APPLICATIONS_COMPILE_MODE', 'bulk')
+APPLICATIONS_COMPILE_WORKERS = int(
+        os.environ.get('APPLICATIONS_COMPILE_WORKERS', 4))
+APPLICATIONS_READ_MODEL = os.environ.get('APPLICATIONS_READ_MODEL', 'live')
+APPLICATION_SUMMARY_REFRESH = os.environ.get(
+        'APPLICATION_SUMMARY_REFRESH', 'on_change')
+APPLICATION_SUMMARY_MAX_AGE = float(
+        os.environ.get('APPLICATION_SUMMARY_MAX_AGE', 300))
+MATCHING_DEFAULT_LIMIT = int(os.environ.get('MATCHING_DEFAULT_LIMIT', 10))
+# Triggers record every change of an application in the application_change
+# table. Changes older than APPLICATION_CHANGES_RETENTION_DAYS are removed,
+# and older changes tokens are rejected. Each worker prunes them in the
+# background at most every APPLICATION_CHANGES_PRUNE_INTERVAL seconds while
+# it serves application requests; 0 leaves pruning to the prune-changes
+# command.
+APPLICATION_CHANGES_RETENTION_DAYS = float(
+        os.environ.get('APPLICATION_CHANGES_RETENTION_DAYS', 7))
+APPLICATION_CHANGES_PRUNE_INTERVAL = float(
+        os.environ.get('APPLICATION_CHANGES_PRUNE_INTERVAL', 3600))
+# Application events are streamed to subscribers of the events endpoint,
+# which is meant to be served by gevent workers, where an idle subscriber
+# costs a greenlet. Otherwise each subscriber holds one of the threads of
+# its worker while it is connected, which limits a worker to
+# GUNICORN_THREADS - 1 subscribers. By default all but one of the threads or
+# greenlets of a worker may stream; a worker with a single thread accepts
+# no subscribers, which is logged at startup. 'auto' listens for the
+# notifications of PostgreSQL and uses an in-process broker on other
+# databases. Streams end after APPLICATION_EVENTS_MAX_DURATION
+# seconds and are kept alive by a comment every
+# APPLICATION_EVENTS_HEARTBEAT_INTERVAL seconds.
+APPLICATION_EVENTS_BROKER = os.environ.get('APPLICATION_EVENTS_BROKER', 'auto')
+APPLICATION_EVENTS_MAX_SUBSCRIBERS = int(os.environ.get(
+        'APPLICATION_EVENTS_MAX_SUBSCRIBERS', WORKER_CONCURRENCY - 1))
+APPLICATION_EVENTS_QUEUE_SIZE = int(
+        os.environ.get('APPLICATION_EVENTS_QUEUE_SIZE', 100))
+APPLICATION_EVENTS_HEARTBEAT_INTERVAL = float(
+        os.environ.get('APPLICATION_EVENTS_HEARTBEAT_INTERVAL', 15))
+APPLICATION_EVENTS_MAX_DURATION = float(
+        os.environ.get('APPLICATION_EVENTS_MAX_DURATION', 300))
+APPLICATION_EVENTS_RECONNECT_INTERVAL = float(
+        os.environ.get('APPLICATION_EVENTS_RECONNECT_INTERVAL', 5))
+
+APPLICATIONS_CACHE_ENABLED = os.environ.get(
+        'APPLICATIONS_CACHE_ENABLED', 'true').lower() == 'true'
+APPLICATIONS_CACHE_TTL = float(os.environ.get('APPLICATIONS_CACHE_TTL', 30))
+APPLICATIONS_CACHE_MAX_BYTES = int(
+        os.environ.get('APPLICATIONS_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+COMPRESSION_ENABLED = os.environ.get(
+        'COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(
+        os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))
+
+# 'auto' serializes JSON with orjson if it is installed, 'stdlib' always
+# uses the json module.
+JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER', 'auto')
+
+SERVER_TIMING_ENABLED = os.environ.get(
+        'SERVER_TIMING_ENABLED', 'false').lower() == 'true'
+REQUEST_METRICS_LOGGING = os.environ.get(
+        'REQUEST_METRICS_LOGGING', 'true').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(
+        os.environ.get('SLOW_QUERY_THRESHOLD_MS', 500))
 
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_DIR = os.environ.get('LOG_DIR', 'logs')
 LOG_FILENAME = os.environ.get('LOG_FILENAME', 'app.log')
 LOG_FILE = os.path.join(LOG_DIR, LOG_FILENAME)
+# Records are queued and written by a background thread. When the queue is
+# full, 'drop' discards new records and counts them, 'block' makes the
+# logging thread wait. A LOG_INFO_SAMPLE_RATE below 1 logs only that
+# fraction of the INFO records; warnings and errors are always logged.
+LOG_QUEUE_ENABLED = os.environ.get(
+        'LOG_QUEUE_ENABLED', 'true').lower() == 'true'
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_QUEUE_OVERFLOW = os.environ.get('LOG_QUEUE_OVERFLOW', 'drop')
+LOG_INFO_SAMPLE_RATE = float(os.environ.get('LOG_INFO_SAMPLE_RATE', 1.0))
 
 if 'DYNO' in os.environ:
     LOG_TO_STDOUT = True
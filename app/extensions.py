@@ -1,5 +1,18 @@
-from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 
-database = SQLAlchemy()
-jwt = JWTManager()
+from app.jwt_handlers import CachingJWTManager
+from app.utilities.compression import Compressor
+from app.utilities.event_broker import EventBroker
+from app.utilities.log_queue import LogQueue
+from app.utilities.replica_routing import ReplicaRouter, RoutingSession
+from app.utilities.request_metrics import RequestMetrics
+from app.utilities.response_cache import ResponseCache
+
+database = SQLAlchemy(session_options={'class_': RoutingSession})
+jwt = CachingJWTManager()
+applications_cache = ResponseCache()
+compressor = Compressor()
+request_metrics = RequestMetrics()
+log_queue = LogQueue()
+replica_router = ReplicaRouter()
+event_broker = EventBroker()
@@ -1,11 +1,91 @@
 import logging
+from functools import wraps
+from typing import Callable, Optional
 
-from flask import jsonify, request
-from flask_jwt_extended import JWTManager
+from flask import Flask, current_app, jsonify, request
+from flask_jwt_extended import JWTManager, get_jwt, jwt_required
 from jwt import InvalidTokenError
 
+from app.utilities.claims_cache import ClaimsCache
 from app.utilities.status_codes import StatusCodes
 
+RECRUITER_ROLE_ID = 1
+
+
+class CachingJWTManager(JWTManager):
+    """
+    A JWTManager that skips the verification of recently verified tokens.
+
+    Clients poll with the same token many times a minute. The claims of
+    each successfully decoded token are kept in a ClaimsCache, and later
+    requests with the same token take the claims from the cache instead of
+    decoding the token and verifying its signature again. The expiry of the
+    token is checked on every hit. Invalid and expired tokens raise while
+    decoding and are therefore never cached. All checks made after decoding,
+    such as the token type and the role check of recruiter_required, still
+    run on every request.
+
+    Flask-JWT-Extended has no public hook that runs instead of verifying a
+    token, so the manager overrides the private method behind decode_token.
+    The package is therefore pinned to an exact version, and a test checks
+    the signature of the method on every upgrade.
+
+    :ivar claims_cache: The cache of verified claims.
+    """
+
+    def __init__(self, app: Optional[Flask] = None,
+                 add_context_processor: bool = False) -> None:
+        """
+        Initializes a new CachingJWTManager object.
+
+        :param app: The Flask application, if it is initialized directly.
+        :param add_context_processor: Whether to add the current user to
+               the template context.
+        """
+
+        self.claims_cache = ClaimsCache()
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app: Flask,
+                 add_context_processor: bool = False) -> None:
+        """
+        Registers the manager with a Flask application and configures the
+        claims cache from its configuration.
+
+        :param app: The Flask application.
+        :param add_context_processor: Whether to add the current user to
+               the template context.
+        """
+
+        super().init_app(app, add_context_processor)
+        self.claims_cache.init_app(app)
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None,
+                                allow_expired: bool = False) -> dict:
+        """
+        Decodes and verifies a token, or takes its claims from the cache.
+
+        Tokens decoded with a CSRF value or while allowing expired tokens
+        bypass the cache.
+
+        :param encoded_token: The raw token.
+        :param csrf_value: The CSRF value to check, if any.
+        :param allow_expired: Whether expired tokens are accepted.
+        :returns: The verified claims of the token.
+        :raises PyJWTError: If the token is invalid or has expired.
+        """
+
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(
+                    encoded_token, csrf_value, allow_expired)
+
+        claims = self.claims_cache.get(
+                encoded_token, current_app.config['JWT_DECODE_LEEWAY'])
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token)
+            self.claims_cache.set(encoded_token, claims)
+        return claims
+
 
 def register_jwt_handlers(jwt: JWTManager) -> None:
     """
@@ -32,7 +112,7 @@ def register_jwt_handlers(jwt: JWTManager) -> None:
         """
 
         requester_ip = request.remote_addr
-        logging.warning(f'{requester_ip} - Invalid JWT provided: {error}')
+        logging.warning('%s - Invalid JWT provided: %s', requester_ip, error)
         return jsonify({'error': 'INVALID_TOKEN', }), StatusCodes.UNAUTHORIZED
 
     @jwt.expired_token_loader
@@ -50,7 +130,7 @@ def register_jwt_handlers(jwt: JWTManager) -> None:
         """
 
         requester_ip = request.remote_addr
-        logging.warning(f'{requester_ip} - Expired JWT token')
+        logging.warning('%s - Expired JWT token', requester_ip)
         return jsonify({'error': 'TOKEN_EXPIRED'}), StatusCodes.UNAUTHORIZED
 
     @jwt.unauthorized_loader
@@ -67,5 +147,34 @@ def register_jwt_handlers(jwt: JWTManager) -> None:
         """
 
         requester_ip = request.remote_addr
-        logging.warning(f'{requester_ip} - Unauthorized request: {error}')
+        logging.warning('%s - Unauthorized request: %s', requester_ip, error)
         return jsonify({'error': 'UNAUTHORIZED'}), StatusCodes.UNAUTHORIZED
+
+
+def recruiter_required() -> Callable:
+    """
+    Decorator requiring a valid JWT with the recruiter role.
+
+    This decorator verifies the JWT of the request like jwt_required and
+    additionally checks that the role claim is the recruiter role. Requests
+    from other roles are logged and answered with an 'UNAUTHORIZED' message
+    and a 401 status code.
+
+    :returns: The decorator for a view function.
+    """
+
+    def wrapper(view: Callable) -> Callable:
+        @wraps(view)
+        @jwt_required()
+        def decorator(*args, **kwargs):
+            if get_jwt().get('role') != RECRUITER_ROLE_ID:
+                requester_ip = request.remote_addr
+                logging.warning('%s - Unauthorized access attempt to %s.',
+                                requester_ip, request.path)
+                return (jsonify({'error': 'UNAUTHORIZED'}),
+                        StatusCodes.UNAUTHORIZED)
+            return view(*args, **kwargs)
+
+        return decorator
+
+    return wrapper
@@ -17,7 +17,7 @@ class ApplicationStatus(database.Model):  # type: ignore
             database.BigInteger, primary_key=True, autoincrement=True)
     person_id = database.Column(
             database.BigInteger, database.ForeignKey('person.person_id'),
-            nullable=False)
+            nullable=False, index=True)
     status = database.Column(database.String)
 
     def __init__(self, person_id: int) -> None:
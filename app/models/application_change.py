@@ -0,0 +1,129 @@
+from sqlalchemy import DDL, event, func
+
+from app.extensions import database
+from app.utilities.event_broker import APPLICATION_EVENTS_CHANNEL
+
+TRACKED_TABLES = ('person', 'application_status', 'competence_profile',
+                  'availability')
+
+
+class ApplicationChange(database.Model):  # type: ignore
+    """
+    Represents a change of an application in the database.
+
+    Rows are written by database triggers on the person, application
+    status, competence profile and availability tables, so changes made by
+    other services are recorded too. Every inserted, updated or deleted row
+    of these tables adds the affected person_id; an update that moves a row
+    to another person adds both. On PostgreSQL the id of the writing
+    transaction is recorded as well, because change ids are not assigned in
+    commit order when transactions overlap.
+
+    :ivar change_id: The unique ID of the change.
+    :ivar person_id: The ID of the applicant whose application changed.
+    :ivar transaction_id: The ID of the writing transaction on PostgreSQL,
+          otherwise None.
+    :ivar changed_at: The time of the change.
+
+    On PostgreSQL, new application statuses and status changes are also
+    announced on the application events channel when they commit.
+    """
+
+    __tablename__ = 'application_change'
+
+    change_id = database.Column(
+            database.BigInteger().with_variant(database.Integer, 'sqlite'),
+            primary_key=True)
+    person_id = database.Column(database.BigInteger, nullable=False)
+    transaction_id = database.Column(database.BigInteger)
+    changed_at = database.Column(database.DateTime(timezone=True),
+                                 nullable=False, server_default=func.now())
+
+
+database.Index('ix_application_change_transaction_id_change_id',
+               ApplicationChange.transaction_id,
+               ApplicationChange.change_id).ddl_if(dialect='postgresql')
+database.Index('ix_application_change_changed_at',
+               ApplicationChange.changed_at)
+database.Index('ix_application_change_person_id_change_id',
+               ApplicationChange.person_id, ApplicationChange.change_id)
+
+# The trigger statements are idempotent, so they run after every
+# create_all and add the triggers to databases created before them.
+event.listen(database.metadata, 'after_create', DDL('''
+CREATE OR REPLACE FUNCTION log_application_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        INSERT INTO application_change (person_id, transaction_id)
+        VALUES (OLD.person_id, txid_current());
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND
+                            NEW.person_id IS DISTINCT FROM OLD.person_id) THEN
+        INSERT INTO application_change (person_id, transaction_id)
+        VALUES (NEW.person_id, txid_current());
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+''').execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_drop', DDL(
+        'DROP FUNCTION IF EXISTS log_application_change() CASCADE'
+).execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE OR REPLACE FUNCTION notify_application_event() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.status IS NOT DISTINCT FROM OLD.status THEN
+        RETURN NULL;
+    END IF;
+    PERFORM pg_notify('{APPLICATION_EVENTS_CHANNEL}', json_build_object(
+        'type', CASE WHEN TG_OP = 'INSERT' THEN 'application_created'
+                     ELSE 'status_changed' END,
+        'application_status_id', NEW.application_status_id,
+        'person_id', NEW.person_id,
+        'status', NEW.status)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+''').execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_create', DDL('''
+DROP TRIGGER IF EXISTS application_status_notified ON application_status
+''').execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_create', DDL('''
+CREATE TRIGGER application_status_notified
+AFTER INSERT OR UPDATE OF status ON application_status
+FOR EACH ROW EXECUTE FUNCTION notify_application_event()
+''').execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_drop', DDL(
+        'DROP FUNCTION IF EXISTS notify_application_event() CASCADE'
+).execute_if(dialect='postgresql'))
+
+for table in TRACKED_TABLES:
+    event.listen(database.metadata, 'after_create', DDL(f'''
+DROP TRIGGER IF EXISTS {table}_changed ON {table}
+''').execute_if(dialect='postgresql'))
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER {table}_changed
+AFTER INSERT OR UPDATE OR DELETE ON {table}
+FOR EACH ROW EXECUTE FUNCTION log_application_change()
+''').execute_if(dialect='postgresql'))
+
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER IF NOT EXISTS {table}_inserted AFTER INSERT ON {table}
+BEGIN
+    INSERT INTO application_change (person_id) VALUES (NEW.person_id);
+END
+''').execute_if(dialect='sqlite'))
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER IF NOT EXISTS {table}_updated AFTER UPDATE ON {table}
+BEGIN
+    INSERT INTO application_change (person_id) VALUES (OLD.person_id);
+    INSERT INTO application_change (person_id)
+    SELECT NEW.person_id WHERE NEW.person_id IS NOT OLD.person_id;
+END
+''').execute_if(dialect='sqlite'))
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER IF NOT EXISTS {table}_deleted AFTER DELETE ON {table}
+BEGIN
+    INSERT INTO application_change (person_id) VALUES (OLD.person_id);
+END
+''').execute_if(dialect='sqlite'))
@@ -0,0 +1,47 @@
+from app.extensions import database
+
+
+class ApplicationSummary(database.Model):  # type: ignore
+    """
+    Represents a precompiled application in the database.
+
+    The summaries are a read model derived from the person, competence,
+    availability and application status tables. They are replaced as a whole
+    on every refresh.
+
+    :ivar application_status_id: The ID of the summarized application status.
+    :ivar person_id: The ID of the applicant.
+    :ivar document: The compiled application, or the error record of an
+          application that could not be compiled, serialized as JSON.
+    :ivar is_error: Whether the document is an error record.
+    """
+
+    __tablename__ = 'application_summary'
+
+    application_status_id = database.Column(
+            database.BigInteger, primary_key=True, autoincrement=False)
+    person_id = database.Column(database.BigInteger, nullable=False)
+    document = database.Column(database.Text, nullable=False)
+    is_error = database.Column(database.Boolean, nullable=False)
+
+
+class ApplicationSummaryState(database.Model):  # type: ignore
+    """
+    Represents the refresh state of the application summaries.
+
+    The table holds a single row, which is replaced together with the
+    summaries.
+
+    :ivar state_id: The ID of the state row, always 1.
+    :ivar data_version: The applications version the summaries were
+          compiled from.
+    :ivar refreshed_at: The time of the last refresh.
+    """
+
+    __tablename__ = 'application_summary_state'
+
+    state_id = database.Column(database.Integer, primary_key=True,
+                               autoincrement=False)
+    data_version = database.Column(database.String(64), nullable=False)
+    refreshed_at = database.Column(database.DateTime(timezone=True),
+                                   nullable=False)
@@ -1,8 +1,46 @@
 from datetime import datetime
 
+from sqlalchemy import ColumnElement, case, func, text
+
 from app.extensions import database
 
 
+def period_bounds(from_date, to_date) -> tuple[ColumnElement, ColumnElement]:
+    """
+    Builds the first and last day of an availability period.
+
+    Other services write the availability table too, so the dates of a
+    period may be swapped; they are put in order, so that queries treat a
+    swapped period like the one they were meant to describe.
+
+    :param from_date: The start date expression.
+    :param to_date: The end date expression.
+    :returns: The first and the last day of the period.
+    """
+
+    swapped = from_date > to_date
+    return (case((swapped, to_date), else_=from_date),
+            case((swapped, from_date), else_=to_date))
+
+
+def availability_period(from_date, to_date) -> ColumnElement:
+    """
+    Builds a PostgreSQL daterange including both of its bounds.
+
+    The dates are put in order by period_bounds, since daterange rejects
+    swapped dates. A missing date leaves the range open towards that side.
+    The GiST index on availability periods is built from this expression,
+    so queries must use it for the index to apply.
+
+    :param from_date: The start date expression.
+    :param to_date: The end date expression.
+    :returns: The daterange expression.
+    """
+
+    return func.daterange(*period_bounds(from_date, to_date),
+                          text("'[]'"))
+
+
 class Availability(database.Model):  # type: ignore
     """
     Represents availability in the database.
@@ -14,6 +52,10 @@ class Availability(database.Model):  # type: ignore
     """
 
     __tablename__ = 'availability'
+    __table_args__ = (
+        database.Index('ix_availability_person_id_from_date',
+                       'person_id', 'from_date', 'to_date'),
+    )
 
     availability_id = database.Column(database.Integer, primary_key=True)
     person_id = database.Column(database.Integer)
@@ -40,6 +82,12 @@ class Availability(database.Model):  # type: ignore
         :returns: A dictionary representation of the availability.
         """
         return {
-            'from_date': self.from_date.strftime('%Y-%m-%d'),
-            'to_date': self.to_date.strftime('%Y-%m-%d')
+            'from_date': self.from_date.isoformat(),
+            'to_date': self.to_date.isoformat()
         }
+
+
+database.Index('ix_availability_period',
+               availability_period(Availability.from_date,
+                                   Availability.to_date),
+               postgresql_using='gist').ddl_if(dialect='postgresql')
@@ -13,6 +13,10 @@ class CompetenceProfile(database.Model):  # type: ignore
     """
 
     __tablename__ = 'competence_profile'
+    __table_args__ = (
+        database.Index('ix_competence_profile_person_id_competence_id',
+                       'person_id', 'competence_id', 'years_of_experience'),
+    )
 
     competence_profile_id = database.Column(database.Integer, primary_key=True)
     person_id = database.Column(database.Integer)
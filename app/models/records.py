@@ -0,0 +1,163 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+
+class PersonRecord:
+    """
+    A read-only projection of the person columns used in applications.
+
+    Unlike Person, it is not tracked by the ORM session and holds only the
+    columns returned by Person.to_dict.
+
+    :ivar person_id: The ID of the person.
+    :ivar name: The name of the person.
+    :ivar surname: The surname of the person.
+    :ivar pnr: The personal number of the person.
+    :ivar email: The email of the person.
+    """
+
+    __slots__ = ('person_id', 'name', 'surname', 'pnr', 'email')
+
+    def __init__(self, person_id: int, name: str, surname: str, pnr: str,
+                 email: str) -> None:
+        """
+        Initializes a new PersonRecord object.
+
+        :param person_id: The ID of the person.
+        :param name: The name of the person.
+        :param surname: The surname of the person.
+        :param pnr: The personal number of the person.
+        :param email: The email of the person.
+        """
+
+        self.person_id = person_id
+        self.name = name
+        self.surname = surname
+        self.pnr = pnr
+        self.email = email
+
+    def to_dict(self) -> dict:
+        """
+        Convert the person to a dictionary.
+
+        :returns: The same dictionary as Person.to_dict.
+        """
+
+        return {
+            'person_id': self.person_id,
+            'name': self.name,
+            'surname': self.surname,
+            'pnr': self.pnr,
+            'email': self.email,
+        }
+
+
+class CompetenceRecord:
+    """
+    A read-only projection of the competence profile columns used in
+    applications.
+
+    :ivar person_id: The ID of the person associated with this profile.
+    :ivar competence_id: The ID of the competence.
+    :ivar years_of_experience: The number of years of experience.
+    """
+
+    __slots__ = ('person_id', 'competence_id', 'years_of_experience')
+
+    def __init__(self, person_id: int, competence_id: int,
+                 years_of_experience: Decimal) -> None:
+        """
+        Initializes a new CompetenceRecord object.
+
+        :param person_id: The ID of the person associated with this profile.
+        :param competence_id: The ID of the competence.
+        :param years_of_experience: The number of years of experience.
+        """
+
+        self.person_id = person_id
+        self.competence_id = competence_id
+        self.years_of_experience = years_of_experience
+
+    def to_dict(self) -> dict:
+        """
+        Convert the competence to a dictionary.
+
+        :returns: The same dictionary as CompetenceProfile.to_dict.
+        """
+
+        return {
+            'competence_id': self.competence_id,
+            'years_of_experience': self.years_of_experience
+        }
+
+
+class AvailabilityRecord:
+    """
+    A read-only projection of the availability columns used in
+    applications.
+
+    :ivar person_id: The ID of the person associated with this availability.
+    :ivar from_date: The start date of the availability.
+    :ivar to_date: The end date of the availability.
+    """
+
+    __slots__ = ('person_id', 'from_date', 'to_date')
+
+    def __init__(self, person_id: int, from_date: date,
+                 to_date: date) -> None:
+        """
+        Initializes a new AvailabilityRecord object.
+
+        :param person_id: The ID of the person associated with this
+               availability.
+        :param from_date: The start date of the availability.
+        :param to_date: The end date of the availability.
+        """
+
+        self.person_id = person_id
+        self.from_date = from_date
+        self.to_date = to_date
+
+    def to_dict(self) -> dict:
+        """
+        Convert the availability to a dictionary.
+
+        :returns: The same dictionary as Availability.to_dict.
+        """
+
+        return {
+            'from_date': self.from_date.isoformat(),
+            'to_date': self.to_date.isoformat()
+        }
+
+
+class ApplicationRecord:
+    """
+    The application status of an applicant together with the records of the
+    applicant.
+
+    :ivar person_id: The ID of the applicant.
+    :ivar status: The status of the application.
+    :ivar person: The person record, or None if the person does not exist.
+    :ivar competences: The competence records of the applicant.
+    :ivar availabilities: The availability records of the applicant.
+    """
+
+    __slots__ = ('person_id', 'status', 'person', 'competences',
+                 'availabilities')
+
+    def __init__(self, person_id: int, status: str) -> None:
+        """
+        Initializes a new ApplicationRecord object without person,
+        competences or availabilities.
+
+        :param person_id: The ID of the applicant.
+        :param status: The status of the application.
+        """
+
+        self.person_id = person_id
+        self.status = status
+        self.person: Optional[PersonRecord] = None
+        self.competences: list[CompetenceRecord] = []
+        self.availabilities: list[AvailabilityRecord] = []
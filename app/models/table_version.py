@@ -0,0 +1,89 @@
+from sqlalchemy import DDL, event
+
+from app.extensions import database
+from app.models.application_change import TRACKED_TABLES
+
+
+class TableVersion(database.Model):  # type: ignore
+    """
+    Represents the version of a table whose rows make up applications.
+
+    Rows are maintained by database triggers on the person, application
+    status, competence profile and availability tables, so writes of other
+    services count too. Every transaction that inserts, updates or deletes
+    rows of a table increments its version once and records when it
+    committed. On PostgreSQL the version is incremented by a deferred
+    trigger when the transaction commits, so the version row is locked only
+    while committing and every commit gets a version of its own; on SQLite
+    it is incremented for every written row.
+
+    :ivar table_name: The name of the versioned table.
+    :ivar version: The number of writes to the table.
+    :ivar changed_at: The time of the last write to the table.
+    """
+
+    __tablename__ = 'table_version'
+
+    table_name = database.Column(database.String(63), primary_key=True)
+    version = database.Column(database.BigInteger, nullable=False)
+    changed_at = database.Column(database.DateTime(timezone=True),
+                                 nullable=False)
+
+
+# The setting marks tables whose version the transaction already
+# incremented. It is local to the transaction, so the trigger does a single
+# upsert per table and transaction however many rows were written.
+event.listen(database.metadata, 'after_create', DDL('''
+CREATE OR REPLACE FUNCTION increment_table_version() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('table_version.' || TG_TABLE_NAME, true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM set_config('table_version.' || TG_TABLE_NAME, 'on', true);
+    INSERT INTO table_version (table_name, version, changed_at)
+    VALUES (TG_TABLE_NAME, 1, clock_timestamp())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = table_version.version + 1,
+        changed_at = GREATEST(table_version.changed_at,
+                              EXCLUDED.changed_at);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+''').execute_if(dialect='postgresql'))
+event.listen(database.metadata, 'after_drop', DDL(
+        'DROP FUNCTION IF EXISTS increment_table_version() CASCADE'
+).execute_if(dialect='postgresql'))
+
+for table in TRACKED_TABLES:
+    event.listen(database.metadata, 'after_create', DDL(f'''
+DROP TRIGGER IF EXISTS {table}_versioned ON {table}
+''').execute_if(dialect='postgresql'))
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE CONSTRAINT TRIGGER {table}_versioned
+AFTER INSERT OR UPDATE OR DELETE ON {table}
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION increment_table_version()
+''').execute_if(dialect='postgresql'))
+    # Constraint triggers cannot fire for TRUNCATE, which is rare enough to
+    # lock the version row right away.
+    event.listen(database.metadata, 'after_create', DDL(f'''
+DROP TRIGGER IF EXISTS {table}_truncated ON {table}
+''').execute_if(dialect='postgresql'))
+    event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER {table}_truncated
+AFTER TRUNCATE ON {table}
+FOR EACH STATEMENT EXECUTE FUNCTION increment_table_version()
+''').execute_if(dialect='postgresql'))
+
+    for operation in ('INSERT', 'UPDATE', 'DELETE'):
+        event.listen(database.metadata, 'after_create', DDL(f'''
+CREATE TRIGGER IF NOT EXISTS {table}_versioned_{operation.lower()}
+AFTER {operation} ON {table}
+BEGIN
+    INSERT INTO table_version (table_name, version, changed_at)
+    VALUES ('{table}', 1, CURRENT_TIMESTAMP)
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = version + 1,
+        changed_at = max(changed_at, excluded.changed_at);
+END
+''').execute_if(dialect='sqlite'))
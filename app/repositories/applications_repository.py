@@ -1,38 +1,267 @@
 import logging
+from collections import defaultdict
+from typing import Iterator, Optional
 
+from sqlalchemy import ColumnElement, and_, cast, literal, null, select, \
+    union_all
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
+from app.extensions import database, replica_router
 from app.models.application import ApplicationStatus
-from app.models.availability import Availability
+from app.models.availability import Availability, period_bounds
 from app.models.competence_profile import CompetenceProfile
 from app.models.person import Person
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord, PersonRecord
+from app.utilities.filters import ApplicationFilters
 
+IN_CLAUSE_BATCH_SIZE = 5000
 
-def get_application_statuses_from_db() -> list[ApplicationStatus]:
+
+@replica_router.reads
+def get_application_statuses_from_db(
+        filters: Optional[ApplicationFilters] = None) -> \
+        list[ApplicationStatus]:
     """
     Retrieves application statuses from the database.
 
-    This function fetches all application statuses from the database. It
-    raises an exception if there is a database issue or if no application
-    statuses are found.
+    This function fetches all application statuses from the database,
+    narrowed down by the given filters. It raises an exception if there is a
+    database issue or if no application statuses exist. A filter that
+    matches no application statuses yields an empty list.
 
+    :param filters: The filters to apply, or None for all statuses.
     :returns: A list of ApplicationStatus objects.
     :raises SQLAlchemyError: If there is a database issue.
     :raises NoResultFound: If no application statuses are found.
     """
 
+    query = ApplicationStatus.query
+    if filters:
+        query = query.filter(*_filter_predicates(filters))
+
     try:
-        application_statuses = ApplicationStatus.query.all()
+        application_statuses = query.all()
     except SQLAlchemyError as exception:
         logging.debug(str(exception), exc_info=True)
         raise SQLAlchemyError
 
-    if not application_statuses:
+    if not application_statuses and not filters:
         logging.debug('No application statuses found')
         raise NoResultFound('NO_APPLICATION_STATUSES_FOUND')
     return application_statuses
 
 
+@replica_router.reads
+def get_application_statuses_page_from_db(
+        after_id: Optional[int], limit: int,
+        filters: Optional[ApplicationFilters] = None) -> \
+        tuple[list[ApplicationStatus], bool]:
+    """
+    Retrieves one page of application statuses from the database.
+
+    This function uses keyset pagination on application_status_id: it fetches
+    at most limit application statuses with an id greater than after_id,
+    ordered by id, so the cost of a page does not depend on its position. One
+    extra row is requested to find out whether another page follows. The
+    filters are applied before the limit. It raises an exception if there is
+    a database issue or if the first unfiltered page is empty.
+
+    :param after_id: The id to continue after, or None for the first page.
+    :param limit: The maximum number of application statuses to return.
+    :param filters: The filters to apply, or None for all statuses.
+    :returns: A tuple containing the ApplicationStatus objects of the page
+              and whether more application statuses follow.
+    :raises SQLAlchemyError: If there is a database issue.
+    :raises NoResultFound: If no application statuses are found at all.
+    """
+
+    query = ApplicationStatus.query
+    if after_id is not None:
+        query = query.filter(
+                ApplicationStatus.application_status_id > after_id)
+    if filters:
+        query = query.filter(*_filter_predicates(filters))
+
+    try:
+        application_statuses = query.order_by(
+                ApplicationStatus.application_status_id).limit(
+                limit + 1).all()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    if not application_statuses and after_id is None and not filters:
+        logging.debug('No application statuses found')
+        raise NoResultFound('NO_APPLICATION_STATUSES_FOUND')
+    return application_statuses[:limit], len(application_statuses) > limit
+
+
+@replica_router.reads
+def get_application_status_chunks_from_db(
+        chunk_size: int, filters: Optional[ApplicationFilters] = None) -> \
+        Iterator[list[ApplicationStatus]]:
+    """
+    Retrieves all application statuses from the database in chunks.
+
+    This function reads the application statuses ordered by id through a
+    server-side cursor and yields them chunk_size rows at a time, so only one
+    chunk is held in memory at once. It raises an exception if there is a
+    database issue or if no application statuses exist.
+
+    :param chunk_size: The number of application statuses per chunk.
+    :param filters: The filters to apply, or None for all statuses.
+    :returns: An iterator over lists of ApplicationStatus objects.
+    :raises SQLAlchemyError: If there is a database issue.
+    :raises NoResultFound: If no application statuses are found.
+    """
+
+    statement = select(ApplicationStatus).order_by(
+            ApplicationStatus.application_status_id).execution_options(
+            yield_per=chunk_size)
+    if filters:
+        statement = statement.where(*_filter_predicates(filters))
+    found = False
+
+    try:
+        result = database.session.execute(statement)
+        for application_statuses in result.scalars().partitions():
+            found = True
+            yield list(application_statuses)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    if not found and not filters:
+        logging.debug('No application statuses found')
+        raise NoResultFound('NO_APPLICATION_STATUSES_FOUND')
+
+
+@replica_router.reads
+def get_application_export_chunks_from_db(
+        chunk_size: int, person_columns: tuple[str, ...] = ()) -> \
+        Iterator[list[tuple]]:
+    """
+    Retrieves all applications for an export from the database in chunks.
+
+    This function reads the application statuses joined with their persons,
+    ordered by id, through a server-side cursor, chunk_size rows at a time.
+    Only the requested person columns are selected. The competences and
+    availabilities of the applicants of each chunk are then loaded with
+    batched IN queries instead of being joined into the cursor, where an
+    applicant would take one row per pair of competence and availability.
+    Only one chunk is held in memory at once. It raises an exception if
+    there is a database issue.
+
+    :param chunk_size: The number of applications per chunk.
+    :param person_columns: The names of the person columns to select, e.g.
+                           ('name', 'surname'). Applications without a
+                           person have None in these columns.
+    :returns: An iterator over lists of tuples of the application_status_id,
+              person_id, status, the person columns, a list of
+              CompetenceRecord objects and a list of AvailabilityRecord
+              objects.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    statement = select(
+            ApplicationStatus.application_status_id,
+            ApplicationStatus.person_id, ApplicationStatus.status,
+            *(getattr(Person, column) for column in person_columns)) \
+        .outerjoin(Person, Person.person_id == ApplicationStatus.person_id) \
+        .order_by(ApplicationStatus.application_status_id) \
+        .execution_options(yield_per=chunk_size)
+
+    try:
+        result = database.session.execute(statement)
+        for rows in result.tuples().partitions():
+            person_ids = [row[1] for row in rows]
+            competences = get_competences_for_persons_from_db(person_ids)
+            availabilities = \
+                get_availabilities_for_persons_from_db(person_ids)
+            yield [(*row, competences.get(row[1], []),
+                    availabilities.get(row[1], [])) for row in rows]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_EXPORT_APPLICATIONS')
+
+
+@replica_router.reads
+def get_application_records_from_db(
+        person_ids: list[int]) -> dict[int, ApplicationRecord]:
+    """
+    Retrieves the applications of several users in a single query.
+
+    This function unites the application statuses with their persons, the
+    competences and the availabilities of the users in one query, so that
+    all of them arrive in one round trip instead of the three lookups per
+    user of get_personal_info_from_db, get_competences_from_db and
+    get_availabilities_from_db. Each competence and availability takes a
+    row of its own rather than being joined with the others, so a user
+    takes as many rows as the three lookups would return. Users with
+    several application statuses are represented by the first one. Users
+    without an application status are left out of the result. It raises an
+    exception if there is a database issue.
+
+    :param person_ids: The ids of the users to retrieve applications for.
+    :returns: A dictionary mapping person_ids to ApplicationRecord objects.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    person_id_set = set(person_ids)
+    status_columns = (ApplicationStatus.status, Person.person_id,
+                      Person.name, Person.surname, Person.pnr, Person.email)
+    competence_columns = (CompetenceProfile.competence_id,
+                          CompetenceProfile.years_of_experience)
+    availability_columns = (Availability.from_date, Availability.to_date)
+    statement = union_all(
+            select(literal(0).label('kind'),
+                   ApplicationStatus.application_status_id.label('row_id'),
+                   ApplicationStatus.person_id, *status_columns,
+                   *_nulls(competence_columns), *_nulls(availability_columns))
+            .outerjoin(Person,
+                       Person.person_id == ApplicationStatus.person_id)
+            .where(ApplicationStatus.person_id.in_(person_id_set)),
+            select(literal(1), CompetenceProfile.competence_profile_id,
+                   CompetenceProfile.person_id, *_nulls(status_columns),
+                   *competence_columns, *_nulls(availability_columns))
+            .where(CompetenceProfile.person_id.in_(person_id_set)),
+            select(literal(2), Availability.availability_id,
+                   Availability.person_id, *_nulls(status_columns),
+                   *_nulls(competence_columns), *availability_columns)
+            .where(Availability.person_id.in_(person_id_set)))
+    statement = statement.order_by(statement.selected_columns.kind,
+                                   statement.selected_columns.row_id)
+
+    try:
+        rows = database.session.execute(statement).all()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_APPLICATIONS')
+
+    records: dict[int, ApplicationRecord] = {}
+    for row in rows:
+        if row[0] == 0:
+            if row[2] not in records:
+                records[row[2]] = ApplicationRecord(row[2], row[3])
+                if row[4] is not None:
+                    records[row[2]].person = PersonRecord(*row[4:9])
+            continue
+
+        record = records.get(row[2])
+        if record is None or record.person is None:
+            continue
+        if row[0] == 1:
+            record.competences.append(
+                    CompetenceRecord(row[2], row[9], row[10]))
+        else:
+            record.availabilities.append(
+                    AvailabilityRecord(row[2], row[11], row[12]))
+
+    return records
+
+
+@replica_router.reads
 def get_personal_info_from_db(person_id: int) -> Person:
     """
     Retrieves personal information of a user from the database.
@@ -54,11 +283,12 @@ def get_personal_info_from_db(person_id: int) -> Person:
         raise SQLAlchemyError(f'COULD_NOT_FETCH_PERSON: {person_id}')
 
     if not applicant:
-        logging.debug(f'Person was not found: {person_id}')
+        logging.debug('Person was not found: %s', person_id)
         raise NoResultFound(f'PERSON_NOT_FOUND: {person_id}')
     return applicant
 
 
+@replica_router.reads
 def get_competences_from_db(person_id: int) -> list[CompetenceProfile]:
     """
     Retrieves competences of a user from the database.
@@ -79,6 +309,7 @@ def get_competences_from_db(person_id: int) -> list[CompetenceProfile]:
         raise SQLAlchemyError(f'COULD_NOT_FETCH_COMPETENCES: {person_id}')
 
 
+@replica_router.reads
 def get_availabilities_from_db(person_id: int) -> list[CompetenceProfile]:
     """
     Retrieves availabilities of a user from the database.
@@ -103,7 +334,193 @@ def get_availabilities_from_db(person_id: int) -> list[CompetenceProfile]:
         raise SQLAlchemyError(f'COULD_NOT_FETCH_AVAILABILITIES: {person_id}')
 
     if not availabilities:
-        logging.debug(f'No availabilities found for person: {person_id}')
+        logging.debug('No availabilities found for person: %s', person_id)
         raise NoResultFound(
                 f'NO_AVAILABILITIES_FOUND_FOR_PERSON: {person_id}')
     return availabilities
+
+
+@replica_router.reads
+def get_persons_from_db(person_ids: list[int]) -> dict[int, PersonRecord]:
+    """
+    Retrieves personal information of several users from the database.
+
+    This function fetches the personal information of all users with the
+    given person_ids using batched IN queries. Only the columns used in
+    applications are selected, into PersonRecord objects that are not
+    tracked by the session. Users that do not exist are simply left out of
+    the result, so callers can report them individually. It raises an
+    exception if there is a database issue.
+
+    :param person_ids: The ids of the users to retrieve information for.
+    :returns: A dictionary mapping each found person_id to its PersonRecord.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        rows = _fetch_by_person_ids(
+                (Person.person_id, Person.name, Person.surname, Person.pnr,
+                 Person.email), Person.person_id, person_ids)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_PERSONS')
+
+    return {row[0]: PersonRecord(*row) for row in rows}
+
+
+@replica_router.reads
+def get_competences_for_persons_from_db(
+        person_ids: list[int]) -> dict[int, list[CompetenceRecord]]:
+    """
+    Retrieves competences of several users from the database.
+
+    This function fetches the competences of all users with the given
+    person_ids using batched IN queries, as CompetenceRecord objects, and
+    groups them by person_id. It raises an exception if there is a database
+    issue.
+
+    :param person_ids: The ids of the users to retrieve competences for.
+    :returns: A dictionary mapping person_ids to lists of CompetenceRecord
+              objects. Users without competences have no entry.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        rows = _fetch_by_person_ids(
+                (CompetenceProfile.person_id, CompetenceProfile.competence_id,
+                 CompetenceProfile.years_of_experience),
+                CompetenceProfile.competence_profile_id, person_ids)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_COMPETENCES')
+
+    return _group_by_person_id([CompetenceRecord(*row) for row in rows])
+
+
+@replica_router.reads
+def get_availabilities_for_persons_from_db(
+        person_ids: list[int]) -> dict[int, list[AvailabilityRecord]]:
+    """
+    Retrieves availabilities of several users from the database.
+
+    This function fetches the availabilities of all users with the given
+    person_ids using batched IN queries, as AvailabilityRecord objects, and
+    groups them by person_id. It raises an exception if there is a database
+    issue.
+
+    :param person_ids: The ids of the users to retrieve availabilities for.
+    :returns: A dictionary mapping person_ids to lists of AvailabilityRecord
+              objects. Users without availabilities have no entry.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        rows = _fetch_by_person_ids(
+                (Availability.person_id, Availability.from_date,
+                 Availability.to_date),
+                Availability.availability_id, person_ids)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_AVAILABILITIES')
+
+    return _group_by_person_id(
+            [AvailabilityRecord(*row) for row in rows])
+
+
+def _filter_predicates(filters: ApplicationFilters) -> list[ColumnElement]:
+    """
+    Compiles application filters into predicates on application_status.
+
+    Competence and availability filters become correlated EXISTS subqueries,
+    so they are evaluated by the database before any per-person data is
+    loaded and can use the person_id indexes of their tables. An applicant
+    matches the availability filter if a single availability period covers
+    the whole requested window, with swapped dates put in order.
+
+    :param filters: The filters to compile.
+    :returns: A list of predicates that must all hold.
+    """
+
+    predicates: list[ColumnElement] = []
+
+    if filters.statuses is not None:
+        predicates.append(ApplicationStatus.status.in_(filters.statuses))
+
+    if filters.competence_id is not None or filters.min_years is not None:
+        conditions = [CompetenceProfile.person_id ==
+                      ApplicationStatus.person_id]
+        if filters.competence_id is not None:
+            conditions.append(
+                    CompetenceProfile.competence_id == filters.competence_id)
+        if filters.min_years is not None:
+            conditions.append(
+                    CompetenceProfile.years_of_experience >=
+                    filters.min_years)
+        predicates.append(select(CompetenceProfile.competence_profile_id)
+                          .where(and_(*conditions)).exists())
+
+    if filters.available_from is not None:
+        first_day, last_day = period_bounds(Availability.from_date,
+                                            Availability.to_date)
+        predicates.append(select(Availability.availability_id).where(
+                Availability.person_id == ApplicationStatus.person_id,
+                first_day <= filters.available_from,
+                last_day >= filters.available_to).exists())
+
+    return predicates
+
+
+def _fetch_by_person_ids(columns: tuple, order_by,
+                         person_ids: list[int]) -> list[tuple]:
+    """
+    Fetches the given columns of all rows belonging to the given person_ids.
+
+    The first column must be the person_id column of its table. The ids are
+    deduplicated and split into batches of IN_CLAUSE_BATCH_SIZE so that the
+    number of queries stays constant for realistic applicant pools while the
+    statements stay within driver parameter limits. Rows are ordered by
+    order_by within each batch. Plain rows are returned, without ORM
+    entities or identity map bookkeeping.
+
+    :param columns: The columns to select, starting with person_id.
+    :param order_by: The column to order the rows of a batch by.
+    :param person_ids: The ids of the users to fetch rows for.
+    :returns: A list of row tuples.
+    """
+
+    unique_person_ids = list(dict.fromkeys(person_ids))
+    rows: list[tuple] = []
+
+    for start in range(0, len(unique_person_ids), IN_CLAUSE_BATCH_SIZE):
+        batch = unique_person_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+        rows.extend(database.session.execute(
+                select(*columns).where(columns[0].in_(batch))
+                .order_by(order_by)).tuples())
+
+    return rows
+
+
+def _group_by_person_id(rows: list) -> dict[int, list]:
+    """
+    Groups rows by their person_id, preserving the order of the rows.
+
+    :param rows: The records to group.
+    :returns: A dictionary mapping person_ids to lists of records.
+    """
+
+    grouped: defaultdict[int, list] = defaultdict(list)
+    for row in rows:
+        grouped[row.person_id].append(row)
+    return dict(grouped)
+
+
+def _nulls(columns: tuple) -> list[ColumnElement]:
+    """
+    Builds NULL placeholders for columns missing from a branch of a union.
+
+    :param columns: The columns the placeholders stand in for.
+    :returns: A NULL cast to the type of each column, so that all branches
+              of the union agree on the types of their columns.
+    """
+
+    return [cast(null(), column.type) for column in columns]
@@ -0,0 +1,62 @@
+import logging
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database, replica_router
+from app.models.availability import Availability, availability_period
+
+
+@replica_router.reads
+def get_available_person_ids_from_db(from_date: date, to_date: date,
+                                     cover: bool) -> list[int]:
+    """
+    Retrieves the users available during a window from the database.
+
+    This function compares availability periods with the window as
+    inclusive dateranges, so on PostgreSQL it is answered from the GiST
+    index on availability periods. It raises an exception if there is a
+    database issue.
+
+    :param from_date: The first day of the window.
+    :param to_date: The last day of the window.
+    :param cover: Whether an availability period must contain the whole
+           window instead of overlapping it.
+    :returns: The sorted ids of the matching users.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    period = availability_period(Availability.from_date, Availability.to_date)
+    window = availability_period(from_date, to_date)
+    predicate = period.op('@>')(window) if cover else period.op('&&')(window)
+
+    try:
+        return list(database.session.execute(
+                select(Availability.person_id).where(predicate).distinct()
+                .order_by(Availability.person_id)).scalars())
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_AVAILABLE_PERSONS')
+
+
+@replica_router.reads
+def get_availability_periods_from_db() -> list[tuple[int, date, date]]:
+    """
+    Retrieves all availability periods from the database.
+
+    This function only selects the person_id, from_date and to_date columns,
+    without loading Availability objects. It raises an exception if there is
+    a database issue.
+
+    :returns: A list of (person_id, from_date, to_date) tuples.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        return [tuple(row) for row in database.session.execute(
+                select(Availability.person_id, Availability.from_date,
+                       Availability.to_date))]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_AVAILABILITIES')
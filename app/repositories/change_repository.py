@@ -0,0 +1,221 @@
+import logging
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import ColumnElement, CursorResult, Select, and_, delete, \
+    func, literal, select, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database, replica_router
+from app.models.application_change import ApplicationChange
+from app.models.table_version import TableVersion
+
+PRUNE_LOCK_KEY = 1720149005
+
+
+@replica_router.reads
+def get_table_versions_from_db(table_names: Sequence[str]) -> \
+        tuple[tuple[Optional[int], ...], Optional[datetime], datetime]:
+    """
+    Retrieves the versions of tables in a single query.
+
+    The versions are maintained by triggers, so reading them costs one
+    primary key lookup per table regardless of the size of the tables, and
+    they change with every committed write, including updates in place. The
+    time of the database is read along, so callers can tell how long ago
+    the tables last changed. It raises an exception if there is a database
+    issue.
+
+    :param table_names: The names of the tables.
+    :returns: A tuple containing the versions of the tables in the given
+              order, None for tables that were never written, the time of
+              the last write to any of them, or None, and the current time
+              of the database.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    columns: list = [select(TableVersion.version)
+                     .where(TableVersion.table_name == table_name)
+                     .scalar_subquery() for table_name in table_names]
+    columns.append(select(func.max(TableVersion.changed_at))
+                   .where(TableVersion.table_name.in_(table_names))
+                   .scalar_subquery())
+    columns.append(func.now())
+
+    try:
+        row = database.session.execute(select(*columns)).one()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_DATA_VERSION')
+
+    return tuple(row[:-2]), row[-2], row[-1]
+
+
+@replica_router.reads
+def get_person_versions_from_db(
+        person_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+    """
+    Retrieves the versions of the applications of several users.
+
+    The version of an application is derived from the changes recorded for
+    its user: their number, the sum and the maximum of their ids. Every
+    write adds a change, so the version changes with every committed write,
+    even if concurrent transactions were assigned change ids out of commit
+    order. The changes are read along the index on person_id and
+    change_id. It raises an exception if there is a database issue.
+
+    :param person_ids: The ids of the users.
+    :returns: A dictionary mapping the person_id of each user with recorded
+              changes to the number, sum and maximum of their change ids.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        rows = database.session.execute(
+                select(ApplicationChange.person_id,
+                       func.count(ApplicationChange.change_id),
+                       func.sum(ApplicationChange.change_id),
+                       func.max(ApplicationChange.change_id))
+                .where(ApplicationChange.person_id.in_(set(person_ids)))
+                .group_by(ApplicationChange.person_id))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_DATA_VERSION')
+
+    return {row[0]: (int(row[1]), int(row[2]), int(row[3])) for row in rows}
+
+
+@replica_router.reads
+def get_change_horizon_from_db() -> int:
+    """
+    Retrieves the horizon of the change log, the first position that may
+    still receive changes.
+
+    It raises an exception if there is a database issue.
+
+    :returns: The horizon of the change log.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        return int(database.session.execute(_horizon_query()).scalar_one())
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_CHANGES')
+
+
+@replica_router.reads
+def get_changes_from_db(position: int, change_id: int,
+                        limit: int) -> tuple[list[tuple[int, int, int]], int]:
+    """
+    Retrieves the changes of applications after a position in the change
+    log.
+
+    On PostgreSQL the position of a change is the id of the transaction
+    that recorded it, because the change ids of overlapping transactions
+    are not assigned in commit order. Only changes of transactions below
+    the horizon are returned, so no change can commit behind a position
+    once it was served. On other databases the position is the change id.
+    The changes are read along the index on their position, so the cost
+    depends on the number of changes returned, not on the size of the
+    change log. It raises an exception if there is a database issue.
+
+    :param position: The position to continue after.
+    :param change_id: The id of the last served change at the position, or
+           0 to start with the first change at the position.
+    :param limit: The maximum number of changes to retrieve.
+    :returns: A tuple containing the changes, as (position, change_id,
+              person_id) tuples in log order, and the horizon.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    position_column = _position_column()
+    if position_column is ApplicationChange.change_id:
+        # The position is the change id itself, so the predicate can use
+        # the primary key.
+        after: ColumnElement = and_(ApplicationChange.change_id >= position,
+                                    ApplicationChange.change_id > change_id)
+    else:
+        after = tuple_(position_column, ApplicationChange.change_id) > \
+            tuple_(literal(position), literal(change_id))
+
+    try:
+        horizon = int(database.session.execute(_horizon_query()).scalar_one())
+        query = select(position_column, ApplicationChange.change_id,
+                       ApplicationChange.person_id) \
+            .where(after, position_column < horizon) \
+            .order_by(position_column, ApplicationChange.change_id) \
+            .limit(limit)
+        changes = [(row[0], row[1], row[2])
+                   for row in database.session.execute(query)]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_CHANGES')
+
+    return changes, horizon
+
+
+def delete_changes_before(before: datetime) -> int:
+    """
+    Deletes the changes recorded before a point in time.
+
+    The newest change of every person is kept, so the version of each
+    application, which get_person_versions_from_db derives from its
+    changes, still tells the applications apart after pruning. On
+    PostgreSQL concurrent prunes are skipped with a transaction-level
+    advisory lock, so the changes are deleted by one process only. It
+    raises an exception if there is a database issue.
+
+    :param before: The time before which changes are deleted.
+    :returns: The number of deleted changes, 0 if another prune is running.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    newest_change_ids = select(func.max(ApplicationChange.change_id)) \
+        .group_by(ApplicationChange.person_id)
+
+    try:
+        if database.engine.dialect.name == 'postgresql' and \
+                not database.session.execute(
+                    text('SELECT pg_try_advisory_xact_lock(:key)'),
+                    {'key': PRUNE_LOCK_KEY}).scalar():
+            database.session.rollback()
+            return 0
+        result: CursorResult = database.session.execute(  # type: ignore
+                delete(ApplicationChange)
+                .where(ApplicationChange.changed_at < before,
+                       ApplicationChange.change_id.not_in(newest_change_ids)))
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_DELETE_CHANGES')
+
+    return result.rowcount
+
+
+def _position_column():
+    """
+    Returns the column holding the position of a change in the change log.
+
+    :returns: The transaction id column on PostgreSQL, otherwise the change
+              id column.
+    """
+
+    if database.engine.dialect.name == 'postgresql':
+        return ApplicationChange.transaction_id
+    return ApplicationChange.change_id
+
+
+def _horizon_query() -> Select:
+    """
+    Builds the query for the horizon of the change log.
+
+    :returns: The query.
+    """
+
+    # Every transaction with a lower id than the oldest running one has
+    # finished, so all changes it recorded are visible.
+    if database.engine.dialect.name == 'postgresql':
+        return select(text('txid_snapshot_xmin(txid_current_snapshot())'))
+    return select(func.coalesce(func.max(ApplicationChange.change_id), 0) + 1)
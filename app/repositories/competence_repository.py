@@ -0,0 +1,46 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database, replica_router
+from app.models.application import ApplicationStatus
+from app.models.competence_profile import CompetenceProfile
+
+
+@replica_router.reads
+def get_competence_profile_rows_from_db(
+        person_ids: Optional[list[int]] = None) -> \
+        list[tuple[int, int, int, float]]:
+    """
+    Retrieves the competence profiles of applicants from the database as
+    plain rows.
+
+    This function only selects the columns needed to build a competence
+    matrix, without loading CompetenceProfile objects, for the persons with
+    an application status, optionally restricted to some persons. It raises
+    an exception if there is a database issue.
+
+    :param person_ids: The ids of the persons to retrieve profiles for, or
+           None for all applicants.
+    :returns: A list of (competence_profile_id, person_id, competence_id,
+              years_of_experience) tuples ordered by id.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    query = select(CompetenceProfile.competence_profile_id,
+                   CompetenceProfile.person_id,
+                   CompetenceProfile.competence_id,
+                   CompetenceProfile.years_of_experience) \
+        .where(CompetenceProfile.person_id.in_(
+                select(ApplicationStatus.person_id))) \
+        .order_by(CompetenceProfile.competence_profile_id)
+    if person_ids is not None:
+        query = query.where(CompetenceProfile.person_id.in_(person_ids))
+
+    try:
+        return [tuple(row) for row in database.session.execute(query)]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_COMPETENCES')
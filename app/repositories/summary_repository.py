@@ -0,0 +1,111 @@
+import datetime as dt
+import logging
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.models.application_summary import ApplicationSummary, \
+    ApplicationSummaryState
+
+SUMMARY_STATE_ID = 1
+REFRESH_LOCK_KEY = 1720149004
+
+
+def get_summary_state_from_db() -> Optional[ApplicationSummaryState]:
+    """
+    Retrieves the refresh state of the application summaries.
+
+    :returns: The refresh state, or None if the summaries were never
+              refreshed.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        return database.session.get(ApplicationSummaryState,
+                                    SUMMARY_STATE_ID)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_SUMMARY_STATE')
+
+
+def get_summary_documents_from_db() -> list[tuple[str, bool]]:
+    """
+    Retrieves all application summaries in a single scan.
+
+    :returns: A list of (document, is_error) tuples ordered by
+              application_status_id.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        return [tuple(row) for row in database.session.execute(
+                select(ApplicationSummary.document,
+                       ApplicationSummary.is_error)
+                .order_by(ApplicationSummary.application_status_id))]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_FETCH_SUMMARIES')
+
+
+def replace_summaries_in_db(
+        summaries: list[dict], data_version: str) -> ApplicationSummaryState:
+    """
+    Replaces all application summaries and their refresh state.
+
+    The old summaries are deleted and the new ones inserted in a single
+    transaction, so concurrent readers see either the old or the new
+    summaries. On PostgreSQL concurrent refreshes are serialized with a
+    transaction-level advisory lock.
+
+    :param summaries: Dictionaries with the columns of the
+           application_summary table.
+    :param data_version: The applications version the summaries were
+           compiled from.
+    :returns: The new refresh state of the summaries.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    try:
+        if database.engine.dialect.name == 'postgresql':
+            database.session.execute(
+                    text('SELECT pg_advisory_xact_lock(:key)'),
+                    {'key': REFRESH_LOCK_KEY})
+        database.session.execute(delete(ApplicationSummary))
+        if summaries:
+            database.session.execute(insert(ApplicationSummary), summaries)
+        state = database.session.merge(ApplicationSummaryState(
+                state_id=SUMMARY_STATE_ID, data_version=data_version,
+                refreshed_at=dt.datetime.now(dt.timezone.utc)))
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_REFRESH_SUMMARIES')
+
+    return state
+
+
+def try_lock_summary_refresh_in_db() -> bool:
+    """
+    Tries to take the refresh lock of the application summaries.
+
+    On PostgreSQL a transaction-level advisory lock is taken without
+    waiting, so it is held until the summaries are replaced or the
+    transaction is rolled back. Other databases do not lock.
+
+    :returns: Whether the lock was taken.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    if database.engine.dialect.name != 'postgresql':
+        return True
+
+    try:
+        return bool(database.session.execute(
+                text('SELECT pg_try_advisory_xact_lock(:key)'),
+                {'key': REFRESH_LOCK_KEY}).scalar())
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError('COULD_NOT_LOCK_SUMMARY_REFRESH')
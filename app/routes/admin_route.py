@@ -0,0 +1,74 @@
+import logging
+
+from flask import Blueprint, Response, jsonify, request
+
+from app.extensions import applications_cache, database, event_broker, jwt, \
+    log_queue, replica_router, request_metrics
+from app.jwt_handlers import recruiter_required
+from app.utilities.status_codes import StatusCodes
+
+admin_bp = Blueprint('admin', __name__)
+
+
+@admin_bp.route('/cache', methods=['GET'])
+@recruiter_required()
+def get_cache_stats() -> tuple[Response, int]:
+    """
+    Retrieves the statistics of the applications cache.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    return jsonify(applications_cache.stats()), StatusCodes.OK
+
+
+@admin_bp.route('/cache', methods=['DELETE'])
+@recruiter_required()
+def invalidate_cache() -> tuple[Response, int]:
+    """
+    Invalidates the applications cache.
+
+    This function empties the applications cache, so that the next request
+    compiles the applications from the database. It should be called when
+    application data has changed.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    applications_cache.invalidate()
+    logging.info('%s - Invalidated applications cache.', requester_ip)
+    return jsonify(applications_cache.stats()), StatusCodes.OK
+
+
+@admin_bp.route('/metrics', methods=['GET'])
+@recruiter_required()
+def get_metrics() -> tuple[Response, int]:
+    """
+    Retrieves the runtime metrics of this process.
+
+    This function returns the statistics of the applications cache and the
+    JWT claims cache, the configuration, state and checkout statistics of
+    each database connection pool, keyed by bind name, the routing state of
+    the read replica, the request timings aggregated per route, the
+    counters of the log queue and the subscribers of the application
+    events.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    pools = {}
+    for bind_key, engine in database.engines.items():
+        pool = engine.pool
+        pools[bind_key or 'default'] = pool.metrics() \
+            if hasattr(pool, 'metrics') else {'status': pool.status()}
+
+    return jsonify({
+        'applications_cache': applications_cache.stats(),
+        'claims_cache': jwt.claims_cache.stats(),
+        'database_pools': pools,
+        'events': event_broker.stats(),
+        'logging': log_queue.stats(),
+        'replica': replica_router.stats(),
+        'routes': request_metrics.route_stats()
+    }), StatusCodes.OK
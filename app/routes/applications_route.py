@@ -1,56 +1,1021 @@
+import hashlib
+import itertools
+import json
 import logging
+import math
+import queue
+import time
+from datetime import date, datetime, timezone
+from typing import Iterator, Optional
 
-from flask import Blueprint, Response, jsonify, request
-from flask_jwt_extended import get_jwt, jwt_required
+from flask import Blueprint, Response, current_app, jsonify, request, \
+    stream_with_context
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
-from app.services.applications_service import compile_applications
+from app.extensions import applications_cache, event_broker
+from app.jwt_handlers import recruiter_required
+from app.services.applications_service import \
+    compile_application_changes, compile_application_details, \
+    compile_applications, compile_applications_page, \
+    get_application_versions, get_applications_validators, \
+    get_change_horizon, stream_applications
+from app.services.availability_service import find_available_person_ids
+from app.services.change_service import start_background_prune
+from app.services.export_service import EXPORT_FILE_EXTENSIONS, \
+    EXPORT_MIMETYPES, export_applications
+from app.services.matching_service import find_matches
+from app.services.summary_service import get_fresh_summary_state, \
+    get_summary_age, read_application_summaries
+from app.utilities.filters import ApplicationFilters, parse_filters
+from app.utilities.pagination import decode_change_token, decode_cursor, \
+    encode_change_token, encode_cursor
+from app.utilities.event_broker import Subscription
 from app.utilities.status_codes import StatusCodes
 
 applications_bp = Blueprint('applications', __name__)
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+EVENT_STREAM_MIMETYPE = 'text/event-stream'
+
+
+@applications_bp.after_request
+def prune_change_log(response: Response) -> Response:
+    """
+    Starts pruning the change log in the background when a prune is due.
+
+    The change log grows with every write of any service, so it is pruned
+    by the workers themselves rather than relying on a scheduler to run the
+    prune-changes command. Every route requires a recruiter, so only
+    successful responses start a prune; requests that fail authentication
+    never do.
+
+    :param response: The response to the request.
+    :returns: The unchanged response.
+    """
+
+    if response.status_code < 400:
+        start_background_prune(
+                current_app._get_current_object())  # type: ignore
+    return response
+
 
 @applications_bp.route('/', methods=['GET'])
-@jwt_required()
+@recruiter_required()
 def get_applications() -> tuple[Response, int]:
     """
     Retrieves applications information.
 
     This function fetches the applications information. It checks if the
     current user is authorized. If the user is, it fetches the applications.
+    If a limit or cursor query parameter is given, only one page of
+    applications is fetched. If the stream query parameter is set or NDJSON
+    is requested, all applications are streamed. The status, competence_id,
+    min_years, available_from and available_to query parameters narrow the
+    applications down in the database; malformed filters are answered with
+    400.
+
+    Non-streamed responses carry an ETag derived from the version of the
+    application data and the time of its last change as Last-Modified. If
+    the request's If-None-Match header matches the ETag, or it has none and
+    its If-Modified-Since header is not older than the last change, the
+    request is answered with 304 without compiling the applications. The
+    full list is otherwise served from the applications cache when possible,
+    or from the application summaries if APPLICATIONS_READ_MODEL is
+    'summary'.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        filters = parse_filters(request.args)
+    except ValueError:
+        logging.warning('%s - Invalid filter parameters.', requester_ip)
+        return (jsonify({'error': 'INVALID_FILTER_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    if is_stream_requested():
+        return get_applications_stream(filters)
+
+    if current_app.config['APPLICATIONS_READ_MODEL'] == 'summary' and \
+            not filters and 'limit' not in request.args and \
+            'cursor' not in request.args:
+        return get_applications_summary()
+
+    try:
+        version, last_modified = get_applications_validators()
+        etag = hashlib.sha1(f'{version}:'
+                            f'{request.query_string!r}'.encode()).hexdigest()
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    if is_not_modified(etag, last_modified):
+        logging.info('%s - Applications not modified.', requester_ip)
+        response = Response(status=StatusCodes.NOT_MODIFIED)
+        set_validators(response, etag, last_modified)
+        return response, StatusCodes.NOT_MODIFIED
+
+    if 'limit' in request.args or 'cursor' in request.args:
+        response, status_code = get_applications_page(filters)
+    else:
+        response, status_code = get_applications_list(etag, filters)
+
+    if status_code in (StatusCodes.OK, StatusCodes.PARTIAL_CONTENT):
+        set_validators(response, etag, last_modified)
+    return response, status_code
+
+
+@applications_bp.route('/<int:person_id>', methods=['GET'])
+@recruiter_required()
+def get_application(person_id: int) -> tuple[Response, int]:
+    """
+    Retrieves the application information of one applicant.
+
+    This function fetches the application of the applicant with the given
+    person_id with a single query instead of compiling all applications.
+    The response carries an ETag derived from the version of the
+    application of the applicant, so writes to other applications leave it
+    valid, and the compiled application is kept in the applications cache
+    under the same version.
+
+    :param person_id: The id of the applicant.
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        version, last_modified = get_applications_validators()
+        versions = get_application_versions([person_id], version)
+        etag = hashlib.sha1(f'application:{versions[person_id]}:'
+                            f'{person_id}'.encode()).hexdigest()
+        if is_not_modified(etag, last_modified):
+            logging.info('%s - Application not modified.', requester_ip)
+            response = Response(status=StatusCodes.NOT_MODIFIED)
+            set_validators(response, etag, last_modified)
+            return response, StatusCodes.NOT_MODIFIED
+
+        body, status_code = get_application_documents(
+                [person_id], versions)[person_id]
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch application.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATION'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    response = Response(body + b'\n', mimetype='application/json')
+    if status_code == StatusCodes.OK:
+        logging.info('%s - Responding with application.', requester_ip)
+        set_validators(response, etag, last_modified)
+    else:
+        logging.error('%s - %s', requester_ip, body.decode())
+    return response, status_code
+
+
+@applications_bp.route('/batch', methods=['GET'])
+@recruiter_required()
+def get_application_batch() -> tuple[Response, int]:
+    """
+    Retrieves the application information of several applicants.
+
+    This function fetches the applications of the applicants in the
+    comma-separated person_ids query parameter, in that order, with at most
+    one query for the applications that are not cached. Like the list of
+    applications, the response is an array if all applications could be
+    compiled, and otherwise an object with the compiled applications and
+    the errors; if none could be compiled, it is answered with 404. At most
+    APPLICATIONS_MAX_PAGE_SIZE applicants can be requested at once.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        person_ids = parse_person_ids(request.args.get('person_ids'))
+    except ValueError:
+        logging.warning('%s - Invalid batch parameters.', requester_ip)
+        return (jsonify({'error': 'INVALID_BATCH_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        version, last_modified = get_applications_validators()
+        versions = get_application_versions(person_ids, version)
+        etag = hashlib.sha1(f'applications:{list(versions.values())}:'
+                            f'{person_ids}'.encode()).hexdigest()
+        if is_not_modified(etag, last_modified):
+            logging.info('%s - Applications not modified.', requester_ip)
+            response = Response(status=StatusCodes.NOT_MODIFIED)
+            set_validators(response, etag, last_modified)
+            return response, StatusCodes.NOT_MODIFIED
+
+        documents = get_application_documents(person_ids, versions)
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    applications = b','.join(body for body, status_code in documents.values()
+                             if status_code == StatusCodes.OK)
+    errors = b','.join(body for body, status_code in documents.values()
+                       if status_code != StatusCodes.OK)
+
+    if not errors:
+        logging.info('%s - Responding with applications.', requester_ip)
+        body, status_code = b'[' + applications + b']', StatusCodes.OK
+    elif applications:
+        logging.warning('%s - Responding with applications and errors.',
+                        requester_ip)
+        body = b'{"applications":[' + applications + b'],"errors":[' + \
+            errors + b']}'
+        status_code = StatusCodes.PARTIAL_CONTENT
+    else:
+        logging.error('%s - No applications found.', requester_ip)
+        body = b'{"errors":[' + errors + b']}'
+        status_code = StatusCodes.NOT_FOUND
+
+    response = Response(body + b'\n', mimetype='application/json')
+    if status_code != StatusCodes.NOT_FOUND:
+        set_validators(response, etag, last_modified)
+    return response, status_code
+
+
+@applications_bp.route('/changes', methods=['GET'])
+@recruiter_required()
+def get_application_changes() -> tuple[Response, int]:
+    """
+    Retrieves the applications that changed since a changes token.
+
+    This function reads the change log after the position encoded in the
+    since query parameter and compiles only the applications whose status,
+    person, competences or availabilities changed, reading at most limit
+    changes. Applications that were removed appear as error records. The
+    response contains the applications, the errors, a next_since token to
+    poll with and whether more changes are available right away. Without
+    a since parameter, no applications are returned and next_since marks
+    the current end of the change log. Tokens older than
+    APPLICATION_CHANGES_RETENTION_DAYS are answered with 410, since the
+    changes they follow may have been pruned; the client has to fetch the
+    full list of applications again.
 
     :returns: A tuple containing the response and the status code.
     """
 
     requester_ip = request.remote_addr
+    since = request.args.get('since')
 
-    if get_jwt()['role'] != 1:
-        logging.warning(
-                f'{requester_ip} - Unauthorized access attempt to '
-                f'applications.')
-        return jsonify({'error': 'UNAUTHORIZED'}), StatusCodes.UNAUTHORIZED
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        token = decode_change_token(since) if since is not None else None
+    except ValueError as exception:
+        logging.warning('%s - Invalid changes parameters: %s',
+                        requester_ip, exception)
+        return (jsonify({'error': 'INVALID_CHANGES_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    now = time.time()
+    retention = current_app.config['APPLICATION_CHANGES_RETENTION_DAYS']
+    if token is not None and token[2] < now - retention * 86400:
+        logging.warning('%s - Changes token expired.', requester_ip)
+        return (jsonify({'error': 'CHANGES_TOKEN_EXPIRED'}),
+                StatusCodes.GONE)
 
     try:
-        errors, applications = compile_applications()
+        if token is None:
+            details: dict[int, dict] = {}
+            next_position, has_more = get_change_horizon(), False
+        else:
+            details, next_position, has_more = compile_application_changes(
+                    token[0], token[1], limit)
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch changes.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_CHANGES'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    # Pages of a backlog keep the age of the token they started from.
+    issued_at = token[2] if token is not None and has_more else now
+    logging.info('%s - Responding with %d changed applications.',
+                 requester_ip, len(details))
+    return jsonify({
+        'applications': [detail for detail in details.values()
+                         if 'error' not in detail],
+        'errors': [detail for detail in details.values()
+                   if 'error' in detail],
+        'next_since': encode_change_token(*next_position, issued_at),
+        'has_more': has_more
+    }), StatusCodes.OK
+
+
+@applications_bp.route('/events', methods=['GET'])
+@recruiter_required()
+def get_application_events() -> tuple[Response, int]:
+    """
+    Streams application events as Server-Sent Events.
+
+    This function subscribes the recruiter to the application events of
+    this process and pushes an application_created event for every new
+    application and a status_changed event for every status change. The
+    first event, ready, carries a changes token, so a client can fetch
+    whatever it missed between two connections from the changes feed; a
+    resync event asks it to do so right away. The stream holds no database
+    connection while it waits. A comment is sent every
+    APPLICATION_EVENTS_HEARTBEAT_INTERVAL seconds to keep the connection
+    open, and the stream ends after APPLICATION_EVENTS_MAX_DURATION
+    seconds or when the client falls behind, after which the client
+    reconnects. Requests beyond APPLICATION_EVENTS_MAX_SUBSCRIBERS are
+    answered with 503.
+
+    :returns: A tuple containing the streamed response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        since = encode_change_token(*get_change_horizon(), time.time())
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch changes.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_CHANGES'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    subscription = event_broker.subscribe()
+    if subscription is None:
+        logging.warning('%s - Too many application event subscribers.',
+                        requester_ip)
+        response = jsonify({'error': 'TOO_MANY_SUBSCRIBERS'})
+        response.headers['Retry-After'] = '30'
+        return response, StatusCodes.SERVICE_UNAVAILABLE
+
+    logging.info('%s - Streaming application events.', requester_ip)
+    events = stream_events(
+            subscription, since,
+            current_app.config['APPLICATION_EVENTS_HEARTBEAT_INTERVAL'],
+            current_app.config['APPLICATION_EVENTS_MAX_DURATION'])
+    response = Response(events, mimetype=EVENT_STREAM_MIMETYPE)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response, StatusCodes.OK
+
+
+def stream_events(subscription: Subscription, since: str,
+                  heartbeat_interval: float,
+                  max_duration: float) -> Iterator[str]:
+    """
+    Serializes the events of a subscription into Server-Sent Events.
+
+    The stream does not need the application context, so it is released
+    when the view returns. The subscription is removed when the stream
+    ends or the client disconnects.
+
+    :param subscription: The subscription to stream.
+    :param since: The changes token for the ready event.
+    :param heartbeat_interval: The time between keep-alive comments in
+           seconds.
+    :param max_duration: The time after which the stream ends in seconds.
+    :returns: An iterator over serialized events.
+    """
+
+    deadline = time.monotonic() + max_duration
+    try:
+        yield f'retry: 3000\nevent: ready\ndata: ' \
+              f'{json.dumps({"since": since})}\n\n'
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = subscription.get(min(heartbeat_interval, remaining))
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+                continue
+            if event is None:
+                break
+            yield f'event: {event.get("type", "message")}\n' \
+                  f'data: {json.dumps(event, separators=(",", ":"))}\n\n'
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@applications_bp.route('/export', methods=['GET'])
+@recruiter_required()
+def get_applications_export() -> tuple[Response, int]:
+    """
+    Exports all applications as a file.
+
+    This function streams all applications as an attachment in the format
+    given by the format query parameter: csv (default), parquet or arrow,
+    the latter two only if pyarrow is installed. The exclude query parameter
+    takes a comma-separated list of the personal columns pnr and email to
+    leave out. The applications are read from the database in chunks of
+    APPLICATIONS_EXPORT_CHUNK_SIZE while the file is sent. Errors that occur
+    before the first chunk are answered with an error response; later ones
+    abort the response, so a truncated file is never mistaken for a
+    complete one.
+
+    :returns: A tuple containing the streamed response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    export_format = request.args.get('format', 'csv').lower()
+    excluded_columns = [column.strip().lower() for column in
+                        request.args.get('exclude', '').split(',')
+                        if column.strip()]
+
+    try:
+        chunks = export_applications(
+                export_format,
+                current_app.config['APPLICATIONS_EXPORT_CHUNK_SIZE'],
+                excluded_columns)
+    except ValueError as exception:
+        logging.warning('%s - Invalid export parameters: %s',
+                        requester_ip, exception)
+        return (jsonify({'error': exception.args[0]}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        first_chunks = list(itertools.islice(chunks, 1))
+    except SQLAlchemyError:
+        logging.critical('%s - Could not export applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_EXPORT_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    logging.info('%s - Exporting applications as %s.',
+                 requester_ip, export_format)
+    chunks = stream_export(itertools.chain(first_chunks, chunks),
+                           requester_ip)
+    response = Response(stream_with_context(chunks),
+                        mimetype=EXPORT_MIMETYPES[export_format])
+    response.headers['Content-Disposition'] = \
+        f'attachment; filename=applications.' \
+        f'{EXPORT_FILE_EXTENSIONS[export_format]}'
+    return response, StatusCodes.OK
+
+
+def stream_export(chunks: Iterator[bytes],
+                  requester_ip: Optional[str]) -> Iterator[bytes]:
+    """
+    Passes on the chunks of an export, logging a database issue that
+    aborts it.
+
+    :param chunks: The chunks of the export.
+    :param requester_ip: The IP address of the requester, used for logging.
+    :returns: An iterator over the chunks.
+    :raises SQLAlchemyError: If there is a database issue while streaming.
+    """
+
+    try:
+        yield from chunks
+    except SQLAlchemyError:
+        logging.critical('%s - Could not export applications.', requester_ip)
+        raise
+
+
+def get_application_documents(
+        person_ids: list[int],
+        versions: dict[int, str]) -> dict[int, tuple[bytes, int]]:
+    """
+    Retrieves the serialized applications of the given applicants.
+
+    Each application is cached on its own under its version, so detail and
+    batch requests share cache entries, and a write to one application
+    leaves the cached others valid.
+    The applications missing from the cache are compiled with a single
+    query. Error records are cached with the status code 404.
+
+    :param person_ids: The ids of the applicants.
+    :param versions: The version of the application of each applicant.
+    :returns: A dictionary mapping each person_id, in the given order, to
+              its serialized application or error record and status code.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    keys = {person_id: f'application:{versions[person_id]}:{person_id}'
+            for person_id in person_ids}
+    documents: dict[int, tuple[bytes, int]] = {}
+    missing_person_ids = []
+    for person_id, key in keys.items():
+        cached_response = applications_cache.get(key)
+        if cached_response is None:
+            missing_person_ids.append(person_id)
+        else:
+            documents[person_id] = (cached_response.body,
+                                    cached_response.status_code)
+
+    if missing_person_ids:
+        details = compile_application_details(missing_person_ids)
+        for person_id, detail in details.items():
+            status_code = StatusCodes.NOT_FOUND if 'error' in detail else \
+                StatusCodes.OK
+            body = current_app.json.dumps(
+                    detail, separators=(',', ':')).encode()
+            documents[person_id] = (body, status_code)
+            applications_cache.set(keys[person_id], body, status_code)
+
+    return {person_id: documents[person_id] for person_id in person_ids}
+
+
+@applications_bp.route('/available', methods=['GET'])
+@recruiter_required()
+def get_available_applicants() -> tuple[Response, int]:
+    """
+    Retrieves the ids of applicants available during a window.
+
+    The window is given by the from_date and to_date query parameters in
+    the format YYYY-MM-DD; to_date defaults to from_date. With match=cover
+    an availability period must contain the whole window, with the default
+    match=overlap it must share at least one day with it.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    match = request.args.get('match', 'overlap')
+
+    try:
+        from_date = date.fromisoformat(request.args['from_date'])
+        to_date = date.fromisoformat(
+                request.args.get('to_date', request.args['from_date']))
+        if from_date > to_date or match not in ('overlap', 'cover'):
+            raise ValueError('INVALID_WINDOW')
+    except (KeyError, ValueError):
+        logging.warning('%s - Invalid availability parameters.', requester_ip)
+        return (jsonify({'error': 'INVALID_AVAILABILITY_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        person_ids = find_available_person_ids(from_date, to_date,
+                                               match == 'cover')
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch available applicants.',
+                         requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_AVAILABLE_APPLICANTS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    logging.info('%s - Responding with available applicants.', requester_ip)
+    return jsonify({'person_ids': person_ids}), StatusCodes.OK
+
+
+@applications_bp.route('/matches', methods=['GET'])
+@recruiter_required()
+def get_matching_applicants() -> tuple[Response, int]:
+    """
+    Retrieves the applicants best matching a set of competence requirements.
+
+    Every requirement query parameter has the form
+    competence_id:min_years[:weight]. Only persons with an application
+    meeting all requirements are returned, ranked by their weighted
+    experience. The
+    limit query parameter sets the number of applicants, which defaults to
+    MATCHING_DEFAULT_LIMIT.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        requirements, weights = parse_requirements(
+                request.args.getlist('requirement'))
+        limit = int(request.args.get(
+                'limit', current_app.config['MATCHING_DEFAULT_LIMIT']))
+        if not 0 < limit <= current_app.config['APPLICATIONS_MAX_PAGE_SIZE']:
+            raise ValueError('INVALID_LIMIT')
+    except ValueError:
+        logging.warning('%s - Invalid matching parameters.', requester_ip)
+        return (jsonify({'error': 'INVALID_MATCHING_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        matches = find_matches(requirements, weights, limit)
+    except SQLAlchemyError:
+        logging.critical('%s - Could not match applicants.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_MATCH_APPLICANTS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    logging.info('%s - Responding with matching applicants.', requester_ip)
+    return jsonify({'matches': matches}), StatusCodes.OK
+
+
+def get_applications_summary() -> tuple[Response, int]:
+    """
+    Retrieves the full list of applications from the application summaries.
+
+    The precompiled documents are read in a single scan and concatenated
+    into the same response a compiled list would produce. The ETag is
+    derived from the data version the summaries were compiled from. The
+    X-Summary-Age header holds the seconds since their last refresh and
+    X-Summary-Stale whether the application data changed since.
+
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        state, stale = get_fresh_summary_state()
+        etag = hashlib.sha1(
+                f'summary:{state.data_version}'.encode()).hexdigest()
+        if is_not_modified(etag):
+            response = Response(status=StatusCodes.NOT_MODIFIED)
+            status_code = StatusCodes.NOT_MODIFIED
+        else:
+            response, status_code = summaries_response(
+                    *read_application_summaries())
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    if status_code in (StatusCodes.OK, StatusCodes.PARTIAL_CONTENT,
+                       StatusCodes.NOT_MODIFIED):
+        set_validators(response, etag)
+        response.headers['X-Summary-Age'] = str(int(get_summary_age(state)))
+        response.headers['X-Summary-Stale'] = 'true' if stale else 'false'
+    return response, status_code
+
+
+def summaries_response(errors: list[str],
+                       applications: list[str]) -> tuple[Response, int]:
+    """
+    Builds the response for serialized application summaries.
+
+    The status codes follow those of a compiled list of applications.
+
+    :param errors: The serialized error records.
+    :param applications: The serialized compiled applications.
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    applications_array = f'[{",".join(applications)}]'
+
+    if not errors and not applications:
+        logging.error('%s - NO_APPLICATION_STATUSES_FOUND', requester_ip)
+        return (jsonify({'error': 'NO_APPLICATION_STATUSES_FOUND'}),
+                StatusCodes.NOT_FOUND)
+    elif not errors:
+        logging.info('%s - Responding with application summaries.',
+                     requester_ip)
+        return (Response(applications_array + '\n',
+                         mimetype='application/json'), StatusCodes.OK)
+    elif 0 < len(errors) < len(applications):
+        logging.warning('%s - Responding with application summaries and '
+                        'errors.', requester_ip)
+        body = f'{{"applications":{applications_array},' \
+               f'"errors":[{",".join(errors)}]}}\n'
+        return (Response(body, mimetype='application/json'),
+                StatusCodes.PARTIAL_CONTENT)
+    else:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+
+def get_applications_list(
+        cache_key: str,
+        filters: ApplicationFilters) -> tuple[Response, int]:
+    """
+    Retrieves the list of applications information matching the filters.
+
+    The list is served from the applications cache when possible. Compiled
+    lists are cached under the given key, which identifies the version of
+    the application data and the query parameters they were compiled from.
+
+    :param cache_key: The key of the list in the applications cache.
+    :param filters: The filters to apply.
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    cached_response = applications_cache.get(cache_key)
+    if cached_response is not None:
+        logging.info('%s - Responding with cached applications.', requester_ip)
+        return (Response(cached_response.body, mimetype='application/json'),
+                cached_response.status_code)
+
+    response, status_code = compile_applications_response(filters)
+    if status_code in (StatusCodes.OK, StatusCodes.PARTIAL_CONTENT):
+        applications_cache.set(cache_key, response.get_data(), status_code)
+    return response, status_code
+
+
+def is_not_modified(etag: str,
+                    last_modified: Optional[datetime] = None) -> bool:
+    """
+    Checks the conditional headers of the request against a response.
+
+    If-Modified-Since is only evaluated without If-None-Match, as HTTP
+    requires.
+
+    :param etag: The entity tag of the response.
+    :param last_modified: The time of the last change of the response, or
+           None if it is unknown.
+    :returns: Whether the client already holds the response.
+    """
+
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is None or request.if_modified_since is None:
+        return False
+    return to_utc(last_modified).replace(microsecond=0) <= \
+        request.if_modified_since
+
+
+def set_validators(response: Response, etag: str,
+                   last_modified: Optional[datetime] = None) -> None:
+    """
+    Sets the cache validators of an applications response.
+
+    The ETag is weak, since the same data may be sent with different content
+    encodings. Clients are asked to revalidate on every use.
+
+    :param response: The response to set the validators on.
+    :param etag: The entity tag of the response.
+    :param last_modified: The time of the last change of the response, or
+           None to send no Last-Modified header.
+    """
+
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = to_utc(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+
+
+def to_utc(moment: datetime) -> datetime:
+    """
+    Converts a time read from the database to UTC.
+
+    SQLite returns times without a time zone, which are in UTC.
+
+    :param moment: The time.
+    :returns: The time with the UTC time zone.
+    """
+
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def compile_applications_response(
+        filters: ApplicationFilters) -> tuple[Response, int]:
+    """
+    Compiles the list of applications matching the filters into a response.
+
+    :param filters: The filters to apply.
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        errors, applications = compile_applications(filters)
 
         if not errors:
-            logging.info(f'{requester_ip} - Responding with applications.')
+            logging.info('%s - Responding with applications.', requester_ip)
             return jsonify(applications), StatusCodes.OK
         elif 0 < len(errors) < len(applications):
-            logging.warning(f'{requester_ip} - Responding with applications '
-                            f'and errors.')
+            logging.warning('%s - Responding with applications and errors.',
+                            requester_ip)
             return (jsonify({'applications': applications, 'errors': errors}),
                     StatusCodes.PARTIAL_CONTENT)
         else:
-            logging.critical(f'{requester_ip} - Could not fetch applications.')
+            logging.critical('%s - Could not fetch applications.',
+                             requester_ip)
             return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
                     StatusCodes.INTERNAL_SERVER_ERROR)
 
     except NoResultFound as exception:
-        logging.error(f'{requester_ip} - {exception.args[0]}')
+        logging.error('%s - %s', requester_ip, exception.args[0])
+        return (jsonify({'error': exception.args[0]}),
+                StatusCodes.NOT_FOUND)
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+
+def get_applications_page(
+        filters: ApplicationFilters) -> tuple[Response, int]:
+    """
+    Retrieves one page of applications information.
+
+    This function fetches the page of applications matching the filters
+    following the position encoded in the cursor query parameter, containing
+    at most limit applications. The response contains the applications, the
+    errors of the page and a next_cursor, which is null on the last page. A
+    page with errors is answered with partial content.
+
+    :param filters: The filters to apply.
+    :returns: A tuple containing the response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        after_id = decode_cursor(request.args.get('cursor'))
+    except ValueError as exception:
+        logging.warning('%s - Invalid pagination parameters: %s',
+                        requester_ip, exception)
+        return (jsonify({'error': 'INVALID_PAGINATION_PARAMETERS'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        errors, applications, next_after_id = compile_applications_page(
+                after_id, limit, filters)
+    except NoResultFound as exception:
+        logging.error('%s - %s', requester_ip, exception.args[0])
+        return (jsonify({'error': exception.args[0]}),
+                StatusCodes.NOT_FOUND)
+    except SQLAlchemyError:
+        logging.critical('%s - Could not fetch applications.', requester_ip)
+        return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
+                StatusCodes.INTERNAL_SERVER_ERROR)
+
+    next_cursor = None
+    if next_after_id is not None:
+        next_cursor = encode_cursor(next_after_id)
+
+    page = {
+        'applications': applications,
+        'errors': errors,
+        'next_cursor': next_cursor
+    }
+
+    if errors:
+        logging.warning('%s - Responding with page of applications and '
+                        'errors.', requester_ip)
+        return jsonify(page), StatusCodes.PARTIAL_CONTENT
+
+    logging.info('%s - Responding with page of applications.', requester_ip)
+    return jsonify(page), StatusCodes.OK
+
+
+def get_applications_stream(
+        filters: ApplicationFilters) -> tuple[Response, int]:
+    """
+    Streams all applications information matching the filters.
+
+    This function streams the applications as a JSON array, or as one JSON
+    document per line if NDJSON is requested, while they are read from the
+    database chunk by chunk. Applications that could not be compiled appear
+    inline as error records. Errors that occur before the first record are
+    answered with the same responses as a regular request.
+
+    :param filters: The filters to apply.
+    :returns: A tuple containing the streamed response and the status code.
+    """
+
+    requester_ip = request.remote_addr
+    records = stream_applications(
+            current_app.config['APPLICATIONS_STREAM_CHUNK_SIZE'], filters)
+
+    try:
+        first_records = list(itertools.islice(records, 1))
+    except NoResultFound as exception:
+        logging.error('%s - %s', requester_ip, exception.args[0])
         return (jsonify({'error': exception.args[0]}),
                 StatusCodes.NOT_FOUND)
     except SQLAlchemyError:
-        logging.critical(f'{requester_ip} - Could not fetch applications.')
+        logging.critical('%s - Could not fetch applications.', requester_ip)
         return (jsonify({'error': 'COULD_NOT_FETCH_APPLICATIONS'}),
                 StatusCodes.INTERNAL_SERVER_ERROR)
+
+    records = itertools.chain(first_records, records)
+    ndjson = is_ndjson_requested()
+    chunks = serialize_records(records, requester_ip, ndjson)
+
+    logging.info('%s - Streaming applications.', requester_ip)
+    return (Response(stream_with_context(chunks),
+                     mimetype=NDJSON_MIMETYPE if ndjson else
+                     'application/json'),
+            StatusCodes.OK)
+
+
+def serialize_records(records: Iterator[dict], requester_ip: Optional[str],
+                      ndjson: bool) -> Iterator[str]:
+    """
+    Serializes streamed records into chunks of a JSON array or NDJSON.
+
+    A database issue while streaming is reported as a final error record,
+    since the status code has already been sent.
+
+    :param records: The records to serialize.
+    :param requester_ip: The IP address of the requester, used for logging.
+    :param ndjson: Whether to emit one JSON document per line instead of a
+           JSON array.
+    :returns: An iterator over serialized chunks.
+    """
+
+    separator = '\n' if ndjson else ','
+    prefix = ''
+
+    if not ndjson:
+        yield '['
+
+    try:
+        for record in records:
+            yield prefix + current_app.json.dumps(record)
+            prefix = separator
+    except SQLAlchemyError:
+        logging.critical('%s - Could not stream applications.', requester_ip)
+        yield prefix + current_app.json.dumps(
+                {'error': 'COULD_NOT_FETCH_APPLICATIONS'})
+
+    yield '\n' if ndjson else ']\n'
+
+
+def is_stream_requested() -> bool:
+    """
+    Checks whether the current request asks for a streamed response.
+
+    :returns: True if the stream query parameter is set or NDJSON is the
+              preferred response type.
+    """
+
+    stream = request.args.get('stream', '').lower()
+    return stream in ('1', 'true') or is_ndjson_requested()
+
+
+def is_ndjson_requested() -> bool:
+    """
+    Checks whether the current request prefers NDJSON over JSON.
+
+    :returns: True if NDJSON is the preferred response type.
+    """
+
+    return request.accept_mimetypes.best_match(
+            ['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def parse_person_ids(person_ids: Optional[str]) -> list[int]:
+    """
+    Parses the person_ids query parameter of a batch request.
+
+    :param person_ids: The raw comma-separated person_ids query parameter,
+           or None if it was omitted.
+    :returns: The distinct person_ids in the given order.
+    :raises ValueError: If no or more than APPLICATIONS_MAX_PAGE_SIZE ids
+            are given or an id is not a positive integer.
+    """
+
+    if not person_ids:
+        raise ValueError('NO_PERSON_IDS')
+
+    parsed = list(dict.fromkeys(int(person_id)
+                                for person_id in person_ids.split(',')))
+    if len(parsed) > current_app.config['APPLICATIONS_MAX_PAGE_SIZE'] or \
+            min(parsed) < 1:
+        raise ValueError('INVALID_PERSON_IDS')
+    return parsed
+
+
+def parse_limit(limit: Optional[str]) -> int:
+    """
+    Parses the limit query parameter of a paginated request.
+
+    :param limit: The raw limit query parameter, or None if it was omitted.
+    :returns: The page size, which defaults to APPLICATIONS_DEFAULT_PAGE_SIZE.
+    :raises ValueError: If the limit is not an integer between 1 and
+            APPLICATIONS_MAX_PAGE_SIZE.
+    """
+
+    if limit is None:
+        return current_app.config['APPLICATIONS_DEFAULT_PAGE_SIZE']
+
+    page_size = int(limit)
+    if not 0 < page_size <= current_app.config['APPLICATIONS_MAX_PAGE_SIZE']:
+        raise ValueError('INVALID_LIMIT')
+    return page_size
+
+
+def parse_requirements(
+        requirements: list[str]) -> tuple[dict[int, float], dict[int, float]]:
+    """
+    Parses the requirement query parameters of a matching request.
+
+    :param requirements: The raw requirements, each of the form
+           competence_id:min_years[:weight].
+    :returns: A tuple containing the minimum years of experience and the
+              weights per competence_id.
+    :raises ValueError: If no requirement is given or one is malformed.
+    """
+
+    if not requirements:
+        raise ValueError('NO_REQUIREMENTS')
+
+    min_years, weights = {}, {}
+    for requirement in requirements:
+        fields = requirement.split(':')
+        if len(fields) not in (2, 3):
+            raise ValueError('INVALID_REQUIREMENT')
+
+        competence_id = int(fields[0])
+        min_years[competence_id] = float(fields[1])
+        weights[competence_id] = float(fields[2]) if len(fields) == 3 else 1.0
+        for value in (min_years[competence_id], weights[competence_id]):
+            if not (math.isfinite(value) and value >= 0):
+                raise ValueError('INVALID_REQUIREMENT')
+
+    return min_years, weights
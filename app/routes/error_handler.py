@@ -20,14 +20,14 @@ def handle_all_unhandled_exceptions(exception):
     requester_ip = request.remote_addr
 
     if isinstance(exception, HTTPException) and 'favicon.ico' in request.url:
-        logging.warning(f'{requester_ip} - Favicon not found')
+        logging.warning('%s - Favicon not found', requester_ip)
         return jsonify({'error': 'NOT_FOUND'}), StatusCodes.NOT_FOUND
 
     if (isinstance(exception, HTTPException) and
             exception.code == StatusCodes.NOT_FOUND):
-        logging.error(f'{requester_ip} - URL not found: {request.url}')
+        logging.error('%s - URL not found: %s', requester_ip, request.url)
         return jsonify({'error': 'NOT_FOUND'}), StatusCodes.NOT_FOUND
 
-    logging.critical(f'{requester_ip} - ' + str(exception))
+    logging.critical('%s - %s', requester_ip, exception)
     return (jsonify({'error': 'INTERNAL_SERVER_ERROR'}),
             StatusCodes.INTERNAL_SERVER_ERROR)
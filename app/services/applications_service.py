@@ -1,47 +1,473 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from flask import Flask, current_app
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
+from app.models.application import ApplicationStatus
+from app.models.application_change import TRACKED_TABLES
 from app.repositories.applications_repository import \
-    get_application_statuses_from_db, get_availabilities_from_db, \
-    get_competences_from_db, get_personal_info_from_db
+    get_application_records_from_db, \
+    get_application_status_chunks_from_db, \
+    get_application_statuses_from_db, \
+    get_application_statuses_page_from_db, \
+    get_availabilities_for_persons_from_db, get_availabilities_from_db, \
+    get_competences_for_persons_from_db, get_competences_from_db, \
+    get_personal_info_from_db, get_persons_from_db
+from app.repositories.change_repository import get_change_horizon_from_db, \
+    get_changes_from_db, get_person_versions_from_db, \
+    get_table_versions_from_db
+from app.utilities.filters import ApplicationFilters
+
+# Applicants are handed to the workers in slices, so each worker checks out
+# a connection once per slice rather than once per applicant. There are a
+# few slices per worker to even out differences between them.
+SLICES_PER_WORKER = 4
+
+_executor_lock = threading.Lock()
 
 
-def compile_applications() -> tuple[list, list]:
+def compile_applications(
+        filters: Optional[ApplicationFilters] = None) -> tuple[list, list]:
     """
     Compiles applications information.
 
     This function fetches the applications information from the database. It
     checks each application status and compiles the personal information,
-    competences, and availabilities related to each application.
+    competences, and availabilities related to each application. Only the
+    applications matching the given filters are compiled.
 
+    :param filters: The filters to apply, or None for all applications.
     :returns: A tuple containing a list of errors and the compiled applications
     :raises NoResultFound: If no application statuses are found.
     :raises SQLAlchemyError: If there is a database issue.
     """
 
-    application_statuses = get_application_statuses_from_db()
+    application_statuses = get_application_statuses_from_db(filters)
+    return compile_application_statuses(application_statuses)
+
+
+def get_applications_version() -> str:
+    """
+    Computes a version token for the applications information.
+
+    The token is derived from the versions of the application status,
+    person, competence profile and availability tables, which are read with
+    a single small query and change with every committed write to them, so
+    it can be compared without compiling the applications.
+
+    :returns: The version token.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    return get_applications_validators()[0]
+
+
+def get_applications_validators() -> tuple[str, Optional[datetime]]:
+    """
+    Computes the version token and the last modification time of the
+    applications information.
+
+    The last modification time is only given once the data has been
+    unchanged for a second. HTTP dates have a resolution of one second, so
+    a later change could otherwise fall into the second a client already
+    holds.
+
+    :returns: A tuple containing the version token and the time of the last
+              change, or None.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    versions, changed_at, now = get_table_versions_from_db(TRACKED_TABLES)
+    token = hashlib.sha1(repr(versions).encode()).hexdigest()
+    if changed_at is None or changed_at > now - timedelta(seconds=1):
+        return token, None
+    return token, changed_at
+
+
+def get_application_versions(person_ids: list[int],
+                             applications_version: str) -> dict[int, str]:
+    """
+    Computes a version token for the application of each given applicant.
+
+    The token of an application changes only with writes concerning its
+    applicant, so writes to other applications leave it valid. Applicants
+    without recorded changes, e.g. because their rows predate the change
+    log, fall back to the version token of all applications.
+
+    :param person_ids: The ids of the applicants.
+    :param applications_version: The version token of all applications.
+    :returns: A dictionary mapping each person_id to its version token.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    versions = get_person_versions_from_db(person_ids)
+    return {person_id: ':'.join(map(str, versions[person_id]))
+            if person_id in versions else applications_version
+            for person_id in person_ids}
+
+
+def compile_applications_page(
+        after_id: Optional[int], limit: int,
+        filters: Optional[ApplicationFilters] = None) -> \
+        tuple[list, list, Optional[int]]:
+    """
+    Compiles one page of applications information.
+
+    This function fetches one keyset page of application statuses matching
+    the given filters and compiles only the applications on that page.
+
+    :param after_id: The application_status_id to continue after, or None
+           for the first page.
+    :param limit: The maximum number of applications on the page.
+    :param filters: The filters to apply, or None for all applications.
+    :returns: A tuple containing a list of errors, the compiled applications
+              and the application_status_id to continue after for the next
+              page, which is None on the last page.
+    :raises NoResultFound: If no application statuses are found.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    application_statuses, has_more = get_application_statuses_page_from_db(
+            after_id, limit, filters)
+    errors, compiled_applications = compile_application_statuses(
+            application_statuses)
+
+    next_after_id = None
+    if has_more:
+        next_after_id = application_statuses[-1].application_status_id
+    return errors, compiled_applications, next_after_id
+
+
+def stream_applications(
+        chunk_size: int,
+        filters: Optional[ApplicationFilters] = None) -> Iterator[dict]:
+    """
+    Streams applications information.
+
+    This function reads the application statuses matching the given filters
+    chunk by chunk and compiles one chunk at a time, so memory use does not
+    grow with the number of applications. Applications that could not be
+    compiled are yielded inline as error records of the form {'error': ...}.
+
+    :param chunk_size: The number of application statuses compiled at once.
+    :param filters: The filters to apply, or None for all applications.
+    :returns: An iterator over compiled applications and error records.
+    :raises NoResultFound: If no application statuses are found.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    for application_statuses in get_application_status_chunks_from_db(
+            chunk_size, filters):
+        yield from assemble_applications(application_statuses)
+
+
+def compile_application_details(person_ids: list[int]) -> dict[int, dict]:
+    """
+    Compiles the applications of the given applicants.
+
+    All applications are loaded with a single query. Each applicant is
+    compiled like in the list of applications; an applicant without an
+    application status, person or availabilities is compiled into an error
+    record of the form {'error': ...} instead.
+
+    :param person_ids: The ids of the applicants.
+    :returns: A dictionary mapping each person_id, in the given order, to its
+              compiled application or error record.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    records = get_application_records_from_db(person_ids)
+    details: dict[int, dict] = {}
+
+    for person_id in dict.fromkeys(person_ids):
+        record = records.get(person_id)
+        if record is None:
+            logging.debug('Application was not found: %s', person_id)
+            details[person_id] = {
+                'error': f'APPLICATION_NOT_FOUND: {person_id}'}
+        elif record.person is None:
+            logging.debug('Person was not found: %s', person_id)
+            details[person_id] = {'error': f'PERSON_NOT_FOUND: {person_id}'}
+        elif not record.availabilities:
+            logging.debug('No availabilities found for person: %s', person_id)
+            details[person_id] = {
+                'error': f'NO_AVAILABILITIES_FOUND_FOR_PERSON: {person_id}'}
+        else:
+            details[person_id] = {
+                'personal_info': record.person.to_dict(),
+                'competences': [competence.to_dict() for competence in
+                                record.competences],
+                'availabilities': [availability.to_dict() for availability
+                                   in record.availabilities],
+                'status': record.status
+            }
+
+    return details
+
+
+def get_change_horizon() -> tuple[int, int]:
+    """
+    Retrieves the current end of the change log.
+
+    :returns: The position and change id to request the changes after, so
+              that only changes made from now on are returned.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    return get_change_horizon_from_db(), 0
+
+
+def compile_application_changes(
+        position: int, change_id: int,
+        limit: int) -> tuple[dict[int, dict], tuple[int, int], bool]:
+    """
+    Compiles the applications that changed after a position in the change
+    log.
+
+    This function reads at most limit changes following the position and
+    compiles each changed application once, like compile_application_details
+    does; applications that were removed are compiled into error records.
+    Only the changes are read, so the cost depends on the number of changes,
+    not on the number of applications.
+
+    :param position: The position to continue after.
+    :param change_id: The id of the last served change at the position.
+    :param limit: The maximum number of changes to read.
+    :returns: A tuple containing the compiled applications or error records
+              by person_id, the position and change id to continue after,
+              and whether more changes are available.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    changes, horizon = get_changes_from_db(position, change_id, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    if has_more:
+        next_position = changes[-1][0], changes[-1][1]
+    elif horizon > position:
+        next_position = horizon, 0
+    else:
+        next_position = position, change_id
+
+    person_ids = list(dict.fromkeys(person_id for _, _, person_id in changes))
+    details = compile_application_details(person_ids) if person_ids else {}
+    return details, next_position, has_more
+
+
+def compile_application_statuses(
+        application_statuses: list[ApplicationStatus]) -> tuple[list, list]:
+    """
+    Compiles the applications belonging to the given application statuses.
+
+    An application whose person or availabilities are missing is reported as
+    an error instead of being compiled.
+
+    :param application_statuses: The application statuses to compile.
+    :returns: A tuple containing a list of errors and the compiled applications
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
     compiled_applications = []
     errors = []
 
+    for record in assemble_applications(application_statuses):
+        if 'error' in record:
+            errors.append(record)
+        else:
+            compiled_applications.append(record)
+
+    return errors, compiled_applications
+
+
+def assemble_applications(
+        application_statuses: list[ApplicationStatus]) -> Iterator[dict]:
+    """
+    Assembles the applications belonging to the given application statuses.
+
+    The applications are assembled in the APPLICATIONS_COMPILE_MODE of the
+    application: 'bulk' loads all applicants with a constant number of
+    queries, while 'serial' and 'threaded' look up each applicant on its
+    own, one after the other or on a bounded pool of worker threads. An
+    application that cannot be compiled is yielded as an error record of
+    the form {'error': ...} instead. The order of the application statuses
+    is preserved in every mode.
+
+    :param application_statuses: The application statuses to assemble.
+    :returns: An iterator over compiled applications and error records.
+    :raises SQLAlchemyError: If there is a database issue in bulk mode.
+    """
+
+    compile_mode = current_app.config.get('APPLICATIONS_COMPILE_MODE',
+                                          'bulk')
+    if compile_mode == 'serial':
+        return (assemble_application(entry.person_id, entry.status)
+                for entry in application_statuses)
+    if compile_mode == 'threaded':
+        return assemble_applications_concurrently(application_statuses)
+    return assemble_applications_in_bulk(application_statuses)
+
+
+def assemble_applications_in_bulk(
+        application_statuses: list[ApplicationStatus]) -> Iterator[dict]:
+    """
+    Assembles the applications belonging to the given application statuses
+    with bulk queries.
+
+    This function bulk loads the persons, competences and availabilities of
+    all given application statuses with a constant number of queries and
+    assembles them in memory, in the order of the application statuses. An
+    application whose person or availabilities are missing is yielded as an
+    error record of the form {'error': ...} instead.
+
+    :param application_statuses: The application statuses to assemble.
+    :returns: An iterator over compiled applications and error records.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    person_ids = [entry.person_id for entry in application_statuses]
+    applicants = get_persons_from_db(person_ids)
+    competences = get_competences_for_persons_from_db(person_ids)
+    availabilities = get_availabilities_for_persons_from_db(person_ids)
+
     for entry in application_statuses:
-        try:
-            person_id = entry.person_id
-            personal_info = get_personal_info_from_db(person_id).to_dict()
-            competences = get_competences_from_db(person_id)
-            availabilities = get_availabilities_from_db(person_id)
-
-            compiled_application = {
-                'personal_info': personal_info,
-                'competences': [competence.to_dict() for competence in
-                                competences],
-                'availabilities': [availability.to_dict() for availability in
-                                   availabilities],
-                'status': entry.status
-            }
+        person_id = entry.person_id
 
-            compiled_applications.append(compiled_application)
+        if person_id not in applicants:
+            logging.debug('Person was not found: %s', person_id)
+            yield {'error': f'PERSON_NOT_FOUND: {person_id}'}
+            continue
 
-        except (NoResultFound, SQLAlchemyError) as exception:
-            errors.append({'error': exception.args[0]})
+        if person_id not in availabilities:
+            logging.debug('No availabilities found for person: %s', person_id)
+            yield {'error': f'NO_AVAILABILITIES_FOUND_FOR_PERSON: '
+                            f'{person_id}'}
             continue
 
-    return errors, compiled_applications
+        yield {
+            'personal_info': applicants[person_id].to_dict(),
+            'competences': [competence.to_dict() for competence in
+                            competences.get(person_id, [])],
+            'availabilities': [availability.to_dict() for availability in
+                               availabilities[person_id]],
+            'status': entry.status
+        }
+
+
+def assemble_application(person_id: int, status: str) -> dict:
+    """
+    Assembles the application of one applicant.
+
+    The person, competences and availabilities of the applicant are looked
+    up with one query each. Any failure is isolated to this application,
+    which is then returned as an error record of the form {'error': ...}.
+
+    :param person_id: The id of the applicant.
+    :param status: The status of the application.
+    :returns: The compiled application or an error record.
+    """
+
+    try:
+        personal_info = get_personal_info_from_db(person_id).to_dict()
+        competences = get_competences_from_db(person_id)
+        availabilities = get_availabilities_from_db(person_id)
+
+        return {
+            'personal_info': personal_info,
+            'competences': [competence.to_dict() for competence in
+                            competences],
+            'availabilities': [availability.to_dict() for availability in
+                               availabilities],
+            'status': status
+        }
+
+    except (NoResultFound, SQLAlchemyError) as exception:
+        return {'error': exception.args[0]}
+
+
+def assemble_applications_concurrently(
+        application_statuses: list[ApplicationStatus]) -> Iterator[dict]:
+    """
+    Assembles the applications belonging to the given application statuses
+    on the compile workers of the application.
+
+    The application statuses are split into consecutive slices, each
+    assembled applicant by applicant in its own application context and
+    thereby its own database session. The statuses themselves are read in
+    the calling thread, since their session must not be shared. Slices are
+    yielded in order, so the result is the same as that of the serial mode.
+
+    :param application_statuses: The application statuses to assemble.
+    :returns: An iterator over compiled applications and error records.
+    """
+
+    app = current_app._get_current_object()  # type: ignore
+    executor = get_compile_executor()
+    applicants = [(entry.person_id, entry.status)
+                  for entry in application_statuses]
+    slice_size = max(1, -(-len(applicants) //
+                          (get_compile_workers() * SLICES_PER_WORKER)))
+    slices = [applicants[start:start + slice_size]
+              for start in range(0, len(applicants), slice_size)]
+
+    for assembled in executor.map(
+            lambda entries: _assemble_in_app_context(app, entries), slices):
+        yield from assembled
+
+
+def _assemble_in_app_context(
+        app: Flask, applicants: list[tuple[int, str]]) -> list[dict]:
+    """
+    Assembles applications in a new application context.
+
+    :param app: The Flask application.
+    :param applicants: (person_id, status) tuples of the applications.
+    :returns: The compiled applications and error records.
+    """
+
+    with app.app_context():
+        return [assemble_application(person_id, status)
+                for person_id, status in applicants]
+
+
+def get_compile_executor() -> ThreadPoolExecutor:
+    """
+    Returns the compile workers of the application.
+
+    The workers are shared by all requests of the application, so their
+    number bounds the connections used for compiling across concurrent
+    requests.
+
+    :returns: The thread pool executor.
+    """
+
+    with _executor_lock:
+        executor = current_app.extensions.get('compile_executor')
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                    max_workers=get_compile_workers(),
+                    thread_name_prefix='compile')
+            current_app.extensions['compile_executor'] = executor
+        return executor
+
+
+def get_compile_workers() -> int:
+    """
+    Returns the number of compile workers of the application.
+
+    The APPLICATIONS_COMPILE_WORKERS setting is capped by the connections
+    the database pool can hand out besides the one held by each concurrent
+    request, so the workers never wait for a connection.
+
+    :returns: The number of compile workers, at least one.
+    """
+
+    config = current_app.config
+    pool_capacity = config['SQLALCHEMY_POOL_SIZE'] + \
+        config['SQLALCHEMY_MAX_OVERFLOW'] - config['WORKER_CONCURRENCY']
+    return max(1, min(config['APPLICATIONS_COMPILE_WORKERS'], pool_capacity))
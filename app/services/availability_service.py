@@ -0,0 +1,88 @@
+import threading
+from datetime import date
+from typing import Optional
+
+from flask import current_app
+
+from app.extensions import database
+from app.repositories.availability_repository import \
+    get_available_person_ids_from_db, get_availability_periods_from_db
+from app.repositories.change_repository import get_table_versions_from_db
+from app.utilities.interval_tree import IntervalTree
+
+_tree_lock = threading.Lock()
+
+
+def find_available_person_ids(from_date: date, to_date: date,
+                              cover: bool = False) -> list[int]:
+    """
+    Finds the users available during a window.
+
+    On PostgreSQL the query is answered by the database from the GiST index
+    on availability periods. Other databases cannot index ranges, so an
+    in-memory interval tree of all availability periods is queried instead.
+    The tree is rebuilt whenever the version of the availability table
+    changes, which happens with every committed write to it.
+
+    :param from_date: The first day of the window.
+    :param to_date: The last day of the window.
+    :param cover: Whether an availability period must contain the whole
+           window instead of overlapping it.
+    :returns: The sorted ids of the matching users.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    if database.engine.dialect.name == 'postgresql':
+        return get_available_person_ids_from_db(from_date, to_date, cover)
+
+    tree = get_availability_tree()
+    start, end = from_date.toordinal(), to_date.toordinal()
+    if cover:
+        person_ids = tree.covering(start, end)
+    else:
+        person_ids = tree.overlapping(start, end)
+    return sorted(set(person_ids))
+
+
+def get_availability_tree() -> IntervalTree[int]:
+    """
+    Returns an interval tree of the current availability periods.
+
+    The tree maps the day ordinals of each period to its person_id. Periods
+    without a start or end date are open towards that side, and swapped
+    dates are put in order, like in the database query. The tree is kept
+    per application together with the version of the availability table it
+    was built from.
+
+    :returns: The interval tree.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    version = get_table_versions_from_db(('availability',))[0]
+    with _tree_lock:
+        cached = current_app.extensions.get('availability_tree')
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        tree = IntervalTree(
+                to_interval(from_date, to_date, person_id)
+                for person_id, from_date, to_date in
+                get_availability_periods_from_db())
+        current_app.extensions['availability_tree'] = (version, tree)
+        return tree
+
+
+def to_interval(from_date: Optional[date], to_date: Optional[date],
+                person_id: int) -> tuple[int, int, int]:
+    """
+    Converts an availability period to an interval of day ordinals.
+
+    :param from_date: The start date, or None if the period is open.
+    :param to_date: The end date, or None if the period is open.
+    :param person_id: The person_id of the period.
+    :returns: A (start, end, person_id) tuple with start <= end.
+    """
+
+    start = from_date.toordinal() if from_date else date.min.toordinal()
+    end = to_date.toordinal() if to_date else date.max.toordinal()
+    return min(start, end), max(start, end), person_id
@@ -0,0 +1,62 @@
+import datetime as dt
+import logging
+import threading
+import time
+
+from flask import Flask, current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.repositories.change_repository import delete_changes_before
+
+_prune_lock = threading.Lock()
+
+
+def prune_changes() -> int:
+    """
+    Deletes the changes older than the retention period from the change
+    log.
+
+    :returns: The number of deleted changes.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    retention = current_app.config['APPLICATION_CHANGES_RETENTION_DAYS']
+    deleted = delete_changes_before(dt.datetime.now(dt.timezone.utc) -
+                                    dt.timedelta(days=retention))
+    logging.info('Pruned %d changes older than %g days', deleted, retention)
+    return deleted
+
+
+def start_background_prune(app: Flask) -> bool:
+    """
+    Prunes the change log in a background thread if a prune is due.
+
+    A prune is due once APPLICATION_CHANGES_PRUNE_INTERVAL seconds passed
+    since the last one of this process, or since the first call; an
+    interval of 0 disables pruning, leaving it to the prune-changes
+    command. At most one prune runs per process at a time, and on
+    PostgreSQL at most one across all processes.
+
+    :param app: The Flask application to prune the change log of.
+    :returns: Whether a prune was started.
+    """
+
+    interval = app.config['APPLICATION_CHANGES_PRUNE_INTERVAL']
+    now = time.monotonic()
+    with _prune_lock:
+        pruned_at = app.extensions.setdefault('change_pruned_at', now)
+        if interval <= 0 or now - pruned_at < interval:
+            return False
+        app.extensions['change_pruned_at'] = now
+
+    def prune() -> None:
+        try:
+            with app.app_context():
+                prune_changes()
+                database.session.remove()
+        except SQLAlchemyError:
+            logging.error('Could not prune the change log.')
+
+    threading.Thread(target=prune, name='change-prune', daemon=True).start()
+    return True
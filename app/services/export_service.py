@@ -0,0 +1,316 @@
+import csv
+import io
+import itertools
+from typing import Iterable, Iterator
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None  # type: ignore
+
+from app.models.records import AvailabilityRecord, CompetenceRecord
+from app.repositories.applications_repository import \
+    get_application_export_chunks_from_db
+
+EXPORT_FORMATS = ('csv', 'parquet', 'arrow')
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream'
+}
+EXPORT_FILE_EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet',
+                          'arrow': 'arrows'}
+PERSON_COLUMNS = ('name', 'surname', 'pnr', 'email')
+# The personal identifiers that can be left out of an export.
+EXCLUDABLE_COLUMNS = ('pnr', 'email')
+
+
+def get_export_formats() -> tuple[str, ...]:
+    """
+    Returns the export formats supported in this environment.
+
+    CSV is always supported. Parquet and Arrow need pyarrow, which is
+    installed from requirements.txt but may be missing elsewhere.
+
+    :returns: The names of the supported export formats.
+    """
+
+    if pyarrow is None:
+        return ('csv',)
+    return EXPORT_FORMATS
+
+
+def export_applications(export_format: str, chunk_size: int,
+                        excluded_columns: Iterable[str] = ()) -> \
+        Iterator[bytes]:
+    """
+    Exports all applications in the given format.
+
+    The applications are read chunk by chunk and each chunk is encoded as
+    soon as it is read, so memory use does not grow with the number of
+    applications. Nothing is yielded before the first chunk has been read,
+    so database issues at the start of the export surface on the first
+    iteration. In CSV, competences are written as
+    'competence_id:years_of_experience' and availabilities as
+    'from_date/to_date', each separated by ';'. In Parquet, every chunk
+    becomes one row group, and in the Arrow IPC stream format one record
+    batch, with competences and availabilities as lists of structs.
+
+    :param export_format: One of the formats of get_export_formats.
+    :param chunk_size: The number of applications read at once.
+    :param excluded_columns: The EXCLUDABLE_COLUMNS to leave out.
+    :returns: An iterator over the chunks of the encoded export.
+    :raises ValueError: If the format is not supported or a column cannot
+            be excluded.
+    :raises SQLAlchemyError: If there is a database issue while iterating.
+    """
+
+    if export_format not in get_export_formats():
+        raise ValueError('UNSUPPORTED_EXPORT_FORMAT')
+    excluded_columns = set(excluded_columns)
+    if not excluded_columns.issubset(EXCLUDABLE_COLUMNS):
+        raise ValueError('INVALID_EXPORT_COLUMNS')
+
+    person_columns = tuple(column for column in PERSON_COLUMNS
+                           if column not in excluded_columns)
+    chunks = get_application_export_chunks_from_db(chunk_size, person_columns)
+
+    if export_format == 'csv':
+        return write_csv(chunks, person_columns)
+    return write_arrow(chunks, person_columns, export_format == 'parquet')
+
+
+def write_csv(chunks: Iterator[list[tuple]],
+              person_columns: tuple[str, ...]) -> Iterator[bytes]:
+    """
+    Encodes export chunks as CSV.
+
+    :param chunks: The chunks of get_application_export_chunks_from_db.
+    :param person_columns: The person columns of the chunks.
+    :returns: An iterator over the UTF-8 encoded CSV, one piece per chunk.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(('application_status_id', 'person_id', 'status',
+                     *person_columns, 'competences', 'availabilities'))
+
+    for chunk in chunks:
+        writer.writerows((*row[:-2], format_competences(row[-2]),
+                          format_availabilities(row[-1])) for row in chunk)
+        yield drain(buffer)
+
+    if buffer.tell():
+        yield drain(buffer)
+
+
+def format_competences(competences: list[CompetenceRecord]) -> str:
+    """
+    Formats competences for a CSV field.
+
+    :param competences: The competences of an applicant.
+    :returns: The competences as 'competence_id:years_of_experience',
+              separated by ';'.
+    """
+
+    return ';'.join(f'{competence.competence_id}:'
+                    f'{competence.years_of_experience}'
+                    for competence in competences)
+
+
+def format_availabilities(availabilities: list[AvailabilityRecord]) -> str:
+    """
+    Formats availabilities for a CSV field.
+
+    :param availabilities: The availabilities of an applicant.
+    :returns: The availabilities as 'from_date/to_date' in ISO 8601,
+              separated by ';'.
+    """
+
+    return ';'.join(f'{availability.from_date.isoformat()}/'
+                    f'{availability.to_date.isoformat()}'
+                    for availability in availabilities)
+
+
+def drain(buffer: io.StringIO) -> bytes:
+    """
+    Empties a text buffer.
+
+    :param buffer: The buffer.
+    :returns: The UTF-8 encoded content of the buffer.
+    """
+
+    content = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return content.encode('utf-8')
+
+
+def write_arrow(chunks: Iterator[list[tuple]],
+                person_columns: tuple[str, ...],
+                parquet: bool) -> Iterator[bytes]:
+    """
+    Encodes export chunks as Parquet or as an Arrow IPC stream.
+
+    Every chunk is converted into a record batch and written right away, as
+    a Parquet row group or an Arrow record batch, and the bytes written so
+    far are handed on. If the chunks fail, the footer of a Parquet file is
+    never written, so a truncated export cannot be mistaken for a complete
+    one.
+
+    :param chunks: The chunks of get_application_export_chunks_from_db.
+    :param person_columns: The person columns of the chunks.
+    :param parquet: Whether to write Parquet instead of an Arrow stream.
+    :returns: An iterator over the encoded export, one piece per chunk.
+    """
+
+    schema = export_schema(person_columns)
+    sink = ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema) if parquet else \
+        pyarrow.ipc.new_stream(sink, schema)
+
+    for chunk in chunks:
+        writer.write_batch(record_batch(chunk, schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+def export_schema(person_columns: tuple[str, ...]) -> 'pyarrow.Schema':
+    """
+    Returns the Arrow schema of an export.
+
+    :param person_columns: The person columns of the export.
+    :returns: The schema.
+    """
+
+    competence = pyarrow.struct([
+        ('competence_id', pyarrow.int64()),
+        ('years_of_experience', pyarrow.decimal128(4, 2))])
+    availability = pyarrow.struct([
+        ('from_date', pyarrow.date32()), ('to_date', pyarrow.date32())])
+
+    return pyarrow.schema([
+        ('application_status_id', pyarrow.int64()),
+        ('person_id', pyarrow.int64()),
+        ('status', pyarrow.string()),
+        *((column, pyarrow.string()) for column in person_columns),
+        ('competences', pyarrow.list_(competence)),
+        ('availabilities', pyarrow.list_(availability))])
+
+
+def record_batch(chunk: list[tuple],
+                 schema: 'pyarrow.Schema') -> 'pyarrow.RecordBatch':
+    """
+    Converts an export chunk into a record batch.
+
+    Competences and availabilities are converted column by column into the
+    values and offsets of list arrays, rather than into a Python dictionary
+    per record.
+
+    :param chunk: A chunk of get_application_export_chunks_from_db.
+    :param schema: The schema of the export.
+    :returns: The record batch.
+    """
+
+    columns = list(zip(*chunk))
+    fields = list(schema)
+    arrays = [pyarrow.array(values, field.type)
+              for values, field in zip(columns[:-2], fields[:-2])]
+    arrays += [list_of_structs(values, field.type)
+               for values, field in zip(columns[-2:], fields[-2:])]
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def list_of_structs(record_lists: Iterable[list],
+                    list_type: 'pyarrow.ListType') -> 'pyarrow.ListArray':
+    """
+    Converts lists of records into a list array of structs.
+
+    :param record_lists: A list of records per row. The records have an
+           attribute for every field of the structs.
+    :param list_type: The type of the list array.
+    :returns: The list array.
+    """
+
+    record_lists = list(record_lists)
+    records = list(itertools.chain.from_iterable(record_lists))
+    struct_fields = list(list_type.value_type)
+    offsets = pyarrow.array(
+            itertools.accumulate(
+                    (len(record_list) for record_list in record_lists),
+                    initial=0),
+            pyarrow.int32())
+    values = pyarrow.StructArray.from_arrays(
+            [pyarrow.array([getattr(record, field.name) for record in records],
+                           field.type) for field in struct_fields],
+            fields=struct_fields)
+    return pyarrow.ListArray.from_arrays(offsets, values, type=list_type)
+
+
+class ChunkSink:
+    """
+    A write-only file that hands out what was written since the last drain.
+
+    pyarrow writers record the file positions of row groups and batches, so
+    the position keeps counting across drains.
+
+    :ivar position: The number of bytes written in total.
+    :ivar closed: Whether the file was closed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new ChunkSink object.
+        """
+
+        self.position = 0
+        self.closed = False
+        self._parts: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        """
+        Writes data to the sink.
+
+        :param data: The data to write.
+        :returns: The number of bytes written.
+        """
+
+        data = bytes(data)
+        self._parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """
+        Returns the current position.
+
+        :returns: The number of bytes written in total.
+        """
+
+        return self.position
+
+    def flush(self) -> None:
+        """
+        Does nothing, since written data is kept until the next drain.
+        """
+
+    def close(self) -> None:
+        """
+        Marks the sink as closed.
+        """
+
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """
+        Hands out the data written since the last drain.
+
+        :returns: The data.
+        """
+
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+
+from flask import current_app
+
+from app.repositories.change_repository import get_change_horizon_from_db, \
+    get_changes_from_db, get_table_versions_from_db
+from app.repositories.competence_repository import \
+    get_competence_profile_rows_from_db
+from app.utilities.competence_matrix import CompetenceMatrix
+
+# The matrix depends on the competence profiles and on who has applied.
+MATRIX_TABLES = ('application_status', 'competence_profile')
+# Beyond this many changes since the matrix was built, rebuilding it is
+# cheaper than replacing the rows of the changed persons.
+MATRIX_MAX_CHANGES = 10000
+
+_matrix_lock = threading.Lock()
+
+
+def find_matches(requirements: dict[int, float], weights: dict[int, float],
+                 count: int) -> list[dict]:
+    """
+    Finds the best applicants for a set of competence requirements.
+
+    Applicants qualify if they have at least the required years of
+    experience in every required competence, and are ranked by their
+    weighted experience relative to the requirements.
+
+    :param requirements: The minimum years of experience per required
+           competence_id.
+    :param weights: The weight per competence_id. Competences without a
+           weight are weighted 1.
+    :param count: The maximum number of applicants to return.
+    :returns: A list of dictionaries with the person_id, score and years of
+              experience in the required competences of each applicant, best
+              first.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    matrix = get_competence_matrix()
+    return [{
+        'person_id': person_id,
+        'score': round(score, 4),
+        'experience': matrix.experience_of(person_id, requirements)
+    } for person_id, score in matrix.top(requirements, weights, count)]
+
+
+def get_competence_matrix() -> CompetenceMatrix:
+    """
+    Returns a competence matrix of the current competence profiles of the
+    applicants.
+
+    The matrix is kept per application together with the versions of the
+    application status and competence profile tables and the position in
+    the change log it was built at. When the versions change, the rows of
+    the persons recorded in the change log since are replaced in a copy of
+    the matrix, which covers updates and removals too. It is rebuilt from
+    scratch if more than MATRIX_MAX_CHANGES changes were recorded, or if
+    the changes since it was built may have been pruned.
+
+    :returns: The competence matrix.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    versions = get_table_versions_from_db(MATRIX_TABLES)[0]
+    retention = current_app.config['APPLICATION_CHANGES_RETENTION_DAYS']
+    with _matrix_lock:
+        cached = current_app.extensions.get('competence_matrix')
+        if cached is not None and cached[0] == versions:
+            return cached[3]
+
+        if cached is not None and \
+                time.time() - cached[2] < retention * 86400:
+            (position, change_id), _, matrix = cached[1:]
+            changes, horizon = get_changes_from_db(
+                    position, change_id, MATRIX_MAX_CHANGES + 1)
+            if len(changes) <= MATRIX_MAX_CHANGES:
+                person_ids = sorted({person_id
+                                     for _, _, person_id in changes})
+                matrix = matrix.copy()
+                matrix.replace(person_ids,
+                               get_competence_profile_rows_from_db(person_ids)
+                               if person_ids else [])
+                if horizon > position:
+                    position, change_id = horizon, 0
+                current_app.extensions['competence_matrix'] = (
+                        versions, (position, change_id), time.time(), matrix)
+                return matrix
+
+        logging.debug('Rebuilding competence matrix')
+        horizon = get_change_horizon_from_db()
+        matrix = CompetenceMatrix()
+        matrix.apply(get_competence_profile_rows_from_db())
+        current_app.extensions['competence_matrix'] = (
+                versions, (horizon, 0), time.time(), matrix)
+        return matrix
@@ -0,0 +1,174 @@
+import datetime as dt
+import logging
+import threading
+
+from flask import Flask, current_app
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+
+from app.extensions import database
+from app.models.application_summary import ApplicationSummaryState
+from app.repositories.applications_repository import \
+    get_application_status_chunks_from_db
+from app.repositories.summary_repository import \
+    get_summary_documents_from_db, get_summary_state_from_db, \
+    replace_summaries_in_db, try_lock_summary_refresh_in_db
+from app.services.applications_service import assemble_applications, \
+    get_applications_version
+
+_background_refresh_lock = threading.Lock()
+
+
+def refresh_application_summaries() -> ApplicationSummaryState:
+    """
+    Recompiles all application summaries.
+
+    This function compiles the applications chunk by chunk, serializes each
+    compiled application or error record as JSON and replaces the stored
+    summaries in a single transaction. The version of the application data
+    is read before compiling, so changes made during a refresh are picked up
+    by the next one.
+
+    :returns: The new refresh state of the summaries.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    data_version = get_applications_version()
+    chunk_size = current_app.config['APPLICATIONS_STREAM_CHUNK_SIZE']
+    summaries = []
+
+    try:
+        for application_statuses in get_application_status_chunks_from_db(
+                chunk_size):
+            records = assemble_applications(application_statuses)
+            for entry, record in zip(application_statuses, records):
+                summaries.append({
+                    'application_status_id': entry.application_status_id,
+                    'person_id': entry.person_id,
+                    'document': current_app.json.dumps(
+                            record, separators=(',', ':')),
+                    'is_error': 'error' in record
+                })
+    except NoResultFound:
+        logging.debug('No application statuses to summarize')
+
+    state = replace_summaries_in_db(summaries, data_version)
+    logging.info('Refreshed %d application summaries', len(summaries))
+    return state
+
+
+def refresh_stale_summaries() -> bool:
+    """
+    Recompiles the application summaries unless they are fresh already.
+
+    On PostgreSQL the refresh takes the refresh lock without waiting, so
+    when several workers find the summaries stale only one of them
+    recompiles them and the others keep serving the stale summaries.
+
+    :returns: Whether the summaries were refreshed.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    if not try_lock_summary_refresh_in_db():
+        database.session.rollback()
+        return False
+
+    state = get_summary_state_from_db()
+    if state is not None and \
+            state.data_version == get_applications_version():
+        database.session.rollback()
+        return False
+
+    refresh_application_summaries()
+    return True
+
+
+def get_fresh_summary_state() -> tuple[ApplicationSummaryState, bool]:
+    """
+    Returns the refresh state of the summaries, refreshing them if needed.
+
+    Summaries that were never refreshed are refreshed right away. Otherwise
+    the stored summaries are served, even if the application data changed
+    since, so requests never wait for a refresh. With
+    APPLICATION_SUMMARY_REFRESH set to 'on_change', changed data starts a
+    refresh in a background thread. With 'scheduled' that happens only
+    once the summaries are older than APPLICATION_SUMMARY_MAX_AGE seconds;
+    they can also be refreshed by the refresh-summaries command.
+
+    :returns: A tuple containing the refresh state of the summaries about to
+              be served and whether the application data changed since.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    state = get_summary_state_from_db()
+    if state is None:
+        state = refresh_application_summaries()
+
+    if state.data_version == get_applications_version():
+        return state, False
+
+    if current_app.config['APPLICATION_SUMMARY_REFRESH'] == 'on_change' \
+            or get_summary_age(state) > \
+            current_app.config['APPLICATION_SUMMARY_MAX_AGE']:
+        start_background_refresh(
+                current_app._get_current_object())  # type: ignore
+    return state, True
+
+
+def get_summary_age(state: ApplicationSummaryState) -> float:
+    """
+    Computes the time since the summaries were refreshed.
+
+    :param state: The refresh state of the summaries.
+    :returns: The age of the summaries in seconds.
+    """
+
+    refreshed_at = state.refreshed_at
+    if refreshed_at.tzinfo is None:
+        refreshed_at = refreshed_at.replace(tzinfo=dt.timezone.utc)
+    return (dt.datetime.now(dt.timezone.utc) - refreshed_at).total_seconds()
+
+
+def start_background_refresh(app: Flask) -> bool:
+    """
+    Refreshes the summaries in a background thread.
+
+    At most one background refresh runs per process at a time, and on
+    PostgreSQL at most one across all processes.
+
+    :param app: The Flask application to refresh the summaries of.
+    :returns: Whether a refresh was started.
+    """
+
+    if not _background_refresh_lock.acquire(blocking=False):
+        return False
+
+    def refresh() -> None:
+        try:
+            with app.app_context():
+                refresh_stale_summaries()
+                database.session.remove()
+        except SQLAlchemyError:
+            logging.error('Could not refresh application summaries.')
+        finally:
+            _background_refresh_lock.release()
+
+    threading.Thread(target=refresh, name='summary-refresh',
+                     daemon=True).start()
+    return True
+
+
+def read_application_summaries() -> tuple[list[str], list[str]]:
+    """
+    Reads the stored application summaries.
+
+    :returns: A tuple containing the serialized error records and the
+              serialized compiled applications, each in order of
+              application_status_id.
+    :raises SQLAlchemyError: If there is a database issue.
+    """
+
+    errors: list[str] = []
+    applications: list[str] = []
+    for document, is_error in get_summary_documents_from_db():
+        (errors if is_error else applications).append(document)
+    return errors, applications
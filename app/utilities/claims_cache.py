@@ -0,0 +1,194 @@
+import datetime as dt
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union
+
+from flask import Flask
+
+
+class CachedClaims:
+    """
+    Represents the verified claims of a token stored in the claims cache.
+
+    :ivar claims: The verified claims of the token.
+    :ivar expires_at: The monotonic time at which the entry expires.
+    """
+
+    __slots__ = ('claims', 'expires_at')
+
+    def __init__(self, claims: dict, expires_at: float) -> None:
+        """
+        Initializes a new CachedClaims object.
+
+        :param claims: The verified claims of the token.
+        :param expires_at: The monotonic time at which the entry expires.
+        """
+
+        self.claims = claims
+        self.expires_at = expires_at
+
+
+class ClaimsCache:
+    """
+    A process-local cache of the claims of verified JWTs.
+
+    Entries are keyed by a hash of the raw token, so the tokens themselves
+    are not kept in memory. An entry expires after a configurable time to
+    live or when its token expires, whichever comes first, and the number of
+    entries is bounded by evicting the least recently used ones. The
+    expiry of the token is checked again on every hit. The cache is thread
+    safe and counts the hits, which are the skipped verifications.
+
+    :ivar enabled: Whether the cache stores and returns entries.
+    :ivar ttl: The time to live of an entry in seconds.
+    :ivar max_entries: The maximum number of entries.
+    """
+
+    def __init__(self, enabled: bool = True, ttl: float = 60,
+                 max_entries: int = 1024) -> None:
+        """
+        Initializes a new ClaimsCache object.
+
+        :param enabled: Whether the cache stores and returns entries.
+        :param ttl: The time to live of an entry in seconds.
+        :param max_entries: The maximum number of entries.
+        """
+
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, CachedClaims] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the cache from the Flask application configuration.
+
+        The cache is emptied and its counters are reset.
+
+        :param app: The Flask application.
+        """
+
+        with self._lock:
+            self.enabled = app.config.get('JWT_CLAIMS_CACHE_ENABLED', True)
+            self.ttl = app.config.get('JWT_CLAIMS_CACHE_TTL', 60)
+            self.max_entries = app.config.get('JWT_CLAIMS_CACHE_MAX_ENTRIES',
+                                              1024)
+            self._entries.clear()
+            self._hits = self._misses = 0
+            self._evictions = self._expirations = 0
+
+    def get(self, token: str,
+            leeway: Union[int, float, dt.timedelta] = 0) -> Optional[dict]:
+        """
+        Retrieves the verified claims of a token.
+
+        :param token: The raw token.
+        :param leeway: The leeway in seconds allowed when checking the
+               expiry of the token.
+        :returns: The claims, or None if there is no fresh entry or the
+                  token has expired.
+        """
+
+        if not self.enabled:
+            return None
+
+        if isinstance(leeway, dt.timedelta):
+            leeway = leeway.total_seconds()
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                    entry.expires_at <= time.monotonic() or
+                    self._is_expired(entry.claims, leeway)):
+                del self._entries[key]
+                self._expirations += 1
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return dict(entry.claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        """
+        Stores the claims of a token that has just been verified.
+
+        Must only be called for valid tokens. The least recently used entry
+        is evicted if the cache is full.
+
+        :param token: The raw token.
+        :param claims: The verified claims of the token.
+        """
+
+        if not self.enabled or self.max_entries < 1:
+            return
+
+        lifetime = float(self.ttl)
+        if 'exp' in claims:
+            lifetime = min(lifetime, claims['exp'] - time.time())
+        if lifetime <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            self._entries[key] = CachedClaims(
+                    dict(claims), time.monotonic() + lifetime)
+
+    def stats(self) -> dict:
+        """
+        Returns the current state and counters of the cache.
+
+        Hits are token verifications that were skipped.
+
+        :returns: A dictionary with the cache statistics.
+        """
+
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """
+        Derives the key of a token.
+
+        :param token: The raw token.
+        :returns: The SHA-256 digest of the token.
+        """
+
+        return hashlib.sha256(token.encode()).digest()
+
+    @staticmethod
+    def _is_expired(claims: dict, leeway: float) -> bool:
+        """
+        Checks the expiry claim like PyJWT does when decoding.
+
+        :param claims: The claims of the token.
+        :param leeway: The leeway in seconds.
+        :returns: Whether the token has expired.
+        """
+
+        return 'exp' in claims and claims['exp'] <= time.time() - leeway
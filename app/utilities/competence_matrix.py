@@ -0,0 +1,188 @@
+from typing import Iterable
+
+import numpy as np
+
+ABSENT = -1.0
+SATURATION = 2.0
+
+
+class CompetenceMatrix:
+    """
+    A dense applicant by competence matrix of years of experience.
+
+    Row i belongs to the person in person_ids[i] and column j to the
+    competence in competence_ids[j]. A person with several profiles for the
+    same competence is credited with the largest years of experience. Cells
+    without a profile hold ABSENT. Rows and columns are appended as new
+    persons and competences appear, and the row of a person can be replaced,
+    so the matrix can be updated in place with the profiles of the persons
+    that changed.
+
+    :ivar person_ids: The person_id of each row.
+    :ivar competence_ids: The competence_id of each column.
+    :ivar experience: The years of experience, one row per person.
+    """
+
+    __slots__ = ('person_ids', 'competence_ids', 'experience', '_rows',
+                 '_columns')
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty CompetenceMatrix object.
+        """
+
+        self.person_ids = np.empty(0, dtype=np.int64)
+        self.competence_ids: list[int] = []
+        self.experience = np.empty((0, 0), dtype=np.float32)
+        self._rows: dict[int, int] = {}
+        self._columns: dict[int, int] = {}
+
+    def copy(self) -> 'CompetenceMatrix':
+        """
+        Copies the matrix, so it can be updated while the original is read.
+
+        :returns: An independent copy of the matrix.
+        """
+
+        matrix = CompetenceMatrix()
+        matrix.person_ids = self.person_ids.copy()
+        matrix.competence_ids = list(self.competence_ids)
+        matrix.experience = self.experience.copy()
+        matrix._rows = dict(self._rows)
+        matrix._columns = dict(self._columns)
+        return matrix
+
+    def apply(self, profiles: Iterable[tuple[int, int, int, float]]) -> None:
+        """
+        Adds competence profiles to the matrix.
+
+        :param profiles: (competence_profile_id, person_id, competence_id,
+               years_of_experience) tuples.
+        """
+
+        rows, columns, years = [], [], []
+        new_person_ids = []
+
+        for _, person_id, competence_id, years_of_experience in profiles:
+            if person_id not in self._rows:
+                self._rows[person_id] = len(self._rows)
+                new_person_ids.append(person_id)
+            if competence_id not in self._columns:
+                self._columns[competence_id] = len(self._columns)
+                self.competence_ids.append(competence_id)
+            rows.append(self._rows[person_id])
+            columns.append(self._columns[competence_id])
+            years.append(float(years_of_experience or 0))
+
+        added_rows = len(self._rows) - self.experience.shape[0]
+        added_columns = len(self._columns) - self.experience.shape[1]
+        if added_rows or added_columns:
+            self.experience = np.pad(
+                    self.experience, ((0, added_rows), (0, added_columns)),
+                    constant_values=ABSENT)
+            self.person_ids = np.concatenate(
+                    (self.person_ids, np.array(new_person_ids,
+                                               dtype=np.int64)))
+
+        np.maximum.at(self.experience, (np.array(rows, dtype=np.intp),
+                                        np.array(columns, dtype=np.intp)),
+                      np.array(years, dtype=np.float32))
+
+    def replace(self, person_ids: Iterable[int],
+                profiles: Iterable[tuple[int, int, int, float]]) -> None:
+        """
+        Replaces the competence profiles of some persons.
+
+        The rows of the persons are cleared before their current profiles
+        are added, so a person without profiles is left without any
+        competence.
+
+        :param person_ids: The ids of the persons to replace.
+        :param profiles: All (competence_profile_id, person_id,
+               competence_id, years_of_experience) tuples of these persons.
+        """
+
+        rows = [self._rows[person_id] for person_id in person_ids
+                if person_id in self._rows]
+        self.experience[np.array(rows, dtype=np.intp)] = ABSENT
+        self.apply(profiles)
+
+    def score(self, requirements: dict[int, float],
+              weights: dict[int, float]) -> np.ndarray:
+        """
+        Scores every person against competence requirements.
+
+        The score is the weighted sum over the required competences of the
+        years of experience relative to the required years, at least one,
+        capped at SATURATION times the requirement. Persons that lack a
+        required competence or have fewer years than required score NaN.
+
+        :param requirements: The minimum years of experience per required
+               competence_id.
+        :param weights: The weight per competence_id. Competences without a
+               weight are weighted 1.
+        :returns: The score of each row.
+        """
+
+        scores = np.zeros(len(self.person_ids), dtype=np.float32)
+        qualified = np.ones(len(self.person_ids), dtype=bool)
+
+        for competence_id, min_years in requirements.items():
+            column = self._columns.get(competence_id)
+            if column is None:
+                qualified[:] = False
+                break
+
+            years = self.experience[:, column]
+            qualified &= (years != ABSENT) & (years >= min_years)
+            scores += weights.get(competence_id, 1.0) * np.minimum(
+                    years / max(min_years, 1.0), SATURATION)
+
+        scores[~qualified] = np.nan
+        return scores
+
+    def top(self, requirements: dict[int, float], weights: dict[int, float],
+            count: int) -> list[tuple[int, float]]:
+        """
+        Finds the best qualified persons for competence requirements.
+
+        The score of the count-th best person is found with a partial sort,
+        and only the persons scoring at least as much are ordered, by
+        descending score and ascending person_id.
+
+        :param requirements: The minimum years of experience per required
+               competence_id.
+        :param weights: The weight per competence_id.
+        :param count: The maximum number of persons to return.
+        :returns: A list of (person_id, score) tuples.
+        """
+
+        scores = self.score(requirements, weights)
+        candidates = np.flatnonzero(~np.isnan(scores))
+        if count < len(candidates):
+            threshold = np.partition(-scores[candidates], count - 1)[count - 1]
+            candidates = candidates[-scores[candidates] <= threshold]
+
+        order = np.lexsort((self.person_ids[candidates], -scores[candidates]))
+        candidates = candidates[order[:count]]
+        return [(int(person_id), float(score)) for person_id, score in
+                zip(self.person_ids[candidates], scores[candidates])]
+
+    def experience_of(self, person_id: int,
+                      competence_ids: Iterable[int]) -> dict[int, float]:
+        """
+        Returns the years of experience of a person in some competences.
+
+        :param person_id: The id of the person.
+        :param competence_ids: The competences to report.
+        :returns: A dictionary mapping competence_ids the person has a
+                  profile for to years of experience.
+        """
+
+        row = self.experience[self._rows[person_id]]
+        experience = {}
+        for competence_id in competence_ids:
+            column = self._columns.get(competence_id)
+            if column is not None and row[column] != ABSENT:
+                experience[competence_id] = float(row[column])
+        return experience
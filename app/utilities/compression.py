@@ -0,0 +1,151 @@
+import zlib
+from typing import Iterable, Iterator, Optional, Union
+
+from flask import Flask, Response, request
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson',
+                          'text/csv')
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    Compresses data with the given content encoding.
+
+    :param data: The data to compress.
+    :param encoding: The content encoding, either 'gzip' or 'br'.
+    :param level: The gzip compression level or brotli quality.
+    :returns: The compressed data.
+    """
+
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[Union[str, bytes]], encoding: str,
+                    level: int) -> Iterator[bytes]:
+    """
+    Compresses a stream of chunks with the given content encoding.
+
+    The compressor buffers small chunks internally, so compressed output is
+    only yielded once enough data has accumulated, and the rest is flushed
+    at the end of the stream.
+
+    :param chunks: The chunks to compress.
+    :param encoding: The content encoding, either 'gzip' or 'br'.
+    :param level: The gzip compression level or brotli quality.
+    :returns: An iterator over compressed chunks.
+    """
+
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            compressed_chunk = process(chunk)
+            if compressed_chunk:
+                yield compressed_chunk
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+class Compressor:
+    """
+    Compresses JSON responses of the API with a negotiated content encoding.
+
+    Responses below the minimum size are sent uncompressed, since compressing
+    them costs more CPU than it saves bytes. Streamed responses are always
+    compressed, since their size is unknown up front. Brotli is offered if
+    the optional brotli package is installed, gzip otherwise.
+
+    :ivar enabled: Whether responses are compressed.
+    :ivar min_size: The minimum body size in bytes to compress.
+    :ivar gzip_level: The gzip compression level.
+    :ivar brotli_quality: The brotli compression quality.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new Compressor object.
+        """
+
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 4
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the compressor and registers it with the application.
+
+        :param app: The Flask application.
+        """
+
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.gzip_level = app.config.get('COMPRESSION_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+        app.after_request(self.compress_response)
+
+    def compress_response(self, response: Response) -> Response:
+        """
+        Compresses a response if the client accepts a supported encoding.
+
+        :param response: The response to compress.
+        :returns: The possibly compressed response.
+        """
+
+        if not self.enabled or not request.path.startswith('/api/') or \
+                response.mimetype not in COMPRESSIBLE_MIMETYPES or \
+                'Content-Encoding' in response.headers or \
+                not 200 <= response.status_code < 300:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate_encoding()
+        if encoding is None:
+            return response
+
+        level = self.brotli_quality if encoding == 'br' else self.gzip_level
+
+        if response.is_streamed:
+            response.response = compress_stream(
+                    response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def negotiate_encoding() -> Optional[str]:
+        """
+        Chooses the content encoding preferred by the client.
+
+        :returns: 'br' or 'gzip', or None if no supported encoding is
+                  accepted.
+        """
+
+        available_encodings = ['gzip']
+        if brotli is not None:
+            available_encodings.insert(0, 'br')
+        return request.accept_encodings.best_match(available_encodings)
@@ -0,0 +1,309 @@
+import json
+import logging
+import queue
+import select
+import threading
+from typing import Any, Optional
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Engine
+
+# The channel the application_status trigger notifies on PostgreSQL.
+APPLICATION_EVENTS_CHANNEL = 'application_events'
+BROKER_BACKENDS = ('auto', 'memory', 'postgresql')
+
+
+class Subscription:
+    """
+    The queue of events of one subscriber.
+
+    A subscriber that falls behind by more than the queue size is closed
+    instead of blocking the publisher, and has to catch up through the
+    changes feed.
+
+    :ivar events: The queued events. None marks the end of the subscription.
+    :ivar size: The maximum number of queued events.
+    :ivar closed: Whether the subscription was closed by the broker.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Initializes a new Subscription object.
+
+        :param size: The maximum number of queued events.
+        """
+
+        self.events: queue.Queue = queue.Queue(maxsize=size + 1)
+        self.size = size
+        self.closed = False
+
+    def get(self, timeout: float) -> Optional[dict]:
+        """
+        Waits for the next event.
+
+        :param timeout: The maximum time to wait in seconds.
+        :returns: The event, or None if the subscription was closed.
+        :raises queue.Empty: If no event arrived within the timeout.
+        """
+
+        return self.events.get(timeout=timeout)
+
+    def put(self, event: dict) -> bool:
+        """
+        Queues an event unless the subscriber fell behind.
+
+        :param event: The event.
+        :returns: Whether the subscription is still open.
+        """
+
+        if self.closed:
+            return False
+        if self.events.qsize() >= self.size:
+            self.close()
+            return False
+        self.events.put_nowait(event)
+        return True
+
+    def close(self) -> None:
+        """
+        Ends the subscription after the queued events.
+        """
+
+        self.closed = True
+        try:
+            self.events.put_nowait(None)
+        except queue.Full:
+            pass
+
+
+class EventBroker:
+    """
+    Fans application events out to the subscribers of this process.
+
+    With the 'postgresql' backend, a listener thread receives the
+    notifications of the application_status trigger on a dedicated
+    connection and publishes them. It is started by the first subscriber
+    and stopped when the last one leaves, so processes without subscribers
+    hold no extra connection. If the connection fails, the listener
+    reconnects and publishes a resync event, since notifications sent in
+    between are lost. With the 'memory' backend, events are only published
+    by calling publish, e.g. in tests. 'auto' selects 'postgresql' if the
+    database is PostgreSQL.
+
+    :ivar backend: The selected backend, either 'memory' or 'postgresql'.
+    :ivar max_subscribers: The maximum number of concurrent subscribers.
+    :ivar queue_size: The maximum number of queued events per subscriber.
+    :ivar reconnect_interval: The time between reconnection attempts of
+          the listener in seconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new EventBroker object.
+        """
+
+        self.backend = 'memory'
+        self.max_subscribers = 0
+        self.queue_size = 100
+        self.reconnect_interval = 5.0
+        self._engine: Optional[Engine] = None
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._listening = False
+        self._published = self._closed_subscriptions = 0
+
+    def init_app(self, app: Flask, database: SQLAlchemy) -> None:
+        """
+        Configures the broker from the Flask application configuration.
+
+        Must be called after the database extension is initialized. A
+        running listener is stopped, and all subscriptions are closed.
+
+        :param app: The Flask application.
+        :param database: The database extension.
+        :raises ValueError: If the configured backend is unknown.
+        """
+
+        backend = app.config.get('APPLICATION_EVENTS_BROKER', 'auto')
+        if backend not in BROKER_BACKENDS:
+            raise ValueError(f'Unknown application events broker: {backend}')
+
+        self.stop()
+        with app.app_context():
+            engine = database.engine
+        if backend == 'auto':
+            backend = 'postgresql' \
+                if engine.dialect.name == 'postgresql' else 'memory'
+
+        with self._lock:
+            self.backend = backend
+            self.max_subscribers = app.config.get(
+                    'APPLICATION_EVENTS_MAX_SUBSCRIBERS', 0)
+            self.queue_size = app.config.get(
+                    'APPLICATION_EVENTS_QUEUE_SIZE', 100)
+            self.reconnect_interval = app.config.get(
+                    'APPLICATION_EVENTS_RECONNECT_INTERVAL', 5.0)
+            self._engine = engine
+            self._published = self._closed_subscriptions = 0
+
+        if self.max_subscribers < 1:
+            logging.warning('APPLICATION_EVENTS_MAX_SUBSCRIBERS is %d, so '
+                            'the events endpoint rejects every subscriber; '
+                            'run gevent workers to serve it',
+                            self.max_subscribers)
+
+    def subscribe(self) -> Optional[Subscription]:
+        """
+        Subscribes to the application events, starting the listener if
+        needed.
+
+        :returns: The subscription, or None if the maximum number of
+                  subscribers is reached.
+        """
+
+        with self._lock:
+            if len(self._subscriptions) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.queue_size)
+            self._subscriptions.add(subscription)
+
+            if self.backend == 'postgresql' and (
+                    self._listener is None or not self._listener.is_alive()):
+                self._stop_event = threading.Event()
+                self._listener = threading.Thread(
+                        target=self._listen, args=(self._stop_event,),
+                        name='application-events-listener', daemon=True)
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes a subscription, stopping the listener if it was the last.
+
+        :param subscription: The subscription.
+        """
+
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            if not self._subscriptions:
+                self._stop_listener()
+
+    def publish(self, event: dict) -> None:
+        """
+        Hands an event to every subscriber. Subscribers that fell behind are
+        closed and removed, and the listener is stopped if none are left.
+
+        :param event: The event, a dictionary with at least a type.
+        """
+
+        with self._lock:
+            self._published += 1
+            for subscription in list(self._subscriptions):
+                if not subscription.put(event):
+                    self._subscriptions.discard(subscription)
+                    self._closed_subscriptions += 1
+            if not self._subscriptions:
+                self._stop_listener()
+
+    def after_fork(self) -> None:
+        """
+        Resets the broker in a forked child process.
+
+        The listener thread of the parent does not exist in the child, so
+        the next subscriber of the child starts its own.
+        """
+
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._listener = None
+        self._stop_event = threading.Event()
+        self._listening = False
+
+    def stop(self) -> None:
+        """
+        Stops the listener and closes all subscriptions.
+        """
+
+        with self._lock:
+            listener = self._listener
+            self._stop_listener()
+            for subscription in self._subscriptions:
+                subscription.close()
+            self._subscriptions = set()
+        if listener is not None:
+            listener.join(timeout=5)
+
+    def stats(self) -> dict:
+        """
+        Returns the state and counters of the broker.
+
+        :returns: A dictionary with the broker statistics.
+        """
+
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'listening': self._listening,
+                'subscribers': len(self._subscriptions),
+                'max_subscribers': self.max_subscribers,
+                'published': self._published,
+                'closed_subscriptions': self._closed_subscriptions
+            }
+
+    def _stop_listener(self) -> None:
+        """
+        Signals the listener to stop. It closes its connection within a
+        second. Must be called with the lock held.
+        """
+
+        self._stop_event.set()
+        self._listener = None
+
+    def _listen(self, stop_event: threading.Event) -> None:
+        """
+        Publishes the notifications of the application events channel
+        until the broker is stopped.
+
+        :param stop_event: The event that stops the listener.
+        """
+
+        reconnect = False
+        while not stop_event.is_set():
+            connection = None
+            try:
+                if self._engine is None:
+                    return
+                # The connection is detached from the pool, so it neither
+                # counts against the pool size nor is ever reused.
+                connection = self._engine.raw_connection()
+                driver_connection: Any = connection.driver_connection
+                connection.detach()
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {APPLICATION_EVENTS_CHANNEL}')
+                self._listening = True
+                if reconnect:
+                    self.publish({'type': 'resync'})
+                reconnect = True
+
+                while not stop_event.is_set():
+                    if select.select([driver_connection], [], [], 1.0) == \
+                            ([], [], []):
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies and \
+                            not stop_event.is_set():
+                        notification = driver_connection.notifies.pop(0)
+                        self.publish(json.loads(notification.payload))
+            except Exception as exception:
+                logging.warning('Application events listener failed: %s',
+                                exception)
+                logging.debug(str(exception), exc_info=True)
+                stop_event.wait(self.reconnect_interval)
+            finally:
+                self._listening = False
+                if connection is not None:
+                    connection.close()
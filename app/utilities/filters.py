@@ -0,0 +1,106 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Mapping, Optional
+
+FILTER_PARAMETERS = ('status', 'competence_id', 'min_years', 'available_from',
+                     'available_to')
+
+
+class ApplicationFilters:
+    """
+    The filters a recruiter can narrow the applications down with.
+
+    Unset filters are None and do not restrict the applications.
+
+    :ivar statuses: The application statuses to include.
+    :ivar competence_id: The competence the applicant must have.
+    :ivar min_years: The minimum years of experience the applicant must have
+          in the competence, or in any competence if none is given.
+    :ivar available_from: The first day the applicant must be available.
+    :ivar available_to: The last day the applicant must be available.
+    """
+
+    __slots__ = ('statuses', 'competence_id', 'min_years', 'available_from',
+                 'available_to')
+
+    def __init__(self, statuses: Optional[list[str]] = None,
+                 competence_id: Optional[int] = None,
+                 min_years: Optional[Decimal] = None,
+                 available_from: Optional[date] = None,
+                 available_to: Optional[date] = None) -> None:
+        """
+        Initializes a new ApplicationFilters object.
+
+        :param statuses: The application statuses to include.
+        :param competence_id: The competence the applicant must have.
+        :param min_years: The minimum years of experience.
+        :param available_from: The first day the applicant must be available.
+        :param available_to: The last day the applicant must be available.
+        """
+
+        self.statuses = statuses
+        self.competence_id = competence_id
+        self.min_years = min_years
+        self.available_from = available_from
+        self.available_to = available_to
+
+    def __bool__(self) -> bool:
+        """
+        Checks whether any filter is set.
+
+        :returns: True if at least one filter is set.
+        """
+
+        return any(getattr(self, name) is not None for name in
+                   self.__slots__)
+
+
+def parse_filters(args: Mapping[str, str]) -> ApplicationFilters:
+    """
+    Parses the filter query parameters of an applications request.
+
+    The status parameter accepts a comma-separated list of statuses. Dates
+    use the ISO format YYYY-MM-DD. If only one of available_from and
+    available_to is given, the applicant must be available on that day.
+
+    :param args: The query parameters of the request.
+    :returns: The parsed filters.
+    :raises ValueError: If a filter parameter is malformed.
+    """
+
+    filters = ApplicationFilters()
+
+    try:
+        if args.get('status'):
+            filters.statuses = [status.strip() for status in
+                                args['status'].split(',') if status.strip()]
+        if args.get('competence_id'):
+            filters.competence_id = int(args['competence_id'])
+        if args.get('min_years'):
+            filters.min_years = Decimal(args['min_years'])
+        if args.get('available_from'):
+            filters.available_from = date.fromisoformat(
+                    args['available_from'])
+        if args.get('available_to'):
+            filters.available_to = date.fromisoformat(args['available_to'])
+    except (ValueError, InvalidOperation) as exception:
+        raise ValueError('INVALID_FILTER') from exception
+
+    if filters.statuses is not None and not filters.statuses:
+        raise ValueError('INVALID_FILTER')
+    if filters.competence_id is not None and filters.competence_id < 1:
+        raise ValueError('INVALID_FILTER')
+    if filters.min_years is not None and \
+            not (filters.min_years.is_finite() and filters.min_years >= 0):
+        raise ValueError('INVALID_FILTER')
+
+    if filters.available_from is None:
+        filters.available_from = filters.available_to
+    if filters.available_to is None:
+        filters.available_to = filters.available_from
+    if filters.available_from is not None and \
+            filters.available_to is not None and \
+            filters.available_from > filters.available_to:
+        raise ValueError('INVALID_FILTER')
+
+    return filters
@@ -0,0 +1,136 @@
+from bisect import bisect_right
+from math import isqrt
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar('T')
+
+MIN_BLOCK_SIZE = 32
+
+
+class IntervalTree(Generic[T]):
+    """
+    A static, augmented interval tree over closed integer intervals.
+
+    The intervals are sorted by start, so the intervals starting early
+    enough for a query are a prefix found by binary search. The sorted array
+    is cut into blocks of about sqrt(n) intervals, which form an implicit
+    balanced binary tree: the root of a range of blocks is its middle block.
+    Every node stores the largest end in its subtree, so runs of blocks
+    without an interval ending late enough are skipped. Within a block the
+    intervals are also kept ordered by descending end, so the matches of a
+    block inside the prefix are a slice found by binary search. A query takes
+    O(sqrt(n) + k) time for k matches. The tree is immutable; rebuild it when
+    the intervals change.
+
+    :ivar size: The number of intervals in the tree.
+    """
+
+    __slots__ = ('size', '_block_size', '_starts', '_ends', '_values',
+                 '_max_ends', '_negated_ends', '_values_by_end')
+
+    def __init__(self, intervals: Iterable[tuple[int, int, T]]) -> None:
+        """
+        Builds an interval tree.
+
+        :param intervals: (start, end, value) tuples of closed intervals.
+        """
+
+        ordered = sorted(intervals, key=lambda interval: interval[0])
+        self.size = len(ordered)
+        self._block_size = max(MIN_BLOCK_SIZE, isqrt(self.size))
+        self._starts = [interval[0] for interval in ordered]
+        self._ends = [interval[1] for interval in ordered]
+        self._values = [interval[2] for interval in ordered]
+        self._max_ends: list[int] = []
+        self._negated_ends: list[list[int]] = []
+        self._values_by_end: list[list[T]] = []
+
+        for first in range(0, self.size, self._block_size):
+            block = sorted(ordered[first:first + self._block_size],
+                           key=lambda interval: -interval[1])
+            self._max_ends.append(block[0][1])
+            self._negated_ends.append([-interval[1] for interval in block])
+            self._values_by_end.append([interval[2] for interval in block])
+
+        if self._max_ends:
+            self._augment(0, len(self._max_ends) - 1)
+
+    def _augment(self, low: int, high: int) -> int:
+        """
+        Computes the largest end of every subtree in a range of blocks.
+
+        :param low: The first block of the range.
+        :param high: The last block of the range.
+        :returns: The largest end in the range.
+        """
+
+        middle = (low + high) // 2
+        max_end = self._max_ends[middle]
+        if low < middle:
+            max_end = max(max_end, self._augment(low, middle - 1))
+        if middle < high:
+            max_end = max(max_end, self._augment(middle + 1, high))
+        self._max_ends[middle] = max_end
+        return max_end
+
+    def search(self, start_at_most: int, end_at_least: int) -> list[T]:
+        """
+        Finds the intervals starting at or before one point and ending at or
+        after another.
+
+        :param start_at_most: The largest start of a matching interval.
+        :param end_at_least: The smallest end of a matching interval.
+        :returns: The values of the matching intervals, in no particular
+                  order.
+        """
+
+        block_size, max_ends = self._block_size, self._max_ends
+        limit = bisect_right(self._starts, start_at_most)
+        matches: list[T] = []
+        stack = [(0, len(max_ends) - 1)] if limit else []
+
+        while stack:
+            low, high = stack.pop()
+            middle = (low + high) // 2
+            if max_ends[middle] < end_at_least:
+                continue
+
+            first = middle * block_size
+            if first + block_size <= limit:
+                count = bisect_right(self._negated_ends[middle],
+                                     -end_at_least)
+                matches.extend(self._values_by_end[middle][:count])
+            elif first < limit:
+                ends, values = self._ends, self._values
+                matches.extend([values[index] for index in
+                                range(first, limit)
+                                if ends[index] >= end_at_least])
+
+            if first < limit and middle < high:
+                stack.append((middle + 1, high))
+            if low < middle:
+                stack.append((low, middle - 1))
+
+        return matches
+
+    def overlapping(self, start: int, end: int) -> list[T]:
+        """
+        Finds the intervals that share at least one point with [start, end].
+
+        :param start: The start of the query interval.
+        :param end: The end of the query interval.
+        :returns: The values of the overlapping intervals.
+        """
+
+        return self.search(end, start)
+
+    def covering(self, start: int, end: int) -> list[T]:
+        """
+        Finds the intervals that contain all of [start, end].
+
+        :param start: The start of the query interval.
+        :param end: The end of the query interval.
+        :returns: The values of the covering intervals.
+        """
+
+        return self.search(start, end)
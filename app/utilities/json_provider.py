@@ -0,0 +1,182 @@
+import codecs
+import re
+import time
+from decimal import Decimal
+from typing import Any, Optional, cast
+
+from flask import Flask, Response as FlaskResponse
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.sansio.response import Response
+
+from app.extensions import request_metrics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+COMPACT_SEPARATORS = (',', ':')
+
+# Python's json module switches floats to exponent notation outside of
+# [1e-4, 1e16), where orjson writes positional digits or omits the sign of
+# the exponent. orjson never hands floats to the default function, so
+# documents are checked for such numbers after encoding them and encoded
+# again with the json module if they have one. In an exponent the e sits
+# between digits, or a digit and a minus sign, so text like "Anne-Marie"
+# or "berge2@example.com" does not match. The lookbehind follows the e,
+# which lets the search skip to each e instead of testing every byte.
+EXPONENT = re.compile(rb'e(?<=[0-9]e)[-0-9]')
+SMALL_FLOAT = b'0.0000'
+
+
+def escape_non_ascii(error: UnicodeError) -> tuple[str, int]:
+    """
+    Escapes characters like the json module does with ensure_ascii.
+
+    Registered as the 'json_ascii' codec error handler, so non-ASCII
+    characters are escaped while encoding a document to ASCII.
+
+    :param error: The error raised for a run of non-ASCII characters.
+    :returns: The escape sequences, using surrogate pairs outside the BMP,
+              and the position to continue encoding at.
+    :raises UnicodeError: If the error is not an encoding error.
+    """
+
+    if not isinstance(error, UnicodeEncodeError):
+        raise error
+
+    escaped = []
+    for character in error.object[error.start:error.end]:
+        code_point = ord(character)
+        if code_point < 0x10000:
+            escaped.append(f'\\u{code_point:04x}')
+        else:
+            code_point -= 0x10000
+            escaped.append(f'\\u{0xd800 | (code_point >> 10):04x}'
+                           f'\\u{0xdc00 | (code_point & 0x3ff):04x}')
+    return ''.join(escaped), error.end
+
+
+codecs.register_error('json_ascii', escape_non_ascii)
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """
+    The default Flask JSON provider, serializing with orjson when possible
+    and recording the time spent serializing responses in the request
+    metrics.
+
+    Compact documents are encoded with orjson if it is installed and the
+    JSON_SERIALIZER setting is not 'stdlib'. Values orjson does not support
+    natively, such as Decimals and dates, are converted by the default
+    function of the provider, and non-ASCII characters are escaped, so the
+    output is the same as that of the json module. Documents orjson cannot
+    encode identically, e.g. with integers beyond 64 bits, non-string keys
+    or floats in exponent notation, fall back to the json module. The one
+    exception are non-finite floats, which orjson encodes as null instead of
+    NaN or Infinity, which are not valid JSON.
+
+    :ivar fast: Whether compact documents are encoded with orjson.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        """
+        Initializes a new InstrumentedJSONProvider object.
+
+        :param app: The Flask application, with its configuration loaded.
+        """
+
+        super().__init__(app)
+        serializer = app.config.get('JSON_SERIALIZER', 'auto')
+        self.fast = orjson is not None and serializer != 'stdlib'
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        Serializes data as JSON.
+
+        Takes the same arguments as DefaultJSONProvider.dumps.
+
+        :param obj: The data to serialize.
+        :returns: The JSON document.
+        """
+
+        if kwargs.get('separators') == COMPACT_SEPARATORS and \
+                kwargs.keys() == {'separators'}:
+            encoded = self.dumps_compact(obj)
+            if encoded is not None:
+                return encoded.decode()
+        return super().dumps(obj, **kwargs)
+
+    def dumps_compact(self, obj: Any) -> Optional[bytes]:
+        """
+        Serializes data as compact JSON with orjson.
+
+        :param obj: The data to serialize.
+        :returns: The UTF-8 encoded JSON document, or None if it has to be
+                  serialized with the json module.
+        """
+
+        if not self.fast:
+            return None
+
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | \
+            orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            encoded = orjson.dumps(obj, default=self.default_fast,
+                                   option=option)
+        except orjson.JSONEncodeError:
+            return None
+
+        if SMALL_FLOAT in encoded or EXPONENT.search(encoded):
+            return None
+        if self.ensure_ascii:
+            if not encoded.isascii():
+                encoded = encoded.decode().encode('ascii', 'json_ascii')
+            if b'\x7f' in encoded:
+                encoded = encoded.replace(b'\x7f', b'\\u007f')
+        return encoded
+
+    def default_fast(self, obj: Any) -> Any:
+        """
+        Converts a value orjson cannot serialize natively.
+
+        Decimals, such as years of experience, are converted directly and
+        everything else by the default function of the provider.
+
+        :param obj: The value to convert.
+        :returns: A value orjson can serialize.
+        """
+
+        if type(obj) is Decimal:
+            return str(obj)
+        return self.default(obj)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """
+        Serializes data into a JSON response and records the time it took.
+
+        Takes the same arguments as DefaultJSONProvider.response. Compact
+        responses are built from the encoded bytes directly.
+
+        :returns: The JSON response.
+        """
+
+        start = time.perf_counter()
+        encoded = None
+        if self.compact is not False and \
+                (self.compact or not self._app.debug):
+            encoded = self.dumps_compact(
+                    self._prepare_response_obj(args, kwargs))
+
+        if encoded is None:
+            response = super().response(*args, **kwargs)
+        else:
+            response_class = cast(type[FlaskResponse],
+                                  self._app.response_class)
+            response = response_class(encoded + b'\n',
+                                      mimetype=self.mimetype)
+        request_metrics.record_serialization(time.perf_counter() - start)
+        return response
@@ -0,0 +1,324 @@
+import atexit
+import copy
+import logging
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from flask import Flask
+
+OVERFLOW_POLICIES = ('drop', 'block')
+
+
+class SamplingFilter(logging.Filter):
+    """
+    A filter that passes only a fraction of the INFO records.
+
+    Records of all other levels always pass, so warnings and errors are
+    never sampled out. The filter counts the records it rejected.
+
+    :ivar rate: The fraction of INFO records that pass, between 0 and 1.
+    """
+
+    def __init__(self, rate: float = 1.0) -> None:
+        """
+        Initializes a new SamplingFilter object.
+
+        :param rate: The fraction of INFO records that pass.
+        """
+
+        super().__init__()
+        self.rate = rate
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decides whether a record is passed on.
+
+        :param record: The log record.
+        :returns: Whether the record passes.
+        """
+
+        if record.levelno != logging.INFO or self.rate >= 1 or \
+                random.random() < self.rate:
+            return True
+        with self._lock:
+            self.sampled_out += 1
+        return False
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    A QueueHandler that never lets a full queue stall the logging thread.
+
+    Records are handed to a bounded queue that a QueueListener drains on a
+    background thread. With the 'drop' overflow policy a record that does
+    not fit is discarded and counted, and the number of discarded records
+    is reported with the next record that fits. With the 'block' policy
+    the logging thread waits for room, as with a synchronous handler.
+
+    :ivar overflow: The overflow policy, either 'drop' or 'block'.
+    """
+
+    def __init__(self, log_queue: queue.Queue,
+                 overflow: str = 'drop') -> None:
+        """
+        Initializes a new BoundedQueueHandler object.
+
+        :param log_queue: The bounded queue.
+        :param overflow: The overflow policy, either 'drop' or 'block'.
+        :raises ValueError: If the overflow policy is unknown.
+        """
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Unknown log queue overflow policy: '
+                             f'{overflow}')
+
+        super().__init__(log_queue)
+        self.bounded_queue = log_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self._unreported = 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Prepares a record for the queue.
+
+        Only the message and the traceback are rendered on the logging
+        thread, because the arguments may change after the call returns.
+        Timestamps and the log format are applied by the listener. The
+        record is copied so other handlers still see the original.
+
+        :param record: The log record.
+        :returns: The record to enqueue.
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(
+                        record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Enqueues a prepared record according to the overflow policy.
+
+        :param record: The prepared log record.
+        """
+
+        if self.overflow == 'block':
+            self.bounded_queue.put(record)
+            return
+
+        if self._unreported:
+            try:
+                self.bounded_queue.put_nowait(self._dropped_record(record))
+                self._unreported = 0
+            except queue.Full:
+                pass
+
+        try:
+            self.bounded_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+    def _dropped_record(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Creates the warning that reports discarded records.
+
+        :param record: The record that is enqueued after the warning.
+        :returns: The warning record.
+        """
+
+        return logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': logging.getLevelName(logging.WARNING),
+            'msg': f'Log queue full, dropped {self._unreported} records',
+            'created': record.created,
+            'msecs': record.msecs
+        })
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    A QueueListener that can be stopped while its queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 respect_handler_level: bool = False) -> None:
+        """
+        Initializes a new DrainingQueueListener object.
+
+        :param log_queue: The bounded queue.
+        :param handlers: The handlers that write the records.
+        :param respect_handler_level: Whether the levels of the handlers
+               are checked.
+        """
+
+        super().__init__(log_queue, *handlers,
+                         respect_handler_level=respect_handler_level)
+        self.bounded_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        """
+        Enqueues the sentinel, waiting for the listener to make room.
+        """
+
+        self.bounded_queue.put(None)
+
+
+class LogQueue:
+    """
+    Moves log output off the threads that log.
+
+    The root logger gets a BoundedQueueHandler, and a QueueListener thread
+    writes the queued records to the actual output handler, so request
+    threads never wait on disk or stdout. INFO records can be sampled to
+    shed high-volume lines. Initializing the pipeline again replaces the
+    previous one, and the listener is stopped and flushed at exit.
+
+    :ivar enabled: Whether records are queued instead of written directly.
+    :ivar capacity: The maximum number of queued records.
+    :ivar overflow: The overflow policy, either 'drop' or 'block'.
+    :ivar sample_rate: The fraction of INFO records that are logged.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new LogQueue object.
+        """
+
+        self.enabled = True
+        self.capacity = 10000
+        self.overflow = 'drop'
+        self.sample_rate = 1.0
+        self._queue: Optional[queue.Queue] = None
+        self._handler: Optional[logging.Handler] = None
+        self._output_handler: Optional[logging.Handler] = None
+        self._sampling_filter: Optional[SamplingFilter] = None
+        self._listener: Optional[QueueListener] = None
+        self._lock = threading.Lock()
+        self._stop_registered = False
+
+    def init_app(self, app: Flask, output_handler: logging.Handler) -> None:
+        """
+        Routes the records of the root logger to an output handler.
+
+        The output handler keeps its level and formatter. If queueing is
+        disabled, it is attached to the root logger directly.
+
+        :param app: The Flask application.
+        :param output_handler: The handler that writes the log output.
+        :raises ValueError: If the configured overflow policy is unknown.
+        """
+
+        with self._lock:
+            self._stop()
+            self.enabled = app.config.get('LOG_QUEUE_ENABLED', True)
+            self.capacity = app.config.get('LOG_QUEUE_SIZE', 10000)
+            self.overflow = app.config.get('LOG_QUEUE_OVERFLOW', 'drop')
+            self.sample_rate = app.config.get('LOG_INFO_SAMPLE_RATE', 1.0)
+
+            self._sampling_filter = SamplingFilter(self.sample_rate)
+            self._output_handler = output_handler
+            if not self.enabled:
+                output_handler.addFilter(self._sampling_filter)
+                self._handler = output_handler
+                logging.getLogger().addHandler(output_handler)
+                return
+
+            self._start_listener(output_handler, self._sampling_filter)
+            if not self._stop_registered:
+                atexit.register(self.stop)
+                self._stop_registered = True
+
+    def after_fork(self) -> None:
+        """
+        Restarts the pipeline in a forked child process.
+
+        The listener thread of the parent does not exist in the child, and
+        its queue may have been locked during the fork, so the child gets a
+        new queue and listener. Records still queued in the parent are
+        written by the parent.
+        """
+
+        self._lock = threading.Lock()
+        with self._lock:
+            if not self.enabled or self._output_handler is None or \
+                    self._sampling_filter is None:
+                return
+            if self._handler is not None:
+                logging.getLogger().removeHandler(self._handler)
+            self._start_listener(self._output_handler, self._sampling_filter)
+
+    def stop(self) -> None:
+        """
+        Detaches the pipeline from the root logger and writes the queued
+        records.
+        """
+
+        with self._lock:
+            self._stop()
+
+    def stats(self) -> dict:
+        """
+        Returns the configuration and counters of the pipeline.
+
+        :returns: A dictionary with the log queue statistics.
+        """
+
+        handler = self._handler
+        return {
+            'enabled': self.enabled,
+            'capacity': self.capacity,
+            'overflow': self.overflow,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'dropped': handler.dropped
+            if isinstance(handler, BoundedQueueHandler) else 0,
+            'sample_rate': self.sample_rate,
+            'sampled_out': self._sampling_filter.sampled_out
+            if self._sampling_filter else 0
+        }
+
+    def _start_listener(self, output_handler: logging.Handler,
+                        sampling_filter: SamplingFilter) -> None:
+        """
+        Starts a queue and listener writing to an output handler. Must be
+        called with the lock held.
+
+        :param output_handler: The handler that writes the log output.
+        :param sampling_filter: The filter sampling the INFO records.
+        """
+
+        self._queue = queue.Queue(maxsize=self.capacity)
+        handler = BoundedQueueHandler(self._queue, self.overflow)
+        handler.addFilter(sampling_filter)
+        self._listener = DrainingQueueListener(
+                self._queue, output_handler, respect_handler_level=True)
+        self._listener.start()
+        self._handler = handler
+        logging.getLogger().addHandler(handler)
+
+    def _stop(self) -> None:
+        """
+        Stops the pipeline. Must be called with the lock held.
+        """
+
+        if self._handler is not None:
+            logging.getLogger().removeHandler(self._handler)
+        if self._listener is not None:
+            self._listener.stop()
+        if self._output_handler is not None:
+            self._output_handler.close()
+        self._queue = self._handler = None
+        self._output_handler = self._listener = None
@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from typing import Optional
+
+
+def encode_cursor(application_status_id: int) -> str:
+    """
+    Encodes a keyset position into an opaque cursor token.
+
+    :param application_status_id: The id of the last application status on
+           the current page.
+    :returns: A URL-safe cursor token.
+    """
+
+    payload = json.dumps({'after': application_status_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decodes a cursor token into the keyset position it represents.
+
+    :param cursor: The cursor token, or None for the first page.
+    :returns: The id of the application status to continue after, or None
+              if no cursor was given.
+    :raises ValueError: If the cursor is malformed.
+    """
+
+    if not cursor:
+        return None
+
+    try:
+        padded_cursor = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded_cursor))
+        application_status_id = payload['after']
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError,
+            KeyError) as exception:
+        raise ValueError('INVALID_CURSOR') from exception
+
+    if not isinstance(application_status_id, int) or \
+            isinstance(application_status_id, bool):
+        raise ValueError('INVALID_CURSOR')
+    return application_status_id
+
+
+def encode_change_token(position: int, change_id: int,
+                        issued_at: float) -> str:
+    """
+    Encodes a position in the change log into an opaque changes token.
+
+    :param position: The position of the last served change, or the first
+           position that was not served yet if change_id is 0.
+    :param change_id: The id of the last served change, or 0.
+    :param issued_at: The UNIX time the changes since the token were first
+           requested at.
+    :returns: A URL-safe changes token.
+    """
+
+    payload = json.dumps({'position': position, 'change_id': change_id,
+                          'issued_at': int(issued_at)}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_change_token(token: str) -> tuple[int, int, int]:
+    """
+    Decodes a changes token into the position it represents.
+
+    :param token: The changes token.
+    :returns: A tuple containing the position, the change id and the UNIX
+              time the token was first issued at.
+    :raises ValueError: If the token is malformed.
+    """
+
+    try:
+        padded_token = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded_token))
+        values = (payload['position'], payload['change_id'],
+                  payload['issued_at'])
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError,
+            KeyError) as exception:
+        raise ValueError('INVALID_CHANGES_TOKEN') from exception
+
+    if not all(isinstance(value, int) and not isinstance(value, bool) and
+               value >= 0 for value in values):
+        raise ValueError('INVALID_CHANGES_TOKEN')
+    return values
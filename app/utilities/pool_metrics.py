@@ -0,0 +1,190 @@
+import threading
+import time
+from typing import Union
+
+from sqlalchemy import URL, make_url
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
+
+WAIT_TIME_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+# Engine options only a QueuePool accepts.
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout',
+                      'pool_use_lifo')
+
+
+class PoolStatistics:
+    """
+    Thread-safe counters of the connection checkouts of a pool.
+
+    :ivar checkouts: The number of successful checkouts.
+    :ivar overflow_checkouts: The number of checkouts that were served by an
+          overflow connection beyond the pool size.
+    :ivar timeouts: The number of checkouts that timed out.
+    :ivar total_wait: The total time spent waiting for checkouts in seconds.
+    :ivar max_wait: The longest time spent waiting for a checkout in seconds.
+    :ivar peak_in_use: The highest number of connections in use at once.
+    :ivar wait_buckets: The number of checkouts per upper wait time bound in
+          milliseconds, with slower checkouts counted under 'inf'.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new PoolStatistics object.
+        """
+
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_in_use = 0
+        self.wait_buckets = dict.fromkeys(
+                [str(bound) for bound in WAIT_TIME_BUCKETS_MS] + ['inf'], 0)
+
+    def record_checkout(self, wait: float, in_use: int,
+                        overflow: bool) -> None:
+        """
+        Records a successful checkout.
+
+        :param wait: The time spent waiting for the connection in seconds.
+        :param in_use: The number of connections in use after the checkout.
+        :param overflow: Whether the pool was using overflow connections.
+        """
+
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_checkouts += overflow
+            self.peak_in_use = max(self.peak_in_use, in_use)
+            self._record_wait(wait)
+
+    def record_timeout(self, wait: float) -> None:
+        """
+        Records a checkout that timed out.
+
+        :param wait: The time spent waiting before the timeout in seconds.
+        """
+
+        with self._lock:
+            self.timeouts += 1
+            self._record_wait(wait)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a dictionary.
+
+        :returns: A dictionary with the counters, wait times in milliseconds.
+        """
+
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'average_wait_ms': round(
+                        self.total_wait / attempts * 1000, 3)
+                if attempts else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'peak_in_use': self.peak_in_use,
+                'wait_ms_buckets': dict(self.wait_buckets)
+            }
+
+    def _record_wait(self, wait: float) -> None:
+        """
+        Records a wait time. The caller must hold the lock.
+
+        :param wait: The time spent waiting in seconds.
+        """
+
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        wait_ms = wait * 1000
+        bucket = next((str(bound) for bound in WAIT_TIME_BUCKETS_MS
+                       if wait_ms <= bound), 'inf')
+        self.wait_buckets[bucket] += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A QueuePool that records how long connection checkouts wait.
+
+    Each pool keeps its own PoolStatistics, including the checkouts that
+    needed an overflow connection and the checkouts that timed out.
+
+    :ivar statistics: The checkout statistics of the pool.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initializes a new InstrumentedQueuePool object.
+
+        Takes the same arguments as QueuePool.
+        """
+
+        super().__init__(*args, **kwargs)
+        self.statistics = PoolStatistics()
+
+    def connect(self) -> PoolProxiedConnection:
+        """
+        Checks out a connection and records the time it took.
+
+        :returns: The checked out connection.
+        :raises TimeoutError: If no connection became available in time.
+        """
+
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            self.statistics.record_timeout(time.perf_counter() - start)
+            raise
+
+        self.statistics.record_checkout(time.perf_counter() - start,
+                                        self.checkedout(),
+                                        self.overflow() > 0)
+        return connection
+
+    def metrics(self) -> dict:
+        """
+        Returns the configuration, current state and statistics of the pool.
+
+        :returns: A dictionary with the pool metrics.
+        """
+
+        return {
+            'size': self.size(),
+            'max_overflow': self._max_overflow,
+            'timeout': self.timeout(),
+            'in_use': self.checkedout(),
+            'idle': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            **self.statistics.as_dict()
+        }
+
+
+def instrument_engine_options(options: dict, url: Union[str, URL]) -> None:
+    """
+    Selects InstrumentedQueuePool in the engine options of a database.
+
+    Only databases the dialect pools in a QueuePool get the instrumented
+    pool. Others, like in-memory SQLite databases, keep the pool of their
+    dialect, which the QueuePool options are removed for. Options that
+    already select a pool class are left unchanged.
+
+    :param options: The engine options, which are changed in place.
+    :param url: The URL of the database.
+    """
+
+    if 'poolclass' in options:
+        return
+
+    url = make_url(url)
+    dialect = url.get_dialect()
+    if issubclass(dialect.get_pool_class(url),  # type: ignore
+                  QueuePool):
+        options['poolclass'] = InstrumentedQueuePool
+    else:
+        for option in QUEUE_POOL_OPTIONS:
+            options.pop(option, None)
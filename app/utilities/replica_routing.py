@@ -0,0 +1,379 @@
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, Optional
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import CompoundSelect, Engine, Select, event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import InterfaceError, OperationalError, SQLAlchemyError
+from sqlalchemy.orm import scoped_session
+
+REPLICA_BIND_KEY = 'replica'
+REPLICA_READS = 'replica_reads'
+
+# The replay delay of a PostgreSQL standby, which is 0 while it has replayed
+# everything it received and on a primary. Other databases report no lag.
+POSTGRESQL_LAG_QUERY = text(
+        'SELECT CASE WHEN NOT pg_is_in_recovery() OR '
+        'pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) '
+        'END')
+
+
+class RoutingSession(Session):
+    """
+    A session that sends SELECT statements, including unions of them, to the
+    read replica while replica reads are enabled.
+
+    ReplicaRouter.reads runs a repository function in a session with
+    replica reads enabled. Flushes and all other statements always go to
+    the primary.
+    """
+
+    def execute(self, statement, params=None, *, bind_arguments=None,
+                **kwargs):
+        """
+        Executes a statement, passing unions of SELECT statements on to
+        get_bind.
+
+        SQLAlchemy does not hand unions of ORM columns to get_bind, which
+        would otherwise send them to the primary even during replica reads.
+
+        :param statement: The statement to execute.
+        :param params: The parameters of the statement, if any.
+        :param bind_arguments: Arguments for get_bind, if any.
+        :returns: The result of the statement.
+        """
+
+        if isinstance(statement, CompoundSelect):
+            bind_arguments = {'clause': statement, **(bind_arguments or {})}
+        return super().execute(statement, params,
+                               bind_arguments=bind_arguments, **kwargs)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        """
+        Selects the engine of a statement.
+
+        :param mapper: The mapper of the queried entity, if any.
+        :param clause: The statement, if any.
+        :param bind: An explicitly requested bind, if any.
+        :returns: The replica engine for routed reads, otherwise the engine
+                  Flask-SQLAlchemy selects.
+        """
+
+        if bind is None and self.info.get(REPLICA_READS) and \
+                not self._flushing and \
+                isinstance(clause, (Select, CompoundSelect)):
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper, clause, bind, **kwargs)
+
+
+class ReplicaRouter:
+    """
+    Routes repository reads to a read replica while it is healthy.
+
+    The replica is the 'replica' bind of SQLALCHEMY_BINDS. Reads go to the
+    primary instead while the replication lag exceeds the maximum lag, which
+    is measured at most once per check interval, and for a retry interval
+    after a connection to the replica failed. A read that fails because the
+    replica failed is repeated on the primary.
+
+    :ivar enabled: Whether a replica is configured.
+    :ivar max_lag: The maximum acceptable replication lag in seconds.
+    :ivar lag_check_interval: The time between lag checks in seconds.
+    :ivar retry_interval: The time the replica is avoided after a failure
+          in seconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new ReplicaRouter object.
+        """
+
+        self.enabled = False
+        self.max_lag = 5.0
+        self.lag_check_interval = 5.0
+        self.retry_interval = 30.0
+        self._database: Optional[SQLAlchemy] = None
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._failed_until = 0.0
+        self._lag: Optional[float] = None
+        self._lag_checked_at = float('-inf')
+        self._replica_reads = self._primary_reads = 0
+        self._fallbacks = self._failures = 0
+
+    def init_app(self, app: Flask, database: SQLAlchemy) -> None:
+        """
+        Configures the router from the Flask application configuration.
+
+        Must be called after the database extension is initialized. The
+        health state and counters are reset.
+
+        :param app: The Flask application.
+        :param database: The database extension, whose session must be a
+               RoutingSession.
+        """
+
+        with self._lock:
+            self._database = database
+            self.max_lag = app.config.get('DATABASE_REPLICA_MAX_LAG', 5.0)
+            self.lag_check_interval = app.config.get(
+                    'DATABASE_REPLICA_LAG_CHECK_INTERVAL', 5.0)
+            self.retry_interval = app.config.get(
+                    'DATABASE_REPLICA_RETRY_INTERVAL', 30.0)
+            self._failed_until = 0.0
+            self._lag = None
+            self._lag_checked_at = float('-inf')
+            self._replica_reads = self._primary_reads = 0
+            self._fallbacks = self._failures = 0
+
+            with app.app_context():
+                replica = database.engines.get(REPLICA_BIND_KEY)
+            self.enabled = replica is not None
+            if replica is not None and not event.contains(
+                    replica, 'handle_error', self.handle_error):
+                event.listen(replica, 'handle_error', self.handle_error)
+
+    def reads(self, function: Callable) -> Callable:
+        """
+        Decorator routing the reads of a repository function to the
+        replica.
+
+        While the replica is used, the function runs in a session of its
+        own, so a failing replica leaves the session of the caller, with
+        its pending changes and locks, untouched. If the replica fails
+        during the call, the session is discarded and the call is repeated
+        on the primary. Generator functions are repeated if the replica
+        fails before their first item; once an item was yielded, they read
+        from the replica for their whole iteration, and only while they are
+        advanced, so code running between their items uses the session of
+        the caller.
+
+        :param function: The repository function.
+        :returns: The decorated function.
+        """
+
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                if not self.use_replica():
+                    return (yield from function(*args, **kwargs))
+
+                failures = self._failures
+                session = self._replica_session()
+                generator = function(*args, **kwargs)
+                try:
+                    try:
+                        with self._routed_to(session):
+                            item = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    except SQLAlchemyError:
+                        if self._failures == failures:
+                            raise
+                    else:
+                        while True:
+                            yield item
+                            try:
+                                with self._routed_to(session):
+                                    item = next(generator)
+                            except StopIteration as stop:
+                                return stop.value
+                finally:
+                    with self._routed_to(session):
+                        generator.close()
+                    session.close()
+
+                self._fall_back()
+                return (yield from function(*args, **kwargs))
+
+            return generator_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not self.use_replica():
+                return function(*args, **kwargs)
+
+            failures = self._failures
+            session = self._replica_session()
+            try:
+                with self._routed_to(session):
+                    return function(*args, **kwargs)
+            except SQLAlchemyError:
+                if self._failures == failures:
+                    raise
+            finally:
+                session.close()
+
+            self._fall_back()
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    def use_replica(self) -> bool:
+        """
+        Decides whether reads go to the replica, checking its lag if the
+        last check is older than the check interval.
+
+        Must be called in an application context.
+
+        :returns: Whether the replica is healthy and close enough to the
+                  primary.
+        """
+
+        if not self.enabled:
+            return False
+
+        now = time.monotonic()
+        if now >= self._failed_until and \
+                now - self._lag_checked_at >= self.lag_check_interval and \
+                self._check_lock.acquire(blocking=False):
+            try:
+                self._check_lag()
+            finally:
+                self._check_lock.release()
+
+        with self._lock:
+            replica = time.monotonic() >= self._failed_until and \
+                self._lag is not None and self._lag <= self.max_lag
+            if replica:
+                self._replica_reads += 1
+            else:
+                self._primary_reads += 1
+        return replica
+
+    def handle_error(self, context: ExceptionContext) -> None:
+        """
+        Marks the replica as failed if a connection to it failed.
+
+        Registered for the handle_error event of the replica engine.
+
+        :param context: The context of the database error.
+        """
+
+        if context.is_disconnect or isinstance(
+                context.sqlalchemy_exception,
+                (InterfaceError, OperationalError)):
+            self.mark_failed()
+
+    def mark_failed(self) -> None:
+        """
+        Steers reads to the primary for the retry interval.
+        """
+
+        with self._lock:
+            self._failures += 1
+            self._failed_until = time.monotonic() + self.retry_interval
+
+    def stats(self) -> dict:
+        """
+        Returns the state and counters of the router.
+
+        Replica reads and primary reads count the routing decisions of
+        decorated repository functions. Fallbacks are reads that were
+        repeated on the primary because the replica failed.
+
+        :returns: A dictionary with the router statistics.
+        """
+
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'healthy': self.enabled and
+                time.monotonic() >= self._failed_until,
+                'lag_seconds': self._lag,
+                'max_lag_seconds': self.max_lag,
+                'replica_reads': self._replica_reads,
+                'primary_reads': self._primary_reads,
+                'fallbacks': self._fallbacks,
+                'failures': self._failures
+            }
+
+    def _check_lag(self) -> None:
+        """
+        Measures the replication lag on a connection of its own.
+        """
+
+        if self._database is None:
+            return
+
+        replica: Engine = self._database.engines[REPLICA_BIND_KEY]
+        lag: Optional[float] = 0.0
+        try:
+            if replica.dialect.name == 'postgresql':
+                with replica.connect() as connection:
+                    lag = connection.execute(POSTGRESQL_LAG_QUERY).scalar()
+        except SQLAlchemyError as exception:
+            logging.debug(str(exception), exc_info=True)
+            self.mark_failed()
+            lag = None
+
+        if lag is not None:
+            lag = float(lag)
+            if lag > self.max_lag:
+                logging.warning('Read replica lags %.1f s behind, reading '
+                                'from the primary', lag)
+        with self._lock:
+            self._lag = lag
+            self._lag_checked_at = time.monotonic()
+
+    def _scoped_session(self) -> scoped_session:
+        """
+        Returns the scoped session of the database extension.
+
+        :returns: The scoped session.
+        :raises RuntimeError: If the router is not initialized.
+        """
+
+        if self._database is None:
+            raise RuntimeError('ReplicaRouter is not initialized')
+        return self._database.session
+
+    def _replica_session(self) -> Session:
+        """
+        Creates a session that sends its reads to the replica.
+
+        :returns: The session.
+        """
+
+        session = self._scoped_session().session_factory()
+        session.info[REPLICA_READS] = True
+        return session
+
+    @contextmanager
+    def _routed_to(self, session: Session) -> Iterator[None]:
+        """
+        Makes a session the session of the current application context.
+
+        Repository functions use the scoped session of the database
+        extension, so they run in the given session until the context
+        exits, after which the previous session is restored.
+
+        :param session: The session.
+        """
+
+        registry = self._scoped_session().registry
+        previous = registry()
+        registry.set(session)
+        try:
+            yield
+        finally:
+            registry.set(previous)
+
+    def _fall_back(self) -> None:
+        """
+        Counts a read that is repeated on the primary.
+        """
+
+        logging.warning('Read replica failed, reading from the primary')
+        with self._lock:
+            self._fallbacks += 1
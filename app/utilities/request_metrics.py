@@ -0,0 +1,241 @@
+import json
+import logging
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTimings:
+    """
+    The timings collected during one request.
+
+    :ivar start: The performance counter value at the start of the request.
+    :ivar query_count: The number of SQL statements executed.
+    :ivar database_time: The total time spent executing SQL in seconds.
+    :ivar slowest_query: The slowest SQL statement, without parameters.
+    :ivar slowest_query_time: The execution time of the slowest statement.
+    :ivar serialization_time: The time spent serializing JSON in seconds.
+    """
+
+    __slots__ = ('start', 'query_count', 'database_time', 'slowest_query',
+                 'slowest_query_time', 'serialization_time')
+
+    def __init__(self) -> None:
+        """
+        Initializes a new RequestTimings object starting now.
+        """
+
+        self.start = time.perf_counter()
+        self.query_count = 0
+        self.database_time = 0.0
+        self.slowest_query: Optional[str] = None
+        self.slowest_query_time = 0.0
+        self.serialization_time = 0.0
+
+
+class RequestMetrics:
+    """
+    Collects per-request SQL and timing instrumentation.
+
+    Every SQL statement is timed through SQLAlchemy cursor events, and every
+    request through Flask request hooks. After each request a structured log
+    line with the query count, database time, slowest statement,
+    serialization time and total time is written, and the totals are
+    aggregated per route. If enabled, the timings are also sent in a
+    Server-Timing header. Statements slower than the slow query threshold
+    are logged with their parameters redacted.
+
+    Streamed responses are measured until their headers are sent; queries
+    issued while streaming the body are only counted in the slow query log.
+
+    :ivar server_timing: Whether to send the Server-Timing header.
+    :ivar log_requests: Whether to write a log line per request.
+    :ivar slow_query_threshold: The execution time in seconds above which
+          statements are logged.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new RequestMetrics object.
+        """
+
+        self.server_timing = False
+        self.log_requests = True
+        self.slow_query_threshold = 0.5
+        self._lock = threading.Lock()
+        self._routes: dict[str, dict] = {}
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the instrumentation and registers its hooks.
+
+        :param app: The Flask application.
+        """
+
+        self.server_timing = app.config.get('SERVER_TIMING_ENABLED', False)
+        self.log_requests = app.config.get('REQUEST_METRICS_LOGGING', True)
+        self.slow_query_threshold = app.config.get(
+                'SLOW_QUERY_THRESHOLD_MS', 500) / 1000
+        with self._lock:
+            self._routes.clear()
+
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+
+        if not event.contains(Engine, 'before_cursor_execute',
+                              self.before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute',
+                         self.before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute',
+                         self.after_cursor_execute)
+
+    @staticmethod
+    def current() -> Optional[RequestTimings]:
+        """
+        Returns the timings of the current request.
+
+        :returns: The timings, or None outside of an instrumented request.
+        """
+
+        if not has_request_context():
+            return None
+        return g.get('request_timings')
+
+    def record_serialization(self, duration: float) -> None:
+        """
+        Adds JSON serialization time to the current request.
+
+        :param duration: The serialization time in seconds.
+        """
+
+        timings = self.current()
+        if timings is not None:
+            timings.serialization_time += duration
+
+    @staticmethod
+    def start_request() -> None:
+        """
+        Starts the timings of a request.
+        """
+
+        g.request_timings = RequestTimings()
+
+    def finish_request(self, response: Response) -> Response:
+        """
+        Completes the timings of a request and reports them.
+
+        :param response: The response of the request.
+        :returns: The response, with a Server-Timing header if enabled.
+        """
+
+        timings = self.current()
+        if timings is None:
+            return response
+
+        total_time = time.perf_counter() - timings.start
+        route = request.url_rule.rule if request.url_rule else request.path
+        self._aggregate(f'{request.method} {route}', timings, total_time)
+
+        if self.server_timing:
+            response.headers['Server-Timing'] = ', '.join((
+                f'db;dur={timings.database_time * 1000:.1f};'
+                f'desc="{timings.query_count} queries"',
+                f'serialize;dur={timings.serialization_time * 1000:.1f}',
+                f'total;dur={total_time * 1000:.1f}'))
+
+        if self.log_requests and \
+                logging.getLogger().isEnabledFor(logging.INFO):
+            metrics = {
+                'method': request.method,
+                'route': route,
+                'status': response.status_code,
+                'query_count': timings.query_count,
+                'db_ms': round(timings.database_time * 1000, 3),
+                'slowest_query_ms': round(
+                        timings.slowest_query_time * 1000, 3),
+                'serialization_ms': round(
+                        timings.serialization_time * 1000, 3),
+                'total_ms': round(total_time * 1000, 3)
+            }
+            logging.info('request_metrics %s', json.dumps(metrics))
+
+        return response
+
+    def route_stats(self) -> dict:
+        """
+        Returns the timings aggregated per route since startup.
+
+        :returns: A dictionary mapping 'METHOD route' to aggregated timings.
+        """
+
+        with self._lock:
+            return {route: dict(stats) for route, stats in
+                    self._routes.items()}
+
+    @staticmethod
+    def before_cursor_execute(connection, cursor, statement, parameters,
+                              context, executemany) -> None:
+        """
+        Records the start time of a SQL statement.
+        """
+
+        connection.info.setdefault('query_start_times', []).append(
+                time.perf_counter())
+
+    def after_cursor_execute(self, connection, cursor, statement, parameters,
+                             context, executemany) -> None:
+        """
+        Records the execution time of a SQL statement.
+
+        Statements slower than the slow query threshold are logged without
+        their parameters.
+        """
+
+        duration = time.perf_counter() - \
+            connection.info['query_start_times'].pop()
+
+        if duration >= self.slow_query_threshold:
+            parameter_count = len(parameters) if parameters else 0
+            logging.warning('Slow query (%.1f ms): %s [%d parameters '
+                            'redacted]', duration * 1000, statement,
+                            parameter_count)
+
+        timings = self.current()
+        if timings is None:
+            return
+
+        timings.query_count += 1
+        timings.database_time += duration
+        if duration > timings.slowest_query_time:
+            timings.slowest_query = statement
+            timings.slowest_query_time = duration
+
+    def _aggregate(self, route: str, timings: RequestTimings,
+                   total_time: float) -> None:
+        """
+        Adds the timings of a request to the aggregate of its route.
+
+        :param route: The method and route of the request.
+        :param timings: The timings of the request.
+        :param total_time: The total time of the request in seconds.
+        """
+
+        with self._lock:
+            stats = self._routes.setdefault(route, {
+                'requests': 0, 'queries': 0, 'db_ms': 0.0,
+                'serialization_ms': 0.0, 'total_ms': 0.0, 'max_total_ms': 0.0,
+                'slowest_query': None, 'slowest_query_ms': 0.0})
+            stats['requests'] += 1
+            stats['queries'] += timings.query_count
+            stats['db_ms'] += timings.database_time * 1000
+            stats['serialization_ms'] += timings.serialization_time * 1000
+            stats['total_ms'] += total_time * 1000
+            stats['max_total_ms'] = max(stats['max_total_ms'],
+                                        total_time * 1000)
+            if timings.slowest_query_time * 1000 > stats['slowest_query_ms']:
+                stats['slowest_query'] = timings.slowest_query
+                stats['slowest_query_ms'] = timings.slowest_query_time * 1000
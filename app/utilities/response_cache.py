@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from flask import Flask
+
+
+class CachedResponse:
+    """
+    Represents a pre-serialized response stored in the response cache.
+
+    :ivar body: The serialized response body.
+    :ivar status_code: The status code of the response.
+    :ivar expires_at: The monotonic time at which the entry expires.
+    """
+
+    __slots__ = ('body', 'status_code', 'expires_at')
+
+    def __init__(self, body: bytes, status_code: int,
+                 expires_at: float) -> None:
+        """
+        Initializes a new CachedResponse object.
+
+        :param body: The serialized response body.
+        :param status_code: The status code of the response.
+        :param expires_at: The monotonic time at which the entry expires.
+        """
+
+        self.body = body
+        self.status_code = status_code
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    A process-local cache of pre-serialized responses.
+
+    Entries expire after a configurable time to live, and the total size of
+    the cached bodies is bounded by evicting the least recently used entries.
+    The cache is thread safe and counts hits, misses and evictions.
+
+    :ivar enabled: Whether the cache stores and returns entries.
+    :ivar ttl: The time to live of an entry in seconds.
+    :ivar max_bytes: The maximum total size of the cached bodies.
+    """
+
+    def __init__(self, enabled: bool = True, ttl: float = 30,
+                 max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Initializes a new ResponseCache object.
+
+        :param enabled: Whether the cache stores and returns entries.
+        :param ttl: The time to live of an entry in seconds.
+        :param max_bytes: The maximum total size of the cached bodies.
+        """
+
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the cache from the Flask application configuration.
+
+        The cache is emptied and its counters are reset.
+
+        :param app: The Flask application.
+        """
+
+        with self._lock:
+            self.enabled = app.config.get('APPLICATIONS_CACHE_ENABLED', True)
+            self.ttl = app.config.get('APPLICATIONS_CACHE_TTL', 30)
+            self.max_bytes = app.config.get('APPLICATIONS_CACHE_MAX_BYTES',
+                                            64 * 1024 * 1024)
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._misses = 0
+            self._evictions = self._invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Retrieves a cached response.
+
+        :param key: The key of the response.
+        :returns: The cached response, or None if there is no fresh entry.
+        """
+
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def set(self, key: str, body: bytes, status_code: int) -> None:
+        """
+        Stores a response in the cache.
+
+        Least recently used entries are evicted until the new entry fits.
+        Bodies larger than the whole cache are not stored.
+
+        :param key: The key of the response.
+        :param body: The serialized response body.
+        :param status_code: The status code of the response.
+        """
+
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._size + len(body) > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+            self._entries[key] = CachedResponse(
+                    body, status_code, time.monotonic() + self.ttl)
+            self._size += len(body)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Removes one or all entries from the cache.
+
+        This should be called whenever the cached data changes.
+
+        :param key: The key of the entry to remove, or None to remove all.
+        """
+
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._size = 0
+            elif key in self._entries:
+                self._remove(key)
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the current state and counters of the cache.
+
+        :returns: A dictionary with the cache statistics.
+        """
+
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes an entry. The caller must hold the lock.
+
+        :param key: The key of the entry to remove.
+        """
+
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body)
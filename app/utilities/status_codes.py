@@ -4,13 +4,21 @@ class StatusCodes:
 
     :ivar OK: The request was successful.
     :ivar PARTIAL_CONTENT: The request was partially successful.
+    :ivar NOT_MODIFIED: The requested data has not changed.
+    :ivar BAD_REQUEST: The request parameters were invalid.
     :ivar UNAUTHORIZED: The request was unauthorized.
     :ivar NOT_FOUND: The resource was not found.
+    :ivar GONE: The resource is no longer available.
     :ivar INTERNAL_SERVER_ERROR: An internal server error occurred.
+    :ivar SERVICE_UNAVAILABLE: The server cannot handle the request now.
     """
 
     OK = 200
     PARTIAL_CONTENT = 206
+    NOT_MODIFIED = 304
+    BAD_REQUEST = 400
     UNAUTHORIZED = 401
     NOT_FOUND = 404
+    GONE = 410
     INTERNAL_SERVER_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
@@ -0,0 +1,162 @@
+"""
+Measures the applications endpoint on synthetic applicant pools.
+
+For each pool size, seeds the database and measures the repository, service
+and route layers: latency percentiles, SQL statements per call, peak Python
+heap allocation, peak process RSS and, for the routes, response bytes. The
+applications cache is disabled, so every route call compiles the list,
+except for the route served from the application summaries, which are
+refreshed by its untimed warmup call. The service layer can additionally
+be measured in the per-applicant compile modes.
+
+Usage: python -m benchmarks.applications_benchmark
+       [--database-url URL] [--sizes 1000 10000] [--repeat 5]
+       [--compile-modes bulk serial threaded] [--output report.json]
+
+Without --database-url a temporary SQLite database is used. A database
+given with --database-url must be empty, unless --reset is given to drop
+its data.
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.measurement import count_queries, measure_latency, \
+    measure_peak_allocation, peak_rss_mb, write_report
+
+
+def load_with_repository() -> None:
+    """
+    Loads all application data with the bulk repository functions.
+    """
+
+    from app.repositories.applications_repository import \
+        get_application_statuses_from_db, \
+        get_availabilities_for_persons_from_db, \
+        get_competences_for_persons_from_db, get_persons_from_db
+
+    person_ids = [entry.person_id for entry in
+                  get_application_statuses_from_db()]
+    get_persons_from_db(person_ids)
+    get_competences_for_persons_from_db(person_ids)
+    get_availabilities_for_persons_from_db(person_ids)
+
+
+def benchmark_layers(app, repeat: int,
+                     compile_modes: tuple = ('bulk',)) -> list[dict]:
+    """
+    Measures the repository, service and route layers of an application.
+
+    :param app: The Flask application connected to a seeded database.
+    :param repeat: The number of timed calls per layer.
+    :param compile_modes: The compile modes to measure the service layer in.
+           Modes other than 'bulk' are reported as service_<mode>.
+    :returns: A list with one measurement dictionary per layer.
+    """
+
+    from flask_jwt_extended import create_access_token
+
+    from app.extensions import database
+    from app.services.applications_service import compile_applications
+
+    with app.app_context():
+        token = create_access_token(identity=None,
+                                    additional_claims={'id': 0, 'role': 1})
+    test_client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    response_sizes = {}
+
+    def in_app_context(function, compile_mode='bulk'):
+        def call():
+            app.config['APPLICATIONS_COMPILE_MODE'] = compile_mode
+            with app.app_context():
+                function()
+                database.session.remove()
+            app.config['APPLICATIONS_COMPILE_MODE'] = 'bulk'
+        return call
+
+    def request(layer, query_string, read_model='live'):
+        def call():
+            app.config['APPLICATIONS_READ_MODEL'] = read_model
+            response = test_client.get('/api/applications/', headers=headers,
+                                       query_string=query_string)
+            response_sizes[layer] = len(response.get_data())
+        return call
+
+    layers = {
+        'repository': in_app_context(load_with_repository),
+        'service': in_app_context(compile_applications),
+    }
+    for compile_mode in compile_modes:
+        if compile_mode != 'bulk':
+            layers[f'service_{compile_mode}'] = in_app_context(
+                    compile_applications, compile_mode)
+    layers.update({
+        'route': request('route', {}),
+        'route_stream': request('route_stream', {'stream': 1}),
+        'route_first_page': request('route_first_page', {'limit': 50}),
+        'route_summary': request('route_summary', {}, 'summary')
+    })
+
+    results = []
+    for layer, function in layers.items():
+        result = {'layer': layer}
+        result.update(measure_latency(function, repeat))
+        result['queries'] = count_queries(function)
+        result['peak_allocation_mb'] = measure_peak_allocation(function)
+        result['peak_rss_mb'] = peak_rss_mb()
+        if layer in response_sizes:
+            result['response_bytes'] = response_sizes[layer]
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compile-modes', nargs='+', default=['bulk'],
+                        choices=['bulk', 'serial', 'threaded'])
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    database_url = arguments.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-of-32-bytes!')
+    os.environ['APPLICATIONS_CACHE_ENABLED'] = 'false'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    from benchmarks.data_generator import seed_database
+
+    app = create_app()
+    results = []
+
+    # A temporary database is ours to reset, and so is a given one once it
+    # holds the data of the previous size.
+    reset = arguments.reset or not arguments.database_url
+    for size in arguments.sizes:
+        row_counts = seed_database(app, size, reset=reset)
+        reset = True
+        for result in benchmark_layers(app, arguments.repeat,
+                                       tuple(arguments.compile_modes)):
+            result['persons'] = size
+            result['rows'] = row_counts
+            results.append(result)
+            print(f'{size:>7} persons  {result["layer"]:<17}'
+                  f'p50 {result["p50_ms"]:>10} ms  '
+                  f'p99 {result["p99_ms"]:>10} ms  '
+                  f'{result["queries"]:>4} queries  '
+                  f'{result["peak_allocation_mb"]:>8} MB peak')
+
+    write_report(arguments.output, 'applications',
+                 {'sizes': arguments.sizes, 'repeat': arguments.repeat,
+                  'compile_modes': arguments.compile_modes,
+                  'database': database_url.split(':', 1)[0]}, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Measures availability window queries on synthetic applicant pools.
+
+For each pool size, seeds the database and answers a fixed set of random
+overlap and cover windows with a naive scan over all availability periods,
+with the in-memory interval tree and, on PostgreSQL, with the daterange query
+both using the GiST index and with index scans disabled. Reports latency
+percentiles per batch of windows and the time to build the tree.
+
+Usage: python -m benchmarks.availability_benchmark
+       [--database-url URL] [--sizes 10000 100000] [--windows 100]
+       [--repeat 5] [--output report.json]
+
+Without --database-url a temporary SQLite database is used. A database
+given with --database-url must be empty, unless --reset is given to drop
+its data.
+"""
+import argparse
+import datetime as dt
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.measurement import measure_latency, write_report
+
+
+def generate_windows(count: int, seed: int = 0) -> list[tuple]:
+    """
+    Generates random availability windows.
+
+    :param count: The number of windows.
+    :param seed: The seed of the random number generator.
+    :returns: A list of (from_date, to_date, cover) tuples.
+    """
+
+    rng = random.Random(seed)
+    windows = []
+    for index in range(count):
+        from_date = dt.date(2024, 1, 1) + dt.timedelta(days=rng.randrange(300))
+        to_date = from_date + dt.timedelta(days=rng.randrange(14))
+        windows.append((from_date, to_date, index % 2 == 1))
+    return windows
+
+
+def naive_scan(periods: list[tuple], from_date: dt.date, to_date: dt.date,
+               cover: bool) -> list[int]:
+    """
+    Finds the available persons by checking every availability period.
+
+    :param periods: (person_id, from_date, to_date) tuples.
+    :param from_date: The first day of the window.
+    :param to_date: The last day of the window.
+    :param cover: Whether a period must contain the whole window.
+    :returns: The sorted ids of the matching persons.
+    """
+
+    if cover:
+        return sorted({person_id for person_id, start, end in periods
+                       if start <= from_date and end >= to_date})
+    return sorted({person_id for person_id, start, end in periods
+                   if start <= to_date and end >= from_date})
+
+
+def benchmark_methods(app, windows: list[tuple], repeat: int) -> list[dict]:
+    """
+    Measures every method of answering the windows.
+
+    :param app: The Flask application connected to a seeded database.
+    :param windows: The windows to answer in each timed call.
+    :param repeat: The number of timed calls per method.
+    :returns: A list with one measurement dictionary per method.
+    """
+
+    from sqlalchemy import text
+
+    from app.extensions import database
+    from app.repositories.availability_repository import \
+        get_available_person_ids_from_db, get_availability_periods_from_db
+    from app.services.availability_service import get_availability_tree
+
+    with app.app_context():
+        periods = get_availability_periods_from_db()
+        start = time.perf_counter()
+        tree = get_availability_tree()
+        build_ms = round((time.perf_counter() - start) * 1000, 3)
+        dialect = database.engine.dialect.name
+
+    def scan():
+        for from_date, to_date, cover in windows:
+            naive_scan(periods, from_date, to_date, cover)
+
+    def search_tree():
+        for from_date, to_date, cover in windows:
+            start, end = from_date.toordinal(), to_date.toordinal()
+            matches = tree.covering(start, end) if cover else \
+                tree.overlapping(start, end)
+            sorted(set(matches))
+
+    def query_database(index_scans):
+        def call():
+            with app.app_context():
+                if not index_scans:
+                    database.session.execute(text(
+                            'SET LOCAL enable_indexscan = off'))
+                    database.session.execute(text(
+                            'SET LOCAL enable_bitmapscan = off'))
+                for from_date, to_date, cover in windows:
+                    get_available_person_ids_from_db(from_date, to_date,
+                                                     cover)
+                database.session.rollback()
+        return call
+
+    methods = {'naive_scan': scan, 'interval_tree': search_tree}
+    if dialect == 'postgresql':
+        methods['database_gist'] = query_database(True)
+        methods['database_seq_scan'] = query_database(False)
+
+    results = []
+    for method, function in methods.items():
+        result = {'method': method}
+        result.update(measure_latency(function, repeat))
+        if method == 'interval_tree':
+            result['build_ms'] = build_ms
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000])
+    parser.add_argument('--windows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    database_url = arguments.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-of-32-bytes!')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    from benchmarks.data_generator import seed_database
+
+    app = create_app()
+    windows = generate_windows(arguments.windows)
+    results = []
+
+    # A temporary database is ours to reset, and so is a given one once it
+    # holds the data of the previous size.
+    reset = arguments.reset or not arguments.database_url
+    for size in arguments.sizes:
+        row_counts = seed_database(app, size, reset=reset)
+        reset = True
+        for result in benchmark_methods(app, windows, arguments.repeat):
+            result['persons'] = size
+            result['rows'] = row_counts
+            results.append(result)
+            print(f'{size:>7} persons  {result["method"]:<18}'
+                  f'p50 {result["p50_ms"]:>10} ms  '
+                  f'p99 {result["p99_ms"]:>10} ms')
+
+    write_report(arguments.output, 'availability',
+                 {'sizes': arguments.sizes, 'windows': arguments.windows,
+                  'repeat': arguments.repeat,
+                  'database': database_url.split(':', 1)[0]}, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares two benchmark reports, for example of two commits.
+
+Matches the results of both reports on their non-numeric fields and persons
+count, and prints the relative change of every latency and size metric.
+Exits with status 1 if any p50 or p99 latency regressed by more than the
+threshold.
+
+Usage: python -m benchmarks.compare BASELINE.json CANDIDATE.json
+       [--threshold 0.1]
+"""
+import argparse
+import json
+import sys
+
+COMPARED_METRICS = ('p50_ms', 'p99_ms', 'mean_ms', 'queries',
+                    'peak_allocation_mb', 'response_bytes')
+GATED_METRICS = ('p50_ms', 'p99_ms')
+
+
+def result_key(result: dict) -> tuple:
+    """
+    Builds the key identifying a result across reports.
+
+    :param result: A result of a benchmark report.
+    :returns: A tuple of the identifying fields of the result.
+    """
+
+    return tuple(sorted((name, value) for name, value in result.items()
+                        if isinstance(value, str) or name == 'persons'))
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> bool:
+    """
+    Prints the changes between two reports.
+
+    :param baseline: The baseline report.
+    :param candidate: The candidate report.
+    :param threshold: The relative latency increase counted as regression.
+    :returns: True if no gated metric regressed beyond the threshold.
+    """
+
+    baseline_results = {result_key(result): result
+                        for result in baseline['results']}
+    passed = True
+
+    for result in candidate['results']:
+        key = result_key(result)
+        if key not in baseline_results:
+            continue
+
+        label = ' '.join(str(value) for _, value in key)
+        for metric in COMPARED_METRICS:
+            old = baseline_results[key].get(metric)
+            new = result.get(metric)
+            if not isinstance(old, (int, float)) or \
+                    not isinstance(new, (int, float)):
+                continue
+
+            change = (new - old) / old if old else 0.0
+            regressed = metric in GATED_METRICS and change > threshold
+            passed = passed and not regressed
+            print(f'{label:<40} {metric:<20} {old:>12} -> {new:>12} '
+                  f'({change:+.1%}){"  REGRESSION" if regressed else ""}')
+
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    with open(arguments.baseline) as baseline_file, \
+            open(arguments.candidate) as candidate_file:
+        passed = compare(json.load(baseline_file), json.load(candidate_file),
+                         arguments.threshold)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures the CPU time and size trade-off of response compression.
+
+Compresses a synthetic compiled application list with each gzip level and,
+if the brotli package is installed, each brotli quality, and reports the
+compressed size, the compression ratio and the median compression time.
+
+Usage: python -m benchmarks.compression_benchmark [--applicants 10000]
+       [--repeat 5] [--output report.json]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from app.utilities import compression
+from benchmarks.measurement import write_report
+from benchmarks.synthetic_data import generate_application_payload
+
+
+def measure(data: bytes, encoding: str, level: int, repeat: int) -> dict:
+    """
+    Measures the compression of data with one encoding and level.
+
+    :param data: The data to compress.
+    :param encoding: The content encoding, either 'gzip' or 'br'.
+    :param level: The gzip compression level or brotli quality.
+    :param repeat: The number of timed repetitions.
+    :returns: A dictionary with the measurements.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = compression.compress(data, encoding, level)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'encoding': encoding,
+        'level': level,
+        'bytes': len(compressed),
+        'ratio': round(len(data) / len(compressed), 2),
+        'median_ms': round(statistics.median(timings) * 1000, 2)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--applicants', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    payload = generate_application_payload(arguments.applicants)
+    data = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode()
+
+    configurations = [('gzip', level) for level in (1, 3, 6, 9)]
+    if compression.brotli is not None:
+        configurations += [('br', quality) for quality in (1, 4, 6, 11)]
+
+    results = [measure(data, encoding, level, arguments.repeat)
+               for encoding, level in configurations]
+
+    print(f'{len(data)} bytes uncompressed')
+    for result in results:
+        print(f'{result["encoding"]:>4} {result["level"]:>2}: '
+              f'{result["bytes"]:>9} bytes  ratio {result["ratio"]:>5}  '
+              f'{result["median_ms"]:>8} ms')
+
+    write_report(arguments.output, 'compression',
+                 {'applicants': arguments.applicants,
+                  'repeat': arguments.repeat,
+                  'uncompressed_bytes': len(data)}, results)
+
+
+if __name__ == '__main__':
+    main()
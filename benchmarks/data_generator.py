@@ -0,0 +1,122 @@
+"""
+Seeds a database with a synthetic applicant pool.
+
+Every person gets an application status, zero to three competence profiles
+and one to three availability periods. Rows are bulk inserted in batches.
+
+The database must be empty, unless --reset is given, which drops and
+recreates all tables first.
+
+Usage: python -m benchmarks.data_generator --database-url URL
+       [--persons 10000] [--seed 0] [--reset]
+"""
+import argparse
+import os
+import random
+import time
+
+from flask import Flask
+from sqlalchemy import inspect, insert, select
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.models.person import Person
+from benchmarks.synthetic_data import STATUSES, generate_availabilities, \
+    generate_competences, generate_person
+
+
+def seed_database(app: Flask, persons: int, seed: int = 0,
+                  batch_size: int = 5000, reset: bool = False) -> dict:
+    """
+    Fills a database with synthetic application data.
+
+    To protect real data, seeding a database with rows in any of the tables
+    of the application is refused unless reset is set, in which case all
+    tables are dropped and recreated first. Primary keys of persons and
+    application statuses are set explicitly, so SQLite can be used as a
+    stand-in for PostgreSQL.
+
+    :param app: The Flask application connected to the database.
+    :param persons: The number of applicants to generate.
+    :param seed: The seed of the random number generator.
+    :param batch_size: The number of persons inserted per batch.
+    :param reset: Whether to drop the existing data.
+    :returns: A dictionary with the number of rows inserted per table.
+    :raises RuntimeError: If the database holds data and reset is not set.
+    """
+
+    rng = random.Random(seed)
+    row_counts = dict.fromkeys(('person', 'application_status',
+                                'competence_profile', 'availability'), 0)
+
+    with app.app_context():
+        if reset:
+            database.drop_all()
+        elif has_rows():
+            raise RuntimeError(f'{database.engine.url!r} is not empty, '
+                               f'pass --reset to replace its data')
+        database.create_all()
+
+        for first_id in range(1, persons + 1, batch_size):
+            last_id = min(first_id + batch_size, persons + 1)
+            person_rows, status_rows = [], []
+            competence_rows, availability_rows = [], []
+
+            for person_id in range(first_id, last_id):
+                person_rows.append(generate_person(person_id, rng))
+                status_rows.append({'application_status_id': person_id,
+                                    'person_id': person_id,
+                                    'status': rng.choice(STATUSES)})
+                competence_rows += generate_competences(person_id, rng)
+                availability_rows += generate_availabilities(person_id, rng)
+
+            for model, rows in ((Person, person_rows),
+                                (ApplicationStatus, status_rows),
+                                (CompetenceProfile, competence_rows),
+                                (Availability, availability_rows)):
+                if rows:
+                    database.session.execute(insert(model), rows)
+                    row_counts[model.__tablename__] += len(rows)
+            database.session.commit()
+
+    return row_counts
+
+
+def has_rows() -> bool:
+    """
+    Checks whether any table of the application holds rows.
+
+    Must be called in an application context.
+
+    :returns: Whether a table of the application exists and is not empty.
+    """
+
+    existing_tables = set(inspect(database.engine).get_table_names())
+    for table in database.metadata.sorted_tables:
+        if table.name in existing_tables and database.session.execute(
+                select(1).select_from(table).limit(1)).first():
+            return True
+    return False
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url', required=True)
+    parser.add_argument('--persons', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reset', action='store_true')
+    arguments = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = arguments.database_url
+    from app.app import create_app
+
+    start = time.perf_counter()
+    row_counts = seed_database(create_app(), arguments.persons,
+                               arguments.seed, reset=arguments.reset)
+    print(f'Seeded {row_counts} in {time.perf_counter() - start:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Measures the throughput and memory use of the application export.
+
+For each pool size, seeds the database and exports all applications in
+every supported format (CSV, and Parquet and Arrow if pyarrow is
+installed), discarding the output. Reports latency percentiles, rows per
+second, output bytes and the peak Python heap allocation of one export,
+which should stay flat as the pool grows, since the export holds one chunk
+at a time.
+
+Usage: python -m benchmarks.export_benchmark
+       [--database-url URL] [--sizes 10000 100000] [--chunk-size 5000]
+       [--repeat 3] [--output report.json]
+
+Without --database-url a temporary SQLite database is used. A database
+given with --database-url must be empty, unless --reset is given to drop
+its data.
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.measurement import measure_latency, \
+    measure_peak_allocation, write_report
+
+
+def benchmark_formats(app, persons: int, chunk_size: int,
+                      repeat: int) -> list[dict]:
+    """
+    Measures an export of all applications in every supported format.
+
+    :param app: The Flask application connected to a seeded database.
+    :param persons: The number of seeded persons.
+    :param chunk_size: The number of applications read at once.
+    :param repeat: The number of timed exports per format.
+    :returns: A list with one measurement dictionary per format.
+    """
+
+    from app.services.export_service import export_applications, \
+        get_export_formats
+
+    def export(export_format):
+        def call():
+            with app.app_context():
+                return sum(len(chunk) for chunk in
+                           export_applications(export_format, chunk_size))
+        return call
+
+    results = []
+    for export_format in get_export_formats():
+        function = export(export_format)
+        result = {'format': export_format, 'bytes': function()}
+        result.update(measure_latency(function, repeat))
+        result['rows_per_second'] = round(
+                persons / (result['p50_ms'] / 1000))
+        result['peak_mb'] = measure_peak_allocation(function)
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000])
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    database_url = arguments.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-of-32-bytes!')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    from benchmarks.data_generator import seed_database
+
+    app = create_app()
+    results = []
+
+    # A temporary database is ours to reset, and so is a given one once it
+    # holds the data of the previous size.
+    reset = arguments.reset or not arguments.database_url
+    for size in arguments.sizes:
+        seed_database(app, size, reset=reset)
+        reset = True
+        for result in benchmark_formats(app, size, arguments.chunk_size,
+                                        arguments.repeat):
+            result['persons'] = size
+            results.append(result)
+            print(f'{size:>7} persons  {result["format"]:<8}'
+                  f'p50 {result["p50_ms"]:>10} ms  '
+                  f'{result["rows_per_second"]:>8} rows/s  '
+                  f'{result["bytes"]:>11} B  '
+                  f'peak {result["peak_mb"]:>8} MB')
+
+    write_report(arguments.output, 'export',
+                 {'sizes': arguments.sizes,
+                  'chunk_size': arguments.chunk_size,
+                  'repeat': arguments.repeat,
+                  'database': database_url.split(':', 1)[0]}, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Measures the cost of loading applicant rows as ORM entities versus
+column-projected records.
+
+For each pool size, seeds the database and loads the persons, competences
+and availabilities of all applicants twice: as ORM entities, like the
+repository did before, and with the repository's projected queries, which
+return lightweight records. Every loaded row is converted with to_dict, as
+when compiling applications. Reports latency percentiles, CPU time per row
+and peak Python heap allocation per row.
+
+Usage: python -m benchmarks.hydration_benchmark
+       [--database-url URL] [--sizes 10000 100000] [--repeat 5]
+       [--output report.json]
+
+Without --database-url a temporary SQLite database is used. A database
+given with --database-url must be empty, unless --reset is given to drop
+its data.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.measurement import measure_latency, \
+    measure_peak_allocation, write_report
+
+
+def load_entities(model, person_ids: list[int]) -> list[dict]:
+    """
+    Loads all rows of a model belonging to the given persons as ORM
+    entities and converts them to dictionaries.
+
+    :param model: The model class to query. Must have a person_id column.
+    :param person_ids: The ids of the persons to load rows for.
+    :returns: The dictionaries of the loaded rows.
+    """
+
+    from app.repositories.applications_repository import \
+        IN_CLAUSE_BATCH_SIZE
+
+    primary_key = model.__mapper__.primary_key[0]
+    rows = []
+    for start in range(0, len(person_ids), IN_CLAUSE_BATCH_SIZE):
+        batch = person_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+        rows.extend(model.query.filter(model.person_id.in_(batch))
+                    .order_by(primary_key).all())
+    return [row.to_dict() for row in rows]
+
+
+def load_records(repository_function, person_ids: list[int]) -> list[dict]:
+    """
+    Loads rows with a projected repository function and converts them to
+    dictionaries.
+
+    :param repository_function: The repository function to call.
+    :param person_ids: The ids of the persons to load rows for.
+    :returns: The dictionaries of the loaded rows.
+    """
+
+    loaded = repository_function(person_ids)
+    dictionaries = []
+    for value in loaded.values():
+        if isinstance(value, list):
+            dictionaries.extend(record.to_dict() for record in value)
+        else:
+            dictionaries.append(value.to_dict())
+    return dictionaries
+
+
+def benchmark_methods(app, persons: int, repeat: int) -> list[dict]:
+    """
+    Measures both loading methods for every table.
+
+    :param app: The Flask application connected to a seeded database.
+    :param persons: The number of seeded persons.
+    :param repeat: The number of timed calls per method.
+    :returns: A list with one measurement dictionary per table and method.
+    """
+
+    from app.models.availability import Availability
+    from app.models.competence_profile import CompetenceProfile
+    from app.models.person import Person
+    from app.repositories.applications_repository import \
+        get_availabilities_for_persons_from_db, \
+        get_competences_for_persons_from_db, get_persons_from_db
+
+    person_ids = list(range(1, persons + 1))
+    tables = {
+        'person': (Person, get_persons_from_db),
+        'competence_profile': (CompetenceProfile,
+                               get_competences_for_persons_from_db),
+        'availability': (Availability,
+                         get_availabilities_for_persons_from_db)
+    }
+
+    def in_app_context(function, argument):
+        # A new application context gets a new session, so entities are
+        # never reused from the identity map of a previous call.
+        def call():
+            with app.app_context():
+                return function(argument, person_ids)
+        return call
+
+    results = []
+    for table, (model, repository_function) in tables.items():
+        methods = {
+            'orm_entities': in_app_context(load_entities, model),
+            'projected_records': in_app_context(load_records,
+                                                repository_function)
+        }
+        for method, function in methods.items():
+            rows = len(function())
+            start = time.process_time()
+            function()
+            cpu_seconds = time.process_time() - start
+
+            result = {'table': table, 'method': method, 'rows': rows}
+            result.update(measure_latency(function, repeat))
+            result['cpu_us_per_row'] = round(
+                    cpu_seconds * 1e6 / max(rows, 1), 3)
+            result['peak_bytes_per_row'] = round(
+                    measure_peak_allocation(function) * 1024 * 1024 /
+                    max(rows, 1), 1)
+            results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    database_url = arguments.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-of-32-bytes!')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    from benchmarks.data_generator import seed_database
+
+    app = create_app()
+    results = []
+
+    # A temporary database is ours to reset, and so is a given one once it
+    # holds the data of the previous size.
+    reset = arguments.reset or not arguments.database_url
+    for size in arguments.sizes:
+        seed_database(app, size, reset=reset)
+        reset = True
+        for result in benchmark_methods(app, size, arguments.repeat):
+            result['persons'] = size
+            results.append(result)
+            print(f'{size:>7} persons  {result["table"]:<19}'
+                  f'{result["method"]:<18}'
+                  f'p50 {result["p50_ms"]:>10} ms  '
+                  f'cpu {result["cpu_us_per_row"]:>8} us/row  '
+                  f'peak {result["peak_bytes_per_row"]:>8} B/row')
+
+    write_report(arguments.output, 'hydration',
+                 {'sizes': arguments.sizes, 'repeat': arguments.repeat,
+                  'database': database_url.split(':', 1)[0]}, results)
+
+
+if __name__ == '__main__':
+    main()
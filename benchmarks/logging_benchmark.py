@@ -0,0 +1,186 @@
+"""
+Measures how long logging threads wait on log output.
+
+Several threads log request lines like the routes do, once with the output
+handler attached to the root logger directly, as before, and once through
+the log queue with each overflow policy. The output handler writes to a
+temporary file and can be slowed down to simulate back-pressure from a
+disk or a log drain. Reports the latency percentiles of a logging call in
+the logging threads, their throughput, and how many records were written
+and dropped. Also compares f-string and %-style calls whose level is
+disabled.
+
+Usage: python -m benchmarks.logging_benchmark [--threads 8]
+       [--records 5000] [--sink-delay-us 50] [--queue-size 10000]
+       [--output report.json]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from flask import Flask
+
+from app.utilities.log_queue import LogQueue
+from benchmarks.measurement import percentile, write_report
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class SlowFileHandler(logging.FileHandler):
+    """
+    A FileHandler that waits after every record, like a congested sink.
+    """
+
+    def __init__(self, filename: str, delay: float) -> None:
+        """
+        Initializes a new SlowFileHandler object.
+
+        :param filename: The path of the log file.
+        :param delay: The time to wait after each record in seconds.
+        """
+
+        super().__init__(filename)
+        self.delay = delay
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        if self.delay:
+            time.sleep(self.delay)
+
+
+def measure_pipeline(pipeline: str, threads: int, records: int,
+                     delay: float, queue_size: int) -> dict:
+    """
+    Logs from several threads through one logging pipeline.
+
+    :param pipeline: 'sync', 'queue_drop' or 'queue_block'.
+    :param threads: The number of logging threads.
+    :param records: The number of records each thread logs.
+    :param delay: The delay of the output handler per record in seconds.
+    :param queue_size: The capacity of the log queue.
+    :returns: A dictionary with the measurements.
+    """
+
+    app = Flask(__name__)
+    app.config.update({
+        'LOG_QUEUE_ENABLED': pipeline != 'sync',
+        'LOG_QUEUE_SIZE': queue_size,
+        'LOG_QUEUE_OVERFLOW': 'block' if pipeline == 'queue_block' else
+        'drop'
+    })
+    timings: list[float] = []
+    lock = threading.Lock()
+
+    def log_requests() -> None:
+        local_timings = []
+        for number in range(records):
+            start = time.perf_counter()
+            logging.info('%s - Responding with applications.',
+                         f'10.0.0.{number % 256}')
+            local_timings.append((time.perf_counter() - start) * 1e6)
+        with lock:
+            timings.extend(local_timings)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'app.log')
+        output_handler = SlowFileHandler(path, delay)
+        output_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_queue = LogQueue()
+        log_queue.init_app(app, output_handler)
+        logging.getLogger().setLevel(logging.INFO)
+
+        workers = [threading.Thread(target=log_requests)
+                   for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        stats = log_queue.stats()
+        log_queue.stop()
+        with open(path) as log_file:
+            written = sum(1 for _ in log_file)
+
+    return {
+        'method': pipeline,
+        'p50_us': round(percentile(timings, 0.5), 2),
+        'p99_us': round(percentile(timings, 0.99), 2),
+        'max_us': round(max(timings), 2),
+        'mean_us': round(statistics.fmean(timings), 2),
+        'calls_per_s': round(len(timings) / elapsed),
+        'written': written,
+        'dropped': stats['dropped']
+    }
+
+
+def measure_disabled_call(style: str, calls: int) -> dict:
+    """
+    Measures logging calls whose level is disabled.
+
+    :param style: 'fstring' or 'percent'.
+    :param calls: The number of calls.
+    :returns: A dictionary with the measurements.
+    """
+
+    logger = logging.getLogger('benchmarks.disabled')
+    logger.setLevel(logging.WARNING)
+    requester_ip, person_ids = '10.0.0.1', list(range(50))
+
+    start = time.perf_counter()
+    if style == 'fstring':
+        for _ in range(calls):
+            logger.debug(f'{requester_ip} - Compiling {person_ids}')
+    else:
+        for _ in range(calls):
+            logger.debug('%s - Compiling %s', requester_ip, person_ids)
+    elapsed = time.perf_counter() - start
+
+    return {'method': f'disabled_{style}',
+            'mean_us': round(elapsed / calls * 1e6, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--sink-delay-us', type=float, default=50)
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    results = [measure_pipeline(pipeline, arguments.threads,
+                                arguments.records,
+                                arguments.sink_delay_us / 1e6,
+                                arguments.queue_size)
+               for pipeline in ('sync', 'queue_drop', 'queue_block')]
+
+    print(f'{arguments.threads} threads x {arguments.records} records, '
+          f'sink delay {arguments.sink_delay_us} us')
+    for result in results:
+        print(f'{result["method"]:<12}p50 {result["p50_us"]:>9} us  '
+              f'p99 {result["p99_us"]:>9} us  '
+              f'{result["calls_per_s"]:>9} calls/s  '
+              f'written {result["written"]:>7}  '
+              f'dropped {result["dropped"]:>7}')
+
+    for style in ('fstring', 'percent'):
+        result = measure_disabled_call(style, 100000)
+        results.append(result)
+        print(f'{result["method"]:<17}{result["mean_us"]:>9} us per call')
+
+    write_report(arguments.output, 'logging',
+                 {'threads': arguments.threads,
+                  'records': arguments.records,
+                  'sink_delay_us': arguments.sink_delay_us,
+                  'queue_size': arguments.queue_size},
+                 results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+import datetime as dt
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Computes a percentile of a list of values with linear interpolation.
+
+    :param values: The values.
+    :param fraction: The percentile as a fraction between 0 and 1.
+    :returns: The percentile.
+    """
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+            position - lower)
+
+
+def measure_latency(function: Callable[[], object], repeat: int,
+                    warmup: int = 1) -> dict:
+    """
+    Measures the latency distribution of a function.
+
+    :param function: The function to measure.
+    :param repeat: The number of timed calls.
+    :param warmup: The number of untimed calls before measuring.
+    :returns: A dictionary with latency percentiles in milliseconds.
+    """
+
+    for _ in range(warmup):
+        function()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'runs': repeat,
+        'p50_ms': round(percentile(timings, 0.5), 3),
+        'p90_ms': round(percentile(timings, 0.9), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(max(timings), 3)
+    }
+
+
+def measure_peak_allocation(function: Callable[[], object]) -> float:
+    """
+    Measures the peak Python heap allocation of one call of a function.
+
+    :param function: The function to measure.
+    :returns: The peak traced allocation in megabytes.
+    """
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 3)
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of this process so far.
+
+    :returns: The peak resident set size in megabytes.
+    """
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak /= 1024
+    return round(peak / 1024, 3)
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements executed by all engines while active.
+
+    :ivar count: The number of statements executed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new QueryCounter object.
+        """
+
+        self.count = 0
+
+    def __enter__(self) -> 'QueryCounter':
+        event.listen(Engine, 'before_cursor_execute', self._count)
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        event.remove(Engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+
+def count_queries(function: Callable[[], object]) -> int:
+    """
+    Counts the SQL statements executed by one call of a function.
+
+    :param function: The function to measure.
+    :returns: The number of statements executed.
+    """
+
+    with QueryCounter() as counter:
+        function()
+    return counter.count
+
+
+def git_commit() -> Optional[str]:
+    """
+    Returns the commit of the working tree, if it is a git repository.
+
+    :returns: The commit hash, or None if it cannot be determined.
+    """
+
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(path: Optional[str], benchmark: str, parameters: dict,
+                 results: list[dict]) -> dict:
+    """
+    Builds a machine-readable benchmark report and optionally writes it.
+
+    The report records the commit, Python version and platform, so reports
+    of different commits can be compared with benchmarks.compare.
+
+    :param path: The path of the JSON report, or None to not write one.
+    :param benchmark: The name of the benchmark.
+    :param parameters: The parameters the benchmark was run with.
+    :param results: The measurements.
+    :returns: The report.
+    """
+
+    report = {
+        'benchmark': benchmark,
+        'commit': git_commit(),
+        'created_at': dt.datetime.now(dt.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': parameters,
+        'results': results
+    }
+
+    if path:
+        with open(path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
@@ -0,0 +1,122 @@
+"""
+Measures the serialization of compiled application lists.
+
+Builds a synthetic application list from the records the repository
+returns, with Decimal years of experience and date availabilities, and
+serializes it into a JSON response with Flask's default provider and with
+the application's provider, once with the json module and once with orjson.
+Also reports the time spent converting the records to dictionaries and
+checks that all providers produce the same bytes.
+
+Usage: python -m benchmarks.serialization_benchmark [--applicants 10000]
+       [--repeat 5] [--output report.json]
+"""
+import argparse
+import random
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.models.records import AvailabilityRecord, CompetenceRecord, \
+    PersonRecord
+from app.utilities.json_provider import InstrumentedJSONProvider, orjson
+from benchmarks.measurement import measure_latency, write_report
+from benchmarks.synthetic_data import STATUSES, generate_availabilities, \
+    generate_competences, generate_person
+
+
+def generate_records(applicants: int, seed: int = 0) -> list[tuple]:
+    """
+    Generates the records of synthetic applications.
+
+    :param applicants: The number of applications to generate.
+    :param seed: The seed of the random number generator.
+    :returns: A list of (person, competences, availabilities, status)
+              tuples of records.
+    """
+
+    rng = random.Random(seed)
+    applications = []
+
+    for person_id in range(1, applicants + 1):
+        person = generate_person(person_id, rng)
+        applications.append((
+            PersonRecord(person_id, person['name'], person['surname'],
+                         person['pnr'], person['email']),
+            [CompetenceRecord(person_id, competence['competence_id'],
+                              Decimal(f'{competence["years_of_experience"]}'
+                                      f'').quantize(Decimal('0.01')))
+             for competence in generate_competences(person_id, rng)],
+            [AvailabilityRecord(person_id, availability['from_date'],
+                                availability['to_date'])
+             for availability in generate_availabilities(person_id, rng)],
+            rng.choice(STATUSES)))
+
+    return applications
+
+
+def assemble(applications: list[tuple]) -> list[dict]:
+    """
+    Converts application records to dictionaries, like the applications
+    service does.
+
+    :param applications: The records of the applications.
+    :returns: The compiled applications.
+    """
+
+    return [{
+        'personal_info': person.to_dict(),
+        'competences': [competence.to_dict() for competence in competences],
+        'availabilities': [availability.to_dict() for availability in
+                           availabilities],
+        'status': status
+    } for person, competences, availabilities, status in applications]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--applicants', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    applications = generate_records(arguments.applicants)
+    payload = assemble(applications)
+
+    app = Flask(__name__)
+    providers = {'flask_default': DefaultJSONProvider(app)}
+    app.config['JSON_SERIALIZER'] = 'stdlib'
+    providers['stdlib'] = InstrumentedJSONProvider(app)
+    if orjson is not None:
+        app.config['JSON_SERIALIZER'] = 'auto'
+        providers['orjson'] = InstrumentedJSONProvider(app)
+
+    bodies = {name: provider.response(payload).get_data()
+              for name, provider in providers.items()}
+    identical = len(set(bodies.values())) == 1
+
+    results = [{'method': 'assemble'}]
+    results[0].update(measure_latency(lambda: assemble(applications),
+                                      arguments.repeat))
+    for name, provider in providers.items():
+        result = {'method': name, 'bytes': len(bodies[name])}
+        result.update(measure_latency(
+                lambda provider=provider: provider.response(payload),
+                arguments.repeat))
+        results.append(result)
+
+    print(f'{arguments.applicants} applications, identical output: '
+          f'{identical}')
+    for result in results:
+        print(f'{result["method"]:<14}p50 {result["p50_ms"]:>10} ms  '
+              f'p99 {result["p99_ms"]:>10} ms')
+
+    write_report(arguments.output, 'serialization',
+                 {'applicants': arguments.applicants,
+                  'repeat': arguments.repeat, 'identical': identical},
+                 results)
+
+
+if __name__ == '__main__':
+    main()
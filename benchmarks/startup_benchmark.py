@@ -0,0 +1,133 @@
+"""
+Measures the startup time of a worker process.
+
+Starts fresh Python processes that import the application, create it and
+answer a first applications request, like a newly booted gunicorn worker.
+Each startup is measured as the application does it now, without touching
+the database until the first request, and with the create_all call that
+every worker used to make at boot. Reports the median time to import the
+application, to create it, to run create_all and to answer the first
+request, and the time from the start of the process to the first
+response.
+
+Usage: python -m benchmarks.startup_benchmark [--database-url URL]
+       [--persons 1000] [--repeat 10] [--output report.json]
+
+Without --database-url a temporary SQLite database is used. A database
+given with --database-url must be empty, unless --reset is given to drop
+its data.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.measurement import write_report
+
+WORKER_SCRIPT = '''
+import json
+import os
+import time
+
+start = time.perf_counter()
+from app.app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+if os.environ['STARTUP_CREATE_ALL'] == 'true':
+    from app.extensions import database
+    with app.app_context():
+        database.create_all()
+initialized = time.perf_counter()
+
+from flask_jwt_extended import create_access_token
+with app.app_context():
+    token = create_access_token(identity=None,
+                                additional_claims={'id': 0, 'role': 1})
+requested = time.perf_counter()
+response = app.test_client().get(
+        '/api/applications/', headers={'Authorization': f'Bearer {token}'})
+answered = time.perf_counter()
+assert response.status_code == 200, response.status_code
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'create_all_ms': (initialized - created) * 1000,
+    'first_response_ms': (answered - requested) * 1000,
+    'ready_ms': (initialized - start + answered - requested) * 1000
+}))
+'''
+
+
+def start_worker(create_all: bool) -> dict:
+    """
+    Starts a worker process and measures its startup.
+
+    :param create_all: Whether the worker calls create_all after creating
+           the application, as it did before.
+    :returns: A dictionary with the timings of the worker in milliseconds.
+    """
+
+    environment = dict(os.environ,
+                       STARTUP_CREATE_ALL='true' if create_all else 'false')
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', WORKER_SCRIPT],
+                               env=environment, capture_output=True,
+                               text=True, check=True)
+    timings = json.loads(completed.stdout.splitlines()[-1])
+    timings['process_ms'] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-url')
+    parser.add_argument('--reset', action='store_true')
+    parser.add_argument('--persons', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output')
+    arguments = parser.parse_args()
+
+    database_url = arguments.database_url or 'sqlite:///' + os.path.join(
+            tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-of-32-bytes!')
+    os.environ['APPLICATIONS_CACHE_ENABLED'] = 'false'
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    from benchmarks.data_generator import seed_database
+
+    seed_database(create_app(), arguments.persons,
+                  reset=arguments.reset or not arguments.database_url)
+
+    results = []
+    for method, create_all in (('lazy', False), ('create_all', True)):
+        runs = [start_worker(create_all) for _ in range(arguments.repeat)]
+        result = {'method': method, 'runs': arguments.repeat}
+        for key in runs[0]:
+            result[key] = round(statistics.median(
+                    run[key] for run in runs), 2)
+        results.append(result)
+
+    print(f'{arguments.persons} persons, median of {arguments.repeat} '
+          f'worker starts')
+    for result in results:
+        print(f'{result["method"]:<11}import {result["import_ms"]:>8} ms  '
+              f'create_app {result["create_app_ms"]:>7} ms  '
+              f'create_all {result["create_all_ms"]:>7} ms  '
+              f'first response {result["first_response_ms"]:>8} ms  '
+              f'process {result["process_ms"]:>8} ms')
+
+    write_report(arguments.output, 'startup',
+                 {'persons': arguments.persons, 'repeat': arguments.repeat},
+                 results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import datetime as dt
+import random
+
+# Hyphenated names and surnames ending in e, followed by the digits of the
+# email address, occur in real applications and must not slow down the
+# serialization.
+FIRST_NAMES = ('Anna', 'Erik', 'Maria', 'Lars', 'Karin', 'Johan', 'Sara',
+               'Anders', 'Emma', 'Per', 'Åsa', 'Björn', 'Anne-Marie',
+               'Lise-Lotte', 'Jan-Erik')
+SURNAMES = ('Andersson', 'Johansson', 'Karlsson', 'Nilsson', 'Eriksson',
+            'Larsson', 'Olsson', 'Persson', 'Svensson', 'Gustafsson',
+            'Berge', 'Lie', 'Strinde')
+COMPETENCE_IDS = (1, 2, 3)
+STATUSES = ('Pending', 'Pending', 'Pending', 'Accepted', 'Rejected')
+
+
+def generate_person(person_id: int, rng: random.Random) -> dict:
+    """
+    Generates the personal information of a synthetic applicant.
+
+    :param person_id: The id of the applicant.
+    :param rng: The random number generator to use.
+    :returns: A dictionary with the columns of the person table.
+    """
+
+    name = rng.choice(FIRST_NAMES)
+    surname = rng.choice(SURNAMES)
+    birth_date = dt.date(1960, 1, 1) + dt.timedelta(days=rng.randrange(15000))
+    return {
+        'person_id': person_id,
+        'name': name,
+        'surname': surname,
+        'pnr': f'{birth_date:%Y%m%d}-{rng.randrange(10000):04d}',
+        'email': f'{name.lower()}.{surname.lower()}{person_id}@example.com',
+        'password': None,
+        'role_id': 2,
+        'username': None
+    }
+
+
+def generate_competences(person_id: int, rng: random.Random) -> list[dict]:
+    """
+    Generates the competence profiles of a synthetic applicant.
+
+    :param person_id: The id of the applicant.
+    :param rng: The random number generator to use.
+    :returns: A list of dictionaries with the columns of the
+              competence_profile table, without the primary key.
+    """
+
+    competence_ids = rng.sample(COMPETENCE_IDS, rng.randrange(4))
+    return [{'person_id': person_id,
+             'competence_id': competence_id,
+             'years_of_experience': round(rng.uniform(0, 15), 2)}
+            for competence_id in competence_ids]
+
+
+def generate_availabilities(person_id: int,
+                            rng: random.Random) -> list[dict]:
+    """
+    Generates the availability periods of a synthetic applicant.
+
+    :param person_id: The id of the applicant.
+    :param rng: The random number generator to use.
+    :returns: A list of dictionaries with the columns of the availability
+              table, without the primary key.
+    """
+
+    availabilities = []
+    from_date = dt.date(2024, 1, 1) + dt.timedelta(days=rng.randrange(60))
+    for _ in range(rng.randrange(1, 4)):
+        to_date = from_date + dt.timedelta(days=rng.randrange(1, 90))
+        availabilities.append({'person_id': person_id,
+                               'from_date': from_date,
+                               'to_date': to_date})
+        from_date = to_date + dt.timedelta(days=rng.randrange(1, 60))
+    return availabilities
+
+
+def generate_application_payload(applicants: int, seed: int = 0) -> list:
+    """
+    Generates a compiled application list as returned by the API.
+
+    :param applicants: The number of applications to generate.
+    :param seed: The seed of the random number generator.
+    :returns: A list of compiled applications.
+    """
+
+    rng = random.Random(seed)
+    applications = []
+
+    for person_id in range(1, applicants + 1):
+        person = generate_person(person_id, rng)
+        applications.append({
+            'personal_info': {key: person[key] for key in
+                              ('person_id', 'name', 'surname', 'pnr',
+                               'email')},
+            'competences': [
+                {'competence_id': competence['competence_id'],
+                 'years_of_experience':
+                     f'{competence["years_of_experience"]:.2f}'}
+                for competence in generate_competences(person_id, rng)],
+            'availabilities': [
+                {'from_date': f'{availability["from_date"]:%Y-%m-%d}',
+                 'to_date': f'{availability["to_date"]:%Y-%m-%d}'}
+                for availability in generate_availabilities(person_id, rng)],
+            'status': rng.choice(STATUSES)
+        })
+
+    return applications
@@ -0,0 +1,35 @@
+import os
+
+# Keep in sync with the pool sizing in app/config.py, which reads the same
+# environment variables. With more than one thread, gunicorn runs gthread
+# workers, whose spare threads can hold a few event streams; gevent workers
+# are the supported way to serve them.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# With gevent workers, idle event stream subscribers cost a greenlet
+# instead of a thread. The standard library and psycopg2 are patched before
+# the application is imported, so database calls yield to other greenlets
+# instead of blocking the worker.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+if worker_class == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+# The application is created once in the master process and shared by the
+# forked workers. Creating it opens no database connections, and post_fork
+# gives every worker its own pool connections and log listener. gevent
+# workers create their own application by default, since greenlets of the
+# master, like the log listener, do not survive the fork cleanly.
+preload_app = os.environ.get(
+        'GUNICORN_PRELOAD',
+        'false' if worker_class == 'gevent' else 'true').lower() == 'true'
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from app.app import reset_after_fork
+        reset_after_fork(worker.app.wsgi())
@@ -1,16 +1,32 @@
 from unittest.mock import patch
 
+from datetime import date
+from decimal import Decimal
+
 import pytest
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
+from app.extensions import database
+from app.models.availability import Availability
+from app.models.person import Person
+from app.models.records import PersonRecord
 from app.repositories.applications_repository import \
-    get_application_statuses_from_db, get_availabilities_from_db, \
-    get_competences_from_db, \
-    get_personal_info_from_db
+    get_application_export_chunks_from_db, \
+    get_application_records_from_db, get_application_status_chunks_from_db, \
+    get_application_statuses_from_db, \
+    get_application_statuses_page_from_db, \
+    get_availabilities_for_persons_from_db, \
+    get_availabilities_from_db, get_competences_for_persons_from_db, \
+    get_competences_from_db, get_personal_info_from_db, get_persons_from_db
+from app.utilities.filters import ApplicationFilters
 from tests.utilities.utility_functions import cleanup_db, \
     setup_application_status_for_user1_in_db, \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, \
     setup_availabilities_for_user1_in_db, \
-    setup_competence_profile_for_user2_in_db, setup_user1_in_db
+    setup_competence_profile_for_user2_in_db, \
+    setup_competence_profiles_for_all_users, setup_three_users, \
+    setup_user1_in_db
 
 
 def test_get_application_statuses_from_db_success(app_with_client):
@@ -148,3 +164,210 @@ def test_get_availabilities_from_db_sqlalchemy_error(app_with_client):
 
             assert isinstance(exception_info.value, SQLAlchemyError)
             mock.filter_by.return_value.all.assert_called_once()
+
+
+def test_get_persons_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+
+    with app.app_context():
+        applicants = get_persons_from_db([1, 3, 4])
+        assert sorted(applicants) == [1, 3]
+        assert applicants[1].name == 'user1'
+        assert applicants[3].name == 'user3'
+        assert isinstance(applicants[1], PersonRecord)
+        assert applicants[1].to_dict() == \
+               database.session.get(Person, 1).to_dict()
+
+
+def test_get_persons_from_db_sqlalchemy_error(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch.object(database.session, 'execute',
+                          side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError) as exception_info:
+                get_persons_from_db([1])
+
+            assert exception_info.value.args[0] == 'COULD_NOT_FETCH_PERSONS'
+
+
+def test_get_application_records_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        records = get_application_records_from_db([1, 3, 4])
+        assert sorted(records) == [1, 3]
+        assert records[1].person.name == 'user1'
+        assert [competence.years_of_experience for competence in
+                records[1].competences] == [1, 4]
+        assert [availability.from_date for availability in
+                records[1].availabilities] == [date(2024, 3, 1),
+                                               date(2024, 3, 4)]
+        assert records[3].competences == []
+
+
+def test_get_competences_for_persons_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        competences = get_competences_for_persons_from_db([1, 2, 3])
+        assert sorted(competences) == [1, 2]
+        assert [competence.years_of_experience for competence in
+                competences[1]] == [1, 4]
+        assert competences[2][0].competence_id == 2
+
+
+def test_get_availabilities_for_persons_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        availabilities = get_availabilities_for_persons_from_db([1, 2, 3])
+        assert sorted(availabilities) == [1, 2, 3]
+        assert len(availabilities[1]) == 2
+        assert availabilities[1][0].from_date.strftime('%Y-%m-%d') == \
+               '2024-03-01'
+        assert availabilities[1][1].from_date.strftime('%Y-%m-%d') == \
+               '2024-03-04'
+
+
+def test_get_availabilities_for_persons_from_db_batches(app_with_client):
+    app, _ = app_with_client
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        with patch('app.repositories.applications_repository.'
+                   'IN_CLAUSE_BATCH_SIZE', 2):
+            availabilities = get_availabilities_for_persons_from_db([1, 2, 3])
+        assert sorted(availabilities) == [1, 2, 3]
+
+
+def test_get_application_statuses_page_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+
+    with app.app_context():
+        first_page, has_more = get_application_statuses_page_from_db(None, 2)
+        assert [entry.person_id for entry in first_page] == [1, 2]
+        assert has_more
+
+        after_id = first_page[-1].application_status_id
+        last_page, has_more = get_application_statuses_page_from_db(
+                after_id, 2)
+        assert [entry.person_id for entry in last_page] == [3]
+        assert not has_more
+
+        empty_page, has_more = get_application_statuses_page_from_db(
+                last_page[-1].application_status_id, 2)
+        assert empty_page == []
+        assert not has_more
+
+
+def test_get_application_statuses_page_from_db_no_statuses(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with pytest.raises(NoResultFound):
+            get_application_statuses_page_from_db(None, 2)
+
+
+def test_get_application_status_chunks_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+
+    with app.app_context():
+        chunks = list(get_application_status_chunks_from_db(2))
+        assert [[entry.person_id for entry in chunk] for chunk in chunks] == \
+               [[1, 2], [3]]
+
+
+def test_get_application_export_chunks_from_db_success(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        chunks = list(get_application_export_chunks_from_db(2, ('name',)))
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+
+        status_id, person_id, status, name, competences, availabilities = \
+            chunks[0][1]
+        assert (person_id, status, name) == (2, 'Pending', 'user2')
+        assert [(competence.competence_id, competence.years_of_experience)
+                for competence in competences] == [(2, Decimal('2.00'))]
+        assert [(availability.from_date, availability.to_date)
+                for availability in availabilities] == \
+               [(date(2024, 3, 2), date(2024, 3, 3))]
+        assert chunks[1][0][4] == []
+
+
+def test_get_application_statuses_from_db_filtered(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    def filtered_person_ids(**filters):
+        application_statuses = get_application_statuses_from_db(
+                ApplicationFilters(**filters))
+        return sorted(entry.person_id for entry in application_statuses)
+
+    with app.app_context():
+        assert filtered_person_ids(statuses=['Pending']) == [1, 2, 3]
+        assert filtered_person_ids(competence_id=2) == [2]
+        assert filtered_person_ids(competence_id=1,
+                                   min_years=Decimal(3)) == [1]
+        assert filtered_person_ids(min_years=Decimal(2)) == [1, 2]
+        assert filtered_person_ids(available_from=date(2024, 3, 4),
+                                   available_to=date(2024, 3, 4)) == [1, 3]
+        assert filtered_person_ids(available_from=date(2024, 3, 2),
+                                   available_to=date(2024, 3, 3)) == [2]
+        assert filtered_person_ids(statuses=['Accepted']) == []
+
+
+def test_get_application_statuses_from_db_swapped_period(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+
+    with app.app_context():
+        database.session.add(Availability(1, date(2024, 5, 10),
+                                          date(2024, 5, 1)))
+        database.session.commit()
+
+        application_statuses = get_application_statuses_from_db(
+                ApplicationFilters(available_from=date(2024, 5, 2),
+                                   available_to=date(2024, 5, 3)))
+        assert [entry.person_id for entry in application_statuses] == [1]
+
+
+def test_get_application_statuses_page_from_db_filtered(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    filters = ApplicationFilters(available_from=date(2024, 3, 3),
+                                 available_to=date(2024, 3, 3))
+
+    with app.app_context():
+        page, has_more = get_application_statuses_page_from_db(None, 1,
+                                                               filters)
+        assert [entry.person_id for entry in page] == [2]
+        assert has_more
+
+        page, has_more = get_application_statuses_page_from_db(
+                page[-1].application_status_id, 1, filters)
+        assert [entry.person_id for entry in page] == [3]
+        assert not has_more
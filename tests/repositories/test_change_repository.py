@@ -0,0 +1,137 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.application_change import ApplicationChange
+from app.models.person import Person
+from app.repositories.change_repository import delete_changes_before, \
+    get_change_horizon_from_db, get_changes_from_db, \
+    get_person_versions_from_db, get_table_versions_from_db
+from tests.utilities.utility_functions import \
+    setup_application_status_for_user1_in_db, setup_three_users
+
+
+def test_triggers_record_changes(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        horizon = get_change_horizon_from_db()
+        status = ApplicationStatus.query.one()
+        status.status = 'Accepted'
+        database.session.commit()
+        status.person_id = 2
+        database.session.commit()
+        database.session.delete(status)
+        database.session.commit()
+
+        changes, _ = get_changes_from_db(horizon, 0, 10)
+        assert [person_id for _, _, person_id in changes] == [1, 1, 2, 2]
+
+
+def test_triggers_maintain_table_versions(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        versions, changed_at, now = get_table_versions_from_db(
+                ('person', 'application_status'))
+        assert versions == (None, None)
+        assert changed_at is None
+
+    setup_three_users(app)
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        versions, changed_at, now = get_table_versions_from_db(
+                ('person', 'application_status'))
+        assert versions[0] > 0 and versions[1] > 0
+        assert changed_at <= now
+
+        ApplicationStatus.query.one().status = 'Accepted'
+        database.session.commit()
+        updated_versions, _, _ = get_table_versions_from_db(
+                ('person', 'application_status'))
+        assert updated_versions[0] == versions[0]
+        assert updated_versions[1] > versions[1]
+
+
+def test_get_changes_from_db_pages(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        horizon = get_change_horizon_from_db()
+    setup_three_users(app)
+
+    with app.app_context():
+        first_changes, first_horizon = get_changes_from_db(horizon, 0, 2)
+        position, change_id, _ = first_changes[-1]
+        second_changes, _ = get_changes_from_db(position, change_id, 2)
+        third_changes, _ = get_changes_from_db(first_horizon, 0, 2)
+
+        assert [change[2] for change in first_changes + second_changes] == \
+               [1, 2, 3]
+        assert third_changes == []
+        assert get_change_horizon_from_db() == first_horizon
+
+
+def test_get_changes_from_db_waits_for_running_transactions(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+
+    with app.app_context():
+        if database.engine.dialect.name != 'postgresql':
+            pytest.skip('Transaction horizons are only used on PostgreSQL')
+
+        with database.engine.connect() as connection:
+            connection.execute(insert(Person).values(name='user4'))
+            changes, horizon = get_changes_from_db(0, 0, 10)
+            database.session.commit()
+            setup_application_status_for_user1_in_db(app)
+            connection.commit()
+
+        assert [person_id for _, _, person_id in changes] == [1, 2, 3]
+        later_changes, _ = get_changes_from_db(horizon, 0, 10)
+        assert [person_id for _, _, person_id in later_changes] == [4, 1]
+
+
+def test_delete_changes_before(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        assert ApplicationChange.query.count() == 4
+        newest_change_id = database.session.scalar(
+                select(func.max(ApplicationChange.change_id)))
+        assert delete_changes_before(
+                dt.datetime.now(dt.timezone.utc) -
+                dt.timedelta(days=1)) == 0
+        assert delete_changes_before(
+                dt.datetime.now(dt.timezone.utc) +
+                dt.timedelta(days=1)) == 1
+        assert sorted(change.person_id for change in
+                      ApplicationChange.query) == [1, 2, 3]
+        assert database.session.scalar(
+                select(func.max(ApplicationChange.change_id))) == \
+               newest_change_id
+
+
+def test_get_person_versions_from_db(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+
+    with app.app_context():
+        versions = get_person_versions_from_db([1, 2, 4])
+        assert sorted(versions) == [1, 2]
+        assert versions[1][0] == 1
+
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        updated_versions = get_person_versions_from_db([1, 2])
+        assert updated_versions[1] != versions[1]
+        assert updated_versions[2] == versions[2]
@@ -0,0 +1,84 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.extensions import database
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.repositories.applications_repository import \
+    get_availabilities_for_persons_from_db, \
+    get_competences_for_persons_from_db
+from app.repositories.availability_repository import \
+    get_available_person_ids_from_db
+from tests.utilities.utility_functions import capture_queries
+
+SEEDED_PERSONS = 5000
+
+
+@pytest.fixture
+def seeded_app(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        if database.engine.dialect.name != 'postgresql':
+            pytest.skip('Query plans are only checked on PostgreSQL')
+
+        database.session.execute(insert(CompetenceProfile), [
+            {'person_id': person_id, 'competence_id': person_id % 3 + 1,
+             'years_of_experience': person_id % 10}
+            for person_id in range(1, SEEDED_PERSONS + 1)])
+        database.session.execute(insert(Availability), [
+            {'person_id': person_id,
+             'from_date': dt.date(2024, 1, 1) + dt.timedelta(
+                     days=person_id % 300),
+             'to_date': dt.date(2024, 1, 3) + dt.timedelta(
+                     days=person_id % 300)}
+            for person_id in range(1, SEEDED_PERSONS + 1)])
+        database.session.commit()
+        database.session.execute(text('ANALYZE competence_profile'))
+        database.session.execute(text('ANALYZE availability'))
+        database.session.commit()
+
+    return app
+
+
+def explain(statement, parameters):
+    cursor = database.session.connection().connection.cursor()
+    cursor.execute(f'EXPLAIN {statement}', parameters)
+    return '\n'.join(row[0] for row in cursor.fetchall())
+
+
+def assert_repository_queries_use_index(app, repository_function, table):
+    with app.app_context():
+        with capture_queries(app) as statements:
+            repository_function([1, 2, 3])
+
+        assert len(statements) == 1
+        plan = explain(*statements[0])
+        assert f'Seq Scan on {table}' not in plan
+        assert 'Index' in plan
+
+
+def test_competences_query_uses_index(seeded_app):
+    assert_repository_queries_use_index(
+            seeded_app, get_competences_for_persons_from_db,
+            'competence_profile')
+
+
+def test_availabilities_query_uses_index(seeded_app):
+    assert_repository_queries_use_index(
+            seeded_app, get_availabilities_for_persons_from_db,
+            'availability')
+
+
+def test_availability_window_query_uses_gist_index(seeded_app):
+    with seeded_app.app_context():
+        for cover in (False, True):
+            with capture_queries(seeded_app) as statements:
+                get_available_person_ids_from_db(
+                        dt.date(2024, 3, 1), dt.date(2024, 3, 2), cover)
+
+            plan = explain(*statements[0])
+            assert 'Seq Scan on availability' not in plan
+            assert 'ix_availability_period' in plan
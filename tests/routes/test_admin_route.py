@@ -0,0 +1,74 @@
+from tests.utilities.status_codes import StatusCodes
+from tests.utilities.utility_functions import \
+    generate_token_for_person_id_1, generate_token_for_recruiter, \
+    post_request_applications_endpoint, \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, setup_three_users
+
+
+def test_get_cache_stats(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    post_request_applications_endpoint(test_client, token)
+    post_request_applications_endpoint(test_client, token)
+
+    response = test_client.get('/api/admin/cache',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['hits'] == 1
+    assert response.json['misses'] == 1
+    assert response.json['entries'] == 1
+
+
+def test_invalidate_cache(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    post_request_applications_endpoint(test_client, token)
+
+    response = test_client.delete(
+            '/api/admin/cache', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['entries'] == 0
+    assert response.json['invalidations'] == 1
+
+
+def test_invalidate_cache_unauthorized(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = test_client.delete(
+            '/api/admin/cache', headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json['error'] == 'UNAUTHORIZED'
+
+
+def test_get_metrics(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    post_request_applications_endpoint(test_client, token)
+
+    response = test_client.get('/api/admin/metrics',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['applications_cache']['misses'] == 1
+    assert response.json['claims_cache']['hits'] == 1
+    assert response.json['database_pools']['default']['checkouts'] >= 1
+    assert response.json['logging']['dropped'] == 0
+    assert not response.json['replica']['enabled']
+    assert response.json['events']['subscribers'] == 0
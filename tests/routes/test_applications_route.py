@@ -1,11 +1,19 @@
+import json
+import time
 from unittest.mock import patch
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.extensions import applications_cache, database, event_broker
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.services.applications_service import compile_applications
+from app.utilities.pagination import encode_change_token
 from tests.utilities.status_codes import StatusCodes
 from tests.utilities.utility_functions import assert_application_details, \
-    generate_token_for_person_id_1, generate_token_for_recruiter, \
-    post_request_applications_endpoint, \
+    capture_queries, generate_token_for_person_id_1, \
+    generate_token_for_recruiter, post_request_applications_endpoint, \
+    setup_application_status_for_user1_in_db, \
     setup_application_statuses_for_all_users, \
     setup_availabilities_for_all_users, setup_availability_for_user2_in_db, \
     setup_availability_for_user3_in_db, \
@@ -125,3 +133,810 @@ def test_get_applications_sqlalchemy_error(mock_fetch, app_with_client):
 
     assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
     assert response.json['error'] == 'COULD_NOT_FETCH_APPLICATIONS'
+
+
+def test_get_applications_paginated(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'limit': 2})
+
+    assert response.status_code == StatusCodes.OK
+    first_page = response.json
+    assert len(first_page['applications']) == 2
+    assert first_page['errors'] == []
+    assert first_page['applications'][0]['personal_info']['name'] == 'user1'
+    assert first_page['next_cursor'] is not None
+
+    response = post_request_applications_endpoint(
+            test_client, token,
+            {'limit': 2, 'cursor': first_page['next_cursor']})
+
+    assert response.status_code == StatusCodes.OK
+    second_page = response.json
+    assert len(second_page['applications']) == 1
+    assert_application_details(
+            second_page['applications'][0], 'user3', 's3', 3, 'Pending',
+            [],
+            [{'from_date': '2024-03-03', 'to_date': '2024-03-04'}])
+    assert second_page['next_cursor'] is None
+
+
+def test_get_applications_paginated_partial_success(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'limit': 1})
+
+    assert response.status_code == StatusCodes.PARTIAL_CONTENT
+    assert response.json['applications'] == []
+    assert response.json['errors'] == [
+        {'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'}]
+    assert response.json['next_cursor'] is not None
+
+
+def test_get_applications_paginated_invalid_parameters(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    for query_string in ({'limit': 0}, {'limit': 'ten'}, {'limit': 100000},
+                         {'cursor': 'not-a-cursor'}):
+        response = post_request_applications_endpoint(test_client, token,
+                                                      query_string)
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json['error'] == 'INVALID_PAGINATION_PARAMETERS'
+
+
+def test_get_applications_paginated_not_found(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'limit': 10})
+
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json['error'] == 'NO_APPLICATION_STATUSES_FOUND'
+
+
+def test_get_applications_stream(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+    app.config['APPLICATIONS_STREAM_CHUNK_SIZE'] = 2
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'stream': 1})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.is_streamed
+    assert response.mimetype == 'application/json'
+
+    applications = response.json
+    assert [application['personal_info']['name'] for application in
+            applications] == ['user1', 'user2', 'user3']
+    assert_application_details(
+            applications[1], 'user2', 's2', 2, 'Pending',
+            [{'competence_id': 2, 'years_of_experience': '2.00'}],
+            [{'from_date': '2024-03-02', 'to_date': '2024-03-03'}])
+
+
+def test_get_applications_stream_ndjson_with_errors(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+
+    token = generate_token_for_recruiter(app)
+    response = test_client.get('/api/applications/',
+                               headers={'Authorization': f'Bearer {token}',
+                                        'Accept': 'application/x-ndjson'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = response.get_data(as_text=True).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records[0] == {'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'}
+    assert records[1]['personal_info']['name'] == 'user2'
+    assert records[2]['personal_info']['name'] == 'user3'
+
+
+def test_get_applications_stream_not_found(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'stream': 1})
+
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json['error'] == 'NO_APPLICATION_STATUSES_FOUND'
+
+
+@patch('app.routes.applications_route.compile_applications',
+       wraps=compile_applications)
+def test_get_applications_cached(mock_compile, app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    first_response = post_request_applications_endpoint(test_client, token)
+    second_response = post_request_applications_endpoint(test_client, token)
+
+    assert second_response.status_code == StatusCodes.OK
+    assert second_response.get_data() == first_response.get_data()
+    assert mock_compile.call_count == 1
+
+    applications_cache.invalidate()
+    post_request_applications_endpoint(test_client, token)
+    assert mock_compile.call_count == 2
+
+
+@patch('app.routes.applications_route.compile_applications')
+def test_get_applications_errors_not_cached(mock_fetch, app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    mock_fetch.side_effect = SQLAlchemyError
+    post_request_applications_endpoint(test_client, token)
+    post_request_applications_endpoint(test_client, token)
+
+    assert mock_fetch.call_count == 2
+
+
+@patch('app.routes.applications_route.compile_applications',
+       wraps=compile_applications)
+def test_get_applications_not_modified(mock_compile, app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    assert mock_compile.call_count == 1
+
+    response = test_client.get('/api/applications/',
+                               headers={'Authorization': f'Bearer {token}',
+                                        'If-None-Match': etag})
+
+    assert response.status_code == StatusCodes.NOT_MODIFIED
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+    assert mock_compile.call_count == 1
+
+
+def test_get_applications_not_modified_since(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+    assert 'Last-Modified' not in response.headers
+
+    time.sleep(1.1)
+    response = post_request_applications_endpoint(test_client, token)
+    last_modified = response.headers['Last-Modified']
+
+    headers = {'Authorization': f'Bearer {token}',
+               'If-Modified-Since': last_modified}
+    response = test_client.get('/api/applications/', headers=headers)
+    assert response.status_code == StatusCodes.NOT_MODIFIED
+
+    response = test_client.get('/api/applications/', headers=dict(
+            headers, **{'If-None-Match': '"other"'}))
+    assert response.status_code == StatusCodes.OK
+
+    setup_application_status_for_user1_in_db(app)
+    response = test_client.get('/api/applications/', headers=headers)
+    assert response.status_code == StatusCodes.OK
+
+
+def test_get_applications_etag_changes_with_data(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    first_response = post_request_applications_endpoint(test_client, token)
+    page_response = post_request_applications_endpoint(test_client, token,
+                                                       {'limit': 2})
+    setup_application_status_for_user1_in_db(app)
+    second_response = post_request_applications_endpoint(test_client, token)
+
+    assert first_response.headers['ETag'] != page_response.headers['ETag']
+    assert first_response.headers['ETag'] != second_response.headers['ETag']
+    assert len(second_response.json) == 4
+
+
+def test_get_applications_stream_without_etag(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'stream': 1})
+
+    assert response.status_code == StatusCodes.OK
+    assert 'ETag' not in response.headers
+
+
+def test_get_applications_filtered(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(
+            test_client, token, {'status': 'Pending', 'competence_id': 1,
+                                 'min_years': 3,
+                                 'available_from': '2024-03-04',
+                                 'available_to': '2024-03-05'})
+
+    assert response.status_code == StatusCodes.OK
+    assert [application['personal_info']['person_id'] for application in
+            response.json] == [1]
+
+
+def test_get_applications_filtered_no_match(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'status': 'Accepted'})
+    stream_response = post_request_applications_endpoint(
+            test_client, token, {'status': 'Accepted', 'stream': 1})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == []
+    assert stream_response.status_code == StatusCodes.OK
+    assert json.loads(stream_response.get_data()) == []
+
+
+def test_get_applications_invalid_filter(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token,
+                                                  {'min_years': 'many'})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_FILTER_PARAMETERS'}
+
+
+def test_get_available_applicants(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    overlap_response = test_client.get(
+            '/api/applications/available',
+            headers={'Authorization': f'Bearer {token}'},
+            query_string={'from_date': '2024-03-02'})
+    cover_response = test_client.get(
+            '/api/applications/available',
+            headers={'Authorization': f'Bearer {token}'},
+            query_string={'from_date': '2024-03-02', 'to_date': '2024-03-03',
+                          'match': 'cover'})
+
+    assert overlap_response.status_code == StatusCodes.OK
+    assert overlap_response.json == {'person_ids': [1, 2]}
+    assert cover_response.json == {'person_ids': [2]}
+
+
+def test_get_available_applicants_invalid_window(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_recruiter(app)
+    response = test_client.get(
+            '/api/applications/available',
+            headers={'Authorization': f'Bearer {token}'},
+            query_string={'from_date': '2024-03-03', 'to_date': '2024-03-02'})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_AVAILABILITY_PARAMETERS'}
+
+
+def test_get_matching_applicants(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    response = test_client.get(
+            '/api/applications/matches',
+            headers={'Authorization': f'Bearer {token}'},
+            query_string={'requirement': ['1:2:1.5'], 'limit': 5})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'matches': [
+        {'person_id': 1, 'score': 3.0, 'experience': {'1': 4.0}}]}
+
+
+def test_get_matching_applicants_invalid_requirement(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_recruiter(app)
+    response = test_client.get(
+            '/api/applications/matches',
+            headers={'Authorization': f'Bearer {token}'},
+            query_string={'requirement': '1:-2'})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_MATCHING_PARAMETERS'}
+
+
+def test_get_applications_from_summaries(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    live_response = post_request_applications_endpoint(test_client, token)
+    app.config['APPLICATIONS_READ_MODEL'] = 'summary'
+    summary_response = post_request_applications_endpoint(test_client, token)
+
+    assert summary_response.status_code == StatusCodes.OK
+    assert summary_response.get_data() == live_response.get_data()
+    assert summary_response.headers['X-Summary-Stale'] == 'false'
+    assert int(summary_response.headers['X-Summary-Age']) >= 0
+
+    response = test_client.get(
+            '/api/applications/',
+            headers={'Authorization': f'Bearer {token}',
+                     'If-None-Match': summary_response.headers['ETag']})
+    assert response.status_code == StatusCodes.NOT_MODIFIED
+
+
+def test_get_applications_from_summaries_partial_success(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    live_response = post_request_applications_endpoint(test_client, token)
+    app.config['APPLICATIONS_READ_MODEL'] = 'summary'
+    summary_response = post_request_applications_endpoint(test_client, token)
+
+    assert summary_response.status_code == StatusCodes.PARTIAL_CONTENT
+    assert summary_response.get_data() == live_response.get_data()
+
+
+def test_get_applications_from_summaries_no_statuses(app_with_client):
+    app, test_client = app_with_client
+    app.config['APPLICATIONS_READ_MODEL'] = 'summary'
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json == {'error': 'NO_APPLICATION_STATUSES_FOUND'}
+
+
+def get_request_application_endpoint(test_client, token, path,
+                                     query_string=None, etag=None):
+    headers = {'Authorization': f'Bearer {token}'}
+    if etag:
+        headers['If-None-Match'] = etag
+    return test_client.get(f'/api/applications/{path}', headers=headers,
+                           query_string=query_string)
+
+
+def test_get_application_matches_list(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    applications = post_request_applications_endpoint(test_client, token).json
+    with capture_queries(app) as statements:
+        response = get_request_application_endpoint(test_client, token, 1)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == applications[0]
+    assert len(statements) == 3
+    assert 'ETag' in response.headers
+
+
+def test_get_application_cached_and_not_modified(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    first_response = get_request_application_endpoint(test_client, token, 2)
+    with capture_queries(app) as statements:
+        second_response = get_request_application_endpoint(test_client,
+                                                           token, 2)
+    not_modified_response = get_request_application_endpoint(
+            test_client, token, 2, etag=first_response.headers['ETag'])
+
+    assert len(statements) == 2
+    assert second_response.get_data() == first_response.get_data()
+    assert not_modified_response.status_code == StatusCodes.NOT_MODIFIED
+    assert first_response.headers['ETag'] != get_request_application_endpoint(
+            test_client, token, 3).headers['ETag']
+
+
+def test_get_application_version_per_applicant(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    first_response = get_request_application_endpoint(test_client, token, 2)
+
+    with app.app_context():
+        ApplicationStatus.query.filter_by(person_id=3).one().status = \
+            'Accepted'
+        database.session.commit()
+
+    with capture_queries(app) as statements:
+        other_response = get_request_application_endpoint(
+                test_client, token, 2, etag=first_response.headers['ETag'])
+
+    with app.app_context():
+        ApplicationStatus.query.filter_by(person_id=2).one().status = \
+            'Accepted'
+        database.session.commit()
+
+    changed_response = get_request_application_endpoint(
+            test_client, token, 2, etag=first_response.headers['ETag'])
+
+    assert other_response.status_code == StatusCodes.NOT_MODIFIED
+    assert len(statements) == 2
+    assert changed_response.status_code == StatusCodes.OK
+    assert changed_response.json['status'] == 'Accepted'
+
+
+def test_get_application_not_found(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+
+    token = generate_token_for_recruiter(app)
+    missing_response = get_request_application_endpoint(test_client, token,
+                                                        4)
+    unavailable_response = get_request_application_endpoint(test_client,
+                                                            token, 1)
+
+    assert missing_response.status_code == StatusCodes.NOT_FOUND
+    assert missing_response.json == {'error': 'APPLICATION_NOT_FOUND: 4'}
+    assert unavailable_response.status_code == StatusCodes.NOT_FOUND
+    assert unavailable_response.json == {
+        'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'}
+
+
+def test_get_application_unauthorized(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_person_id_1(app)
+    response = get_request_application_endpoint(test_client, token, 1)
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+@patch('app.routes.applications_route.compile_application_details')
+def test_get_application_sqlalchemy_error(mock_compile, app_with_client):
+    app, test_client = app_with_client
+    mock_compile.side_effect = SQLAlchemyError
+
+    token = generate_token_for_recruiter(app)
+    response = get_request_application_endpoint(test_client, token, 1)
+
+    assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
+    assert response.json == {'error': 'COULD_NOT_FETCH_APPLICATION'}
+
+
+def test_get_application_batch(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+    setup_competence_profiles_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    applications = post_request_applications_endpoint(
+            test_client, token).json['applications']
+    get_request_application_endpoint(test_client, token, 2)
+    response = get_request_application_endpoint(
+            test_client, token, 'batch', {'person_ids': '3,2'})
+    partial_response = get_request_application_endpoint(
+            test_client, token, 'batch', {'person_ids': '1,3,5'})
+    error_response = get_request_application_endpoint(
+            test_client, token, 'batch', {'person_ids': '5'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == [applications[1], applications[0]]
+    assert partial_response.status_code == StatusCodes.PARTIAL_CONTENT
+    assert partial_response.json == {
+        'applications': [applications[1]],
+        'errors': [{'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'},
+                   {'error': 'APPLICATION_NOT_FOUND: 5'}]}
+    assert error_response.status_code == StatusCodes.NOT_FOUND
+
+
+def test_get_application_batch_invalid_parameters(app_with_client):
+    app, test_client = app_with_client
+    app.config['APPLICATIONS_MAX_PAGE_SIZE'] = 2
+
+    token = generate_token_for_recruiter(app)
+    for person_ids in (None, '', 'a', '1,,2', '0', '1,2,3'):
+        response = get_request_application_endpoint(
+                test_client, token, 'batch', {'person_ids': person_ids})
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json == {'error': 'INVALID_BATCH_PARAMETERS'}
+
+
+def test_get_application_changes(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    start_response = get_request_application_endpoint(test_client, token,
+                                                      'changes')
+    since = start_response.json['next_since']
+    unchanged_response = get_request_application_endpoint(
+            test_client, token, 'changes', {'since': since})
+
+    with app.app_context():
+        ApplicationStatus.query.filter_by(person_id=2).one().status = \
+            'Accepted'
+        Availability.query.filter_by(person_id=3).delete()
+        database.session.commit()
+
+    response = get_request_application_endpoint(
+            test_client, token, 'changes', {'since': since})
+    first_page = get_request_application_endpoint(
+            test_client, token, 'changes', {'since': since, 'limit': 1})
+    second_page = get_request_application_endpoint(
+            test_client, token, 'changes',
+            {'since': first_page.json['next_since'], 'limit': 1})
+    caught_up_response = get_request_application_endpoint(
+            test_client, token, 'changes',
+            {'since': response.json['next_since']})
+
+    assert start_response.status_code == StatusCodes.OK
+    assert start_response.json['applications'] == []
+    assert unchanged_response.json['applications'] == []
+    assert unchanged_response.json['has_more'] is False
+
+    assert response.status_code == StatusCodes.OK
+    assert [application['status'] for application in
+            response.json['applications']] == ['Accepted']
+    assert response.json['errors'] == [
+        {'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 3'}]
+    assert response.json['has_more'] is False
+    assert first_page.json['has_more'] is True
+    assert len(first_page.json['applications']) == 1
+    assert second_page.json['has_more'] is False
+    assert len(second_page.json['errors']) == 1
+    assert caught_up_response.json['applications'] == []
+    assert caught_up_response.json['errors'] == []
+
+
+def test_get_applications_etag_changes_on_update(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    token = generate_token_for_recruiter(app)
+    first_response = post_request_applications_endpoint(test_client, token)
+    with app.app_context():
+        ApplicationStatus.query.filter_by(person_id=1).one().status = \
+            'Rejected'
+        database.session.commit()
+    second_response = post_request_applications_endpoint(test_client, token)
+
+    assert first_response.headers['ETag'] != second_response.headers['ETag']
+    assert [application['status'] for application in second_response.json
+            if application['personal_info']['person_id'] == 1] == \
+           ['Rejected']
+
+
+def test_get_application_changes_invalid_and_expired_token(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_recruiter(app)
+    for query_string in ({'since': 'not-a-token'}, {'since': ''},
+                         {'since': encode_change_token(1, 0, 0),
+                          'limit': '0'}):
+        response = get_request_application_endpoint(
+                test_client, token, 'changes', query_string)
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json == {'error': 'INVALID_CHANGES_PARAMETERS'}
+
+    expired_since = encode_change_token(
+            1, 0, time.time() - 8 * 24 * 60 * 60)
+    response = get_request_application_endpoint(
+            test_client, token, 'changes', {'since': expired_since})
+    assert response.status_code == StatusCodes.GONE
+    assert response.json == {'error': 'CHANGES_TOKEN_EXPIRED'}
+
+
+def read_event(chunks):
+    return json.loads(next(chunks).split('data: ', 1)[1])
+
+
+def test_get_application_events(app_with_client):
+    app, test_client = app_with_client
+    event_broker.backend = 'memory'
+    event_broker.max_subscribers = 1
+    app.config['APPLICATION_EVENTS_HEARTBEAT_INTERVAL'] = 0.01
+
+    token = generate_token_for_recruiter(app)
+    response = get_request_application_endpoint(test_client, token, 'events')
+    busy_response = get_request_application_endpoint(test_client, token,
+                                                     'events')
+    chunks = (chunk.decode() for chunk in response.response)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.mimetype == 'text/event-stream'
+    assert 'since' in read_event(chunks)
+    assert next(chunks) == ': keep-alive\n\n'
+    event_broker.publish({'type': 'status_changed', 'person_id': 1,
+                          'status': 'Accepted'})
+    assert next(chunks) == 'event: status_changed\ndata: {"type":' \
+                           '"status_changed","person_id":1,' \
+                           '"status":"Accepted"}\n\n'
+    assert busy_response.status_code == StatusCodes.SERVICE_UNAVAILABLE
+    assert busy_response.json == {'error': 'TOO_MANY_SUBSCRIBERS'}
+
+    response.close()
+    assert event_broker.stats()['subscribers'] == 0
+
+
+def test_get_application_events_ends_after_max_duration(app_with_client):
+    app, test_client = app_with_client
+    event_broker.backend = 'memory'
+    event_broker.max_subscribers = 1
+    app.config['APPLICATION_EVENTS_MAX_DURATION'] = 0.05
+
+    token = generate_token_for_recruiter(app)
+    response = get_request_application_endpoint(test_client, token, 'events')
+
+    assert response.get_data(as_text=True).startswith('retry: 3000\n')
+    assert event_broker.stats()['subscribers'] == 0
+
+
+def test_get_application_events_unauthorized(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_person_id_1(app)
+    response = get_request_application_endpoint(test_client, token, 'events')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+def test_get_applications_export(app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+    app.config['APPLICATIONS_EXPORT_CHUNK_SIZE'] = 2
+
+    token = generate_token_for_recruiter(app)
+    response = get_request_application_endpoint(
+            test_client, token, 'export', {'exclude': 'pnr,email'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == \
+           'attachment; filename=applications.csv'
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'application_status_id,person_id,status,name,' \
+                       'surname,competences,availabilities'
+    assert [line.split(',')[3] for line in lines[1:]] == \
+           ['user1', 'user2', 'user3']
+
+
+def test_get_applications_export_invalid_parameters(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = get_request_application_endpoint(
+            test_client, token, 'export', {'format': 'xlsx'})
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'UNSUPPORTED_EXPORT_FORMAT'
+
+    response = get_request_application_endpoint(
+            test_client, token, 'export', {'exclude': 'name'})
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'INVALID_EXPORT_COLUMNS'
+
+
+@patch('app.routes.applications_route.export_applications')
+def test_get_applications_export_sqlalchemy_error(mock_export,
+                                                  app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    def failing_export():
+        raise SQLAlchemyError
+        yield b''
+
+    mock_export.return_value = failing_export()
+    response = get_request_application_endpoint(test_client, token, 'export')
+
+    assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
+    assert response.json['error'] == 'COULD_NOT_EXPORT_APPLICATIONS'
+
+
+def test_get_applications_export_unauthorized(app_with_client):
+    app, test_client = app_with_client
+
+    token = generate_token_for_person_id_1(app)
+    response = get_request_application_endpoint(test_client, token, 'export')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+@patch('app.routes.applications_route.start_background_prune')
+def test_prune_change_log_after_authentication(mock_prune, app_with_client):
+    app, test_client = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    response = test_client.get('/api/applications/')
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    token = generate_token_for_person_id_1(app)
+    response = post_request_applications_endpoint(test_client, token)
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    mock_prune.assert_not_called()
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+    assert response.status_code == StatusCodes.OK
+    mock_prune.assert_called_once_with(app)
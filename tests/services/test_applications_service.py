@@ -3,8 +3,13 @@ from unittest.mock import patch
 import pytest
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
-from app.services.applications_service import compile_applications
-from tests.utilities.utility_functions import \
+from app.extensions import database
+from app.models.person import Person
+from app.repositories.applications_repository import get_persons_from_db
+from app.services.applications_service import compile_applications, \
+    get_applications_version, get_compile_workers, stream_applications
+from tests.utilities.utility_functions import capture_queries, \
+    setup_application_status_for_user1_in_db, \
     setup_application_statuses_for_all_users, \
     setup_availabilities_for_all_users, \
     setup_availability_for_user2_in_db, \
@@ -37,6 +42,7 @@ def test_compile_applications_partial_success(app_with_client):
         errors, applications = compile_applications()
         assert len(errors) == 1
         assert len(applications) == 2
+        assert errors[0]['error'] == 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'
 
 
 def test_compile_applications_only_errors(app_with_client):
@@ -76,3 +82,110 @@ def test_compile_applications_sqlalchemy_error_on_application_status(
 
         assert isinstance(exception.value, SQLAlchemyError)
         assert mock_fetch.call_count == 1
+
+
+@patch('app.services.applications_service.get_persons_from_db')
+def test_compile_applications_missing_person(mock_fetch, app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        applicants = get_persons_from_db([1, 2])
+        mock_fetch.return_value = applicants
+        errors, applications = compile_applications()
+        assert errors == [{'error': 'PERSON_NOT_FOUND: 3'}]
+        assert len(applications) == 2
+
+
+def test_compile_applications_constant_number_of_queries(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        with capture_queries(app) as statements:
+            compile_applications()
+        assert len(statements) == 4
+
+
+@pytest.mark.parametrize('compile_mode', ['serial', 'threaded'])
+def test_compile_modes_match_bulk(app_with_client, compile_mode):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        expected = compile_applications()
+        app.config['APPLICATIONS_COMPILE_MODE'] = compile_mode
+        app.config['APPLICATIONS_COMPILE_WORKERS'] = 2
+        assert compile_applications() == expected
+        assert list(stream_applications(1)) == \
+               expected[0] + expected[1]
+
+
+def test_compile_workers_capped_by_pool(app_with_client):
+    app, _ = app_with_client
+    app.config.update({'SQLALCHEMY_POOL_SIZE': 5,
+                       'SQLALCHEMY_MAX_OVERFLOW': 2, 'WORKER_CONCURRENCY': 3,
+                       'APPLICATIONS_COMPILE_WORKERS': 8})
+
+    with app.app_context():
+        assert get_compile_workers() == 4
+        app.config['APPLICATIONS_COMPILE_WORKERS'] = 2
+        assert get_compile_workers() == 2
+        app.config['WORKER_CONCURRENCY'] = 10
+        assert get_compile_workers() == 1
+
+
+def test_stream_applications_inline_errors(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+
+    with app.app_context():
+        records = list(stream_applications(chunk_size=2))
+        assert records[0] == {
+            'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'}
+        assert records[1]['personal_info']['person_id'] == 2
+        assert records[2]['personal_info']['person_id'] == 3
+
+
+def test_stream_applications_no_applications(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with pytest.raises(NoResultFound):
+            list(stream_applications(chunk_size=2))
+
+
+def test_get_applications_version(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+
+    with app.app_context():
+        with capture_queries(app) as statements:
+            version = get_applications_version()
+        assert len(statements) == 1
+        assert get_applications_version() == version
+
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        assert get_applications_version() != version
+        version = get_applications_version()
+
+        person = database.session.get(Person, 2)
+        person.email = 'changed@example.com'
+        database.session.commit()
+
+        assert get_applications_version() != version
@@ -0,0 +1,104 @@
+import datetime as dt
+
+import pytest
+
+from app.extensions import database
+from app.models.availability import Availability
+from app.repositories.availability_repository import \
+    get_available_person_ids_from_db
+from app.services.availability_service import find_available_person_ids, \
+    get_availability_tree
+from tests.utilities.utility_functions import \
+    setup_availabilities_for_all_users, setup_three_users
+
+WINDOWS = [
+    (dt.date(2024, 3, 2), dt.date(2024, 3, 2), False, [1, 2]),
+    (dt.date(2024, 3, 4), dt.date(2024, 3, 10), False, [1, 3]),
+    (dt.date(2024, 2, 1), dt.date(2024, 2, 28), False, []),
+    (dt.date(2024, 3, 2), dt.date(2024, 3, 3), True, [2]),
+    (dt.date(2024, 3, 1), dt.date(2024, 3, 5), True, [])
+]
+
+
+def person_ids_from_tree(from_date, to_date, cover):
+    tree = get_availability_tree()
+    start, end = from_date.toordinal(), to_date.toordinal()
+    if cover:
+        return sorted(set(tree.covering(start, end)))
+    return sorted(set(tree.overlapping(start, end)))
+
+
+def test_find_available_person_ids(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        for from_date, to_date, cover, person_ids in WINDOWS:
+            assert find_available_person_ids(from_date, to_date, cover) == \
+                   person_ids
+            assert person_ids_from_tree(from_date, to_date, cover) == \
+                   person_ids
+
+
+def test_database_query_matches_tree(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        if database.engine.dialect.name != 'postgresql':
+            pytest.skip('Range queries are only run on PostgreSQL')
+
+        for from_date, to_date, cover, person_ids in WINDOWS:
+            assert get_available_person_ids_from_db(
+                    from_date, to_date, cover) == person_ids
+
+
+def test_availability_tree_rebuilt_on_change(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        first_tree = get_availability_tree()
+        assert get_availability_tree() is first_tree
+
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        second_tree = get_availability_tree()
+        assert second_tree is not first_tree
+        assert second_tree.size == 2 * first_tree.size
+
+
+def test_availability_tree_rebuilt_on_update(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        assert person_ids_from_tree(
+                dt.date(2024, 6, 1), dt.date(2024, 6, 1), False) == []
+
+        availability = Availability.query.filter_by(person_id=3).one()
+        availability.to_date = dt.date(2024, 6, 30)
+        database.session.commit()
+
+        assert person_ids_from_tree(
+                dt.date(2024, 6, 1), dt.date(2024, 6, 1), False) == [3]
+
+
+def test_find_available_person_ids_swapped_period(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+
+    with app.app_context():
+        database.session.add(Availability(
+                1, dt.date(2024, 5, 10), dt.date(2024, 5, 1)))
+        database.session.commit()
+
+        assert find_available_person_ids(
+                dt.date(2024, 5, 2), dt.date(2024, 5, 3), True) == [1]
+        assert person_ids_from_tree(
+                dt.date(2024, 5, 2), dt.date(2024, 5, 3), True) == [1]
@@ -0,0 +1,48 @@
+import datetime as dt
+import threading
+
+from sqlalchemy import update
+
+from app.extensions import database
+from app.models.application_change import ApplicationChange
+from app.services.change_service import start_background_prune
+from tests.utilities.utility_functions import \
+    setup_application_status_for_user1_in_db, setup_three_users
+
+
+def wait_for_background_prune():
+    for thread in threading.enumerate():
+        if thread.name == 'change-prune':
+            thread.join()
+
+
+def test_start_background_prune(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_status_for_user1_in_db(app)
+    app.config['APPLICATION_CHANGES_PRUNE_INTERVAL'] = 3600
+
+    with app.app_context():
+        database.session.execute(update(ApplicationChange).values(
+                changed_at=dt.datetime.now(dt.timezone.utc) -
+                dt.timedelta(days=30)))
+        database.session.commit()
+
+    assert not start_background_prune(app)
+    app.extensions['change_pruned_at'] -= 3600
+    assert start_background_prune(app)
+    assert not start_background_prune(app)
+    wait_for_background_prune()
+
+    with app.app_context():
+        assert sorted(change.person_id for change in
+                      ApplicationChange.query) == [1, 2, 3]
+
+
+def test_start_background_prune_disabled(app_with_client):
+    app, _ = app_with_client
+    app.config['APPLICATION_CHANGES_PRUNE_INTERVAL'] = 0
+
+    assert not start_background_prune(app)
+    app.extensions['change_pruned_at'] -= 3600
+    assert not start_background_prune(app)
@@ -0,0 +1,88 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.services.export_service import export_applications
+from tests.utilities.utility_functions import \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, \
+    setup_competence_profiles_for_all_users, setup_three_users
+
+
+def setup_applications(app):
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+
+def test_export_applications_csv(app_with_client):
+    app, _ = app_with_client
+    setup_applications(app)
+
+    with app.app_context():
+        chunks = list(export_applications('csv', 2, ['email']))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+    assert rows[0] == ['application_status_id', 'person_id', 'status',
+                       'name', 'surname', 'pnr', 'competences',
+                       'availabilities']
+    assert rows[1][1:] == ['1', 'Pending', 'user1', 's1', '1',
+                           '1:1.00;1:4.00',
+                           '2024-03-01/2024-03-02;2024-03-04/2024-03-05']
+    assert rows[3][1:] == ['3', 'Pending', 'user3', 's3', '3', '',
+                           '2024-03-03/2024-03-04']
+
+
+def test_export_applications_csv_empty(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        chunks = list(export_applications('csv', 2, ['pnr', 'email']))
+
+    assert b''.join(chunks) == b'application_status_id,person_id,status,' \
+                               b'name,surname,competences,availabilities\r\n'
+
+
+@pytest.mark.parametrize('export_format', ['parquet', 'arrow'])
+def test_export_applications_columnar(app_with_client, export_format):
+    pyarrow = pytest.importorskip('pyarrow')
+    parquet = pytest.importorskip('pyarrow.parquet')
+    app, _ = app_with_client
+    setup_applications(app)
+
+    with app.app_context():
+        data = b''.join(export_applications(export_format, 2, ['pnr']))
+
+    if export_format == 'parquet':
+        file = parquet.ParquetFile(io.BytesIO(data))
+        assert file.num_row_groups == 2
+        table = file.read()
+    else:
+        table = pyarrow.ipc.open_stream(data).read_all()
+
+    assert table.column_names == [
+        'application_status_id', 'person_id', 'status', 'name', 'surname',
+        'email', 'competences', 'availabilities']
+    applications = table.to_pylist()
+    assert [application['name'] for application in applications] == \
+           ['user1', 'user2', 'user3']
+    assert applications[1]['competences'] == [
+        {'competence_id': 2, 'years_of_experience': Decimal('2.00')}]
+    assert applications[1]['availabilities'] == [
+        {'from_date': date(2024, 3, 2), 'to_date': date(2024, 3, 3)}]
+    assert applications[2]['competences'] == []
+
+
+def test_export_applications_invalid_parameters(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with pytest.raises(ValueError, match='UNSUPPORTED_EXPORT_FORMAT'):
+            export_applications('xlsx', 2)
+        with pytest.raises(ValueError, match='INVALID_EXPORT_COLUMNS'):
+            export_applications('csv', 2, ['name'])
@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.competence_profile import CompetenceProfile
+from app.repositories.competence_repository import \
+    get_competence_profile_rows_from_db
+from app.services.matching_service import find_matches, \
+    get_competence_matrix
+from tests.utilities.utility_functions import \
+    remove_competence_profiles_from_db, \
+    setup_application_statuses_for_all_users, \
+    setup_competence_profiles_for_all_users, setup_three_users
+
+
+def setup_applicants(app):
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+
+def test_find_matches(app_with_client):
+    app, _ = app_with_client
+    setup_applicants(app)
+
+    with app.app_context():
+        assert find_matches({1: 2}, {}, 10) == [
+            {'person_id': 1, 'score': 2.0, 'experience': {1: 4.0}}]
+        assert find_matches({2: 1}, {2: 0.5}, 10) == [
+            {'person_id': 2, 'score': 1.0, 'experience': {2: 2.0}}]
+        assert find_matches({1: 1, 2: 1}, {}, 10) == []
+
+
+def test_find_matches_only_applicants(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        assert find_matches({1: 2}, {}, 10) == []
+
+        database.session.add(ApplicationStatus(person_id=1))
+        database.session.commit()
+        assert [match['person_id'] for match in
+                find_matches({1: 2}, {}, 10)] == [1]
+
+        ApplicationStatus.query.filter_by(person_id=1).delete()
+        database.session.commit()
+        assert find_matches({1: 2}, {}, 10) == []
+
+
+@patch('app.services.matching_service.get_competence_profile_rows_from_db',
+       wraps=get_competence_profile_rows_from_db)
+def test_competence_matrix_updated_incrementally(mock_fetch,
+                                                 app_with_client):
+    app, _ = app_with_client
+    setup_applicants(app)
+
+    with app.app_context():
+        first_matrix = get_competence_matrix()
+        assert get_competence_matrix() is first_matrix
+
+        database.session.add(CompetenceProfile(person_id=3, competence_id=1,
+                                               years_of_experience=5))
+        database.session.commit()
+        second_matrix = get_competence_matrix()
+        assert mock_fetch.call_args_list[-1].args == ([3],)
+        assert second_matrix.top({1: 2}, {}, 10) == [(1, 2.0), (3, 2.0)]
+        assert first_matrix.top({1: 2}, {}, 10) == [(1, 2.0)]
+
+        profile = CompetenceProfile.query.filter_by(person_id=3).one()
+        profile.years_of_experience = 1
+        database.session.commit()
+        third_matrix = get_competence_matrix()
+        assert mock_fetch.call_args_list[-1].args == ([3],)
+        assert third_matrix.top({1: 2}, {}, 10) == [(1, 2.0)]
+
+    assert mock_fetch.call_count == 3
+
+
+def test_competence_matrix_updated_on_removal(app_with_client):
+    app, _ = app_with_client
+    setup_applicants(app)
+
+    with app.app_context():
+        assert len(find_matches({1: 0}, {}, 10)) == 1
+
+    remove_competence_profiles_from_db(app)
+
+    with app.app_context():
+        assert find_matches({1: 0}, {}, 10) == []
@@ -0,0 +1,109 @@
+import json
+import threading
+
+from app.models.application_summary import ApplicationSummary
+from app.services.summary_service import get_fresh_summary_state, \
+    read_application_summaries, refresh_application_summaries, \
+    refresh_stale_summaries
+from tests.utilities.utility_functions import \
+    setup_application_status_for_user1_in_db, \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, setup_availability_for_user2_in_db, \
+    setup_availability_for_user3_in_db, \
+    setup_competence_profiles_for_all_users, setup_three_users
+
+
+def wait_for_background_refresh():
+    for thread in threading.enumerate():
+        if thread.name == 'summary-refresh':
+            thread.join()
+
+
+def test_refresh_application_summaries(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availability_for_user2_in_db(app)
+    setup_availability_for_user3_in_db(app)
+    setup_competence_profiles_for_all_users(app)
+
+    with app.app_context():
+        state = refresh_application_summaries()
+        errors, applications = read_application_summaries()
+
+        assert state.data_version
+        assert ApplicationSummary.query.count() == 3
+        assert [json.loads(error) for error in errors] == [
+            {'error': 'NO_AVAILABILITIES_FOUND_FOR_PERSON: 1'}]
+        assert [json.loads(application)['personal_info']['person_id']
+                for application in applications] == [2, 3]
+
+
+def test_summaries_refreshed_on_change(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    app.config['APPLICATION_SUMMARY_REFRESH'] = 'on_change'
+
+    with app.app_context():
+        first_state, stale = get_fresh_summary_state()
+        first_version = first_state.data_version
+        assert not stale
+
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        second_state, stale = get_fresh_summary_state()
+        assert stale
+        assert second_state.data_version == first_version
+        assert len(read_application_summaries()[1]) == 3
+    wait_for_background_refresh()
+
+    with app.app_context():
+        third_state, stale = get_fresh_summary_state()
+        assert not stale
+        assert third_state.data_version != first_version
+        assert len(read_application_summaries()[1]) == 4
+
+
+def test_refresh_stale_summaries_skips_fresh(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+
+    with app.app_context():
+        assert refresh_stale_summaries()
+        assert not refresh_stale_summaries()
+
+
+def test_scheduled_summaries_served_stale(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    app.config['APPLICATION_SUMMARY_REFRESH'] = 'scheduled'
+    app.config['APPLICATION_SUMMARY_MAX_AGE'] = 3600
+
+    with app.app_context():
+        get_fresh_summary_state()
+
+    setup_application_status_for_user1_in_db(app)
+
+    with app.app_context():
+        _, stale = get_fresh_summary_state()
+        assert stale
+        assert len(read_application_summaries()[1]) == 3
+
+    app.config['APPLICATION_SUMMARY_MAX_AGE'] = 0
+
+    with app.app_context():
+        _, stale = get_fresh_summary_state()
+        assert stale
+    wait_for_background_refresh()
+
+    with app.app_context():
+        _, stale = get_fresh_summary_state()
+        assert not stale
+        assert len(read_application_summaries()[1]) == 4
@@ -1,5 +1,9 @@
+import logging
 import os
 
+from app.app import create_app, reset_after_fork
+from app.extensions import database
+
 
 def test_app_initialization(app_with_client):
     app, _ = app_with_client
@@ -24,3 +28,27 @@ def test_blueprint_registration(app_with_client):
     app, _ = app_with_client
     blueprints = [bp.name for bp in app.blueprints.values()]
     assert 'applications' in blueprints
+    assert 'admin' in blueprints
+
+
+def test_create_app_opens_no_connections(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://user@unreachable:1/db')
+    app = create_app()
+
+    with app.app_context():
+        assert database.engine.pool.checkedin() == 0
+        assert database.engine.pool.checkedout() == 0
+
+
+def test_reset_after_fork(app_with_client):
+    app, test_client = app_with_client
+    test_client.get('/api/applications/')
+
+    with app.app_context():
+        pool = database.engine.pool
+    handlers = list(logging.getLogger().handlers)
+    reset_after_fork(app)
+
+    with app.app_context():
+        assert database.engine.pool is not pool
+    assert logging.getLogger().handlers != handlers
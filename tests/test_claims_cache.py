@@ -0,0 +1,72 @@
+import time
+from unittest.mock import patch
+
+from app.utilities.claims_cache import ClaimsCache
+
+
+def test_claims_cache_hit_and_miss():
+    cache = ClaimsCache()
+    assert cache.get('token') is None
+
+    cache.set('token', {'id': 1, 'role': 1})
+    assert cache.get('token') == {'id': 1, 'role': 1}
+    assert cache.get('other-token') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['entries'] == 1
+
+
+def test_claims_cache_token_expiry_checked_on_hit():
+    cache = ClaimsCache(ttl=60)
+    now = time.time()
+    cache.set('token', {'id': 1, 'exp': now + 30})
+
+    with patch('app.utilities.claims_cache.time.time') as mock:
+        mock.return_value = now + 29
+        assert cache.get('token') is not None
+        mock.return_value = now + 30
+        assert cache.get('token', leeway=5) is not None
+        assert cache.get('token') is None
+
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['entries'] == 0
+
+
+def test_claims_cache_ttl_expiry():
+    cache = ClaimsCache(ttl=10)
+
+    with patch('app.utilities.claims_cache.time.monotonic') as mock:
+        mock.return_value = 100
+        cache.set('token', {'id': 1})
+        mock.return_value = 109
+        assert cache.get('token') is not None
+        mock.return_value = 110
+        assert cache.get('token') is None
+
+
+def test_claims_cache_expired_tokens_not_stored():
+    cache = ClaimsCache()
+    cache.set('token', {'id': 1, 'exp': time.time() - 1})
+    assert cache.stats()['entries'] == 0
+
+
+def test_claims_cache_lru_eviction():
+    cache = ClaimsCache(max_entries=2)
+    cache.set('a', {'id': 1})
+    cache.set('b', {'id': 2})
+    cache.get('a')
+    cache.set('c', {'id': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_claims_cache_disabled():
+    cache = ClaimsCache(enabled=False)
+    cache.set('token', {'id': 1})
+    assert cache.get('token') is None
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,102 @@
+import csv
+
+from sqlalchemy import inspect, text
+
+from app.commands import create_missing_indexes, create_missing_tables
+from app.extensions import database
+from tests.utilities.utility_functions import \
+    setup_application_statuses_for_all_users, setup_three_users
+
+
+def get_index_names(table_name):
+    return {index['name'] for index in
+            inspect(database.engine).get_indexes(table_name)}
+
+
+def test_create_missing_indexes(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        # The GiST index on availability periods only exists on PostgreSQL.
+        indexes = ['ix_availability_person_id_from_date']
+        if database.engine.dialect.name == 'postgresql':
+            indexes.insert(0, 'ix_availability_period')
+
+        with database.engine.begin() as connection:
+            for index in indexes:
+                connection.execute(text(f'DROP INDEX {index}'))
+        assert not set(indexes) & get_index_names('availability')
+
+        assert create_missing_indexes() == indexes
+        assert set(indexes) <= get_index_names('availability')
+        assert create_missing_indexes() == []
+        assert not any(index.dialect_options['postgresql']['concurrently']
+                       for table in database.metadata.sorted_tables
+                       for index in table.indexes)
+
+
+def test_create_missing_tables(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        database.metadata.tables['application_summary'].drop(database.engine)
+        assert not inspect(database.engine).has_table('application_summary')
+
+        assert create_missing_tables() == ['application_summary']
+        assert inspect(database.engine).has_table('application_summary')
+        assert create_missing_tables() == []
+
+
+def test_create_schema_command(app_with_client):
+    app, _ = app_with_client
+
+    result = app.test_cli_runner().invoke(args=['create-schema'])
+
+    assert result.exit_code == 0
+    assert 'All tables already exist.' in result.output
+
+
+def test_create_indexes_command(app_with_client):
+    app, _ = app_with_client
+
+    result = app.test_cli_runner().invoke(args=['create-indexes'])
+
+    assert result.exit_code == 0
+    assert 'All indexes already exist.' in result.output
+
+
+def test_refresh_summaries_command(app_with_client):
+    app, _ = app_with_client
+
+    result = app.test_cli_runner().invoke(args=['refresh-summaries'])
+
+    assert result.exit_code == 0
+    assert 'Refreshed application summaries' in result.output
+
+
+def test_prune_changes_command(app_with_client):
+    app, _ = app_with_client
+
+    result = app.test_cli_runner().invoke(args=['prune-changes'])
+
+    assert result.exit_code == 0
+    assert 'Deleted 0 changes older than 7 days.' in result.output
+
+
+def test_export_applications_command(app_with_client, tmp_path):
+    app, _ = app_with_client
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    output = tmp_path / 'applications.csv'
+
+    result = app.test_cli_runner().invoke(args=[
+        'export-applications', '--output', str(output), '--exclude', 'pnr',
+        '--chunk-size', '2'])
+
+    assert result.exit_code == 0
+    assert f'Exported applications to {output}.' in result.output
+    with open(output, newline='') as file:
+        rows = list(csv.reader(file))
+    assert 'pnr' not in rows[0]
+    assert [row[3] for row in rows[1:]] == ['user1', 'user2', 'user3']
+    assert list(tmp_path.iterdir()) == [output]
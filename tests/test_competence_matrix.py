@@ -0,0 +1,62 @@
+import random
+
+from app.utilities.competence_matrix import CompetenceMatrix
+
+PROFILES = [
+    (1, 10, 1, 1.0),
+    (2, 10, 1, 4.0),
+    (3, 20, 2, 2.0),
+    (4, 30, 1, 2.0),
+    (5, 30, 2, 0.0),
+    (6, 40, 1, 4.0)
+]
+
+
+def test_top_ranks_qualified_persons():
+    matrix = CompetenceMatrix()
+    matrix.apply(PROFILES)
+
+    assert matrix.top({1: 2}, {}, 10) == [(10, 2.0), (40, 2.0), (30, 1.0)]
+    assert matrix.top({1: 2}, {}, 1) == [(10, 2.0)]
+    assert matrix.top({1: 1, 2: 0}, {2: 3}, 10) == [(30, 2.0)]
+    assert matrix.top({3: 1}, {}, 10) == []
+
+
+def test_experience_of():
+    matrix = CompetenceMatrix()
+    matrix.apply(PROFILES)
+
+    assert matrix.experience_of(10, [1, 2]) == {1: 4.0}
+    assert matrix.experience_of(30, [1, 2]) == {1: 2.0, 2: 0.0}
+
+
+def test_incremental_apply_matches_full_build():
+    generator = random.Random(0)
+    profiles = [(profile_id, generator.randint(1, 300),
+                 generator.randint(1, 6), generator.choice([0, 1, 2.5, 4]))
+                for profile_id in range(1, 3001)]
+
+    full_matrix = CompetenceMatrix()
+    full_matrix.apply(profiles)
+    incremental_matrix = CompetenceMatrix()
+    incremental_matrix.apply(profiles[:1000])
+    copied_matrix = incremental_matrix.copy()
+    copied_matrix.apply(profiles[1000:])
+
+    requirements = {1: 1, 4: 2.5}
+    assert copied_matrix.top(requirements, {}, 20) == \
+           full_matrix.top(requirements, {}, 20)
+
+
+def test_replace_matches_full_build():
+    matrix = CompetenceMatrix()
+    matrix.apply(PROFILES)
+    matrix.replace([10, 30], [(7, 30, 1, 3.0)])
+
+    expected_matrix = CompetenceMatrix()
+    expected_matrix.apply([profile for profile in PROFILES
+                           if profile[1] not in (10, 30)] + [(7, 30, 1, 3.0)])
+
+    assert matrix.top({1: 2}, {}, 10) == expected_matrix.top({1: 2}, {}, 10)
+    assert matrix.top({1: 2}, {}, 10) == [(40, 2.0), (30, 1.5)]
+    assert matrix.experience_of(10, [1, 2]) == {}
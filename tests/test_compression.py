@@ -0,0 +1,88 @@
+import gzip
+import json
+
+from app.extensions import compressor
+from app.utilities.compression import compress, compress_stream
+from tests.utilities.status_codes import StatusCodes
+from tests.utilities.utility_functions import generate_token_for_recruiter, \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, \
+    setup_competence_profiles_for_all_users, setup_three_users
+
+
+def setup_applications(app):
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+
+def get_applications(test_client, token, accept_encoding,
+                     query_string=None):
+    return test_client.get('/api/applications/',
+                           headers={'Authorization': f'Bearer {token}',
+                                    'Accept-Encoding': accept_encoding},
+                           query_string=query_string)
+
+
+def test_compress_round_trip():
+    data = b'{"key":"value"}' * 100
+    assert gzip.decompress(compress(data, 'gzip', 6)) == data
+
+
+def test_compress_stream_round_trip():
+    chunks = ['[', '{"key":"value"}', ',', '{"key":"value"}', ']']
+    compressed = b''.join(compress_stream(iter(chunks), 'gzip', 6))
+    assert gzip.decompress(compressed) == ''.join(chunks).encode()
+
+
+def test_response_compressed_above_min_size(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+    compressor.min_size = 100
+
+    token = generate_token_for_recruiter(app)
+    response = get_applications(test_client, token, 'gzip')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    applications = json.loads(gzip.decompress(response.get_data()))
+    assert len(applications) == 3
+
+
+def test_response_not_compressed_below_min_size(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+    compressor.min_size = 100000
+
+    token = generate_token_for_recruiter(app)
+    response = get_applications(test_client, token, 'gzip')
+
+    assert response.status_code == StatusCodes.OK
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.json) == 3
+
+
+def test_response_not_compressed_without_accepted_encoding(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+    compressor.min_size = 100
+
+    token = generate_token_for_recruiter(app)
+    response = get_applications(test_client, token, 'identity')
+
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.json) == 3
+
+
+def test_streamed_response_compressed(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+
+    token = generate_token_for_recruiter(app)
+    response = get_applications(test_client, token, 'gzip', {'stream': 1})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    applications = json.loads(gzip.decompress(response.get_data()))
+    assert len(applications) == 3
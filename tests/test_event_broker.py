@@ -0,0 +1,108 @@
+import queue
+import time
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+from app.extensions import database, event_broker
+from app.models.application import ApplicationStatus
+from app.utilities.event_broker import EventBroker, Subscription
+from tests.utilities.utility_functions import \
+    setup_application_status_for_user1_in_db, setup_three_users
+
+
+def make_broker(**config):
+    app = Flask(__name__)
+    app.config.update({'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+                       'APPLICATION_EVENTS_MAX_SUBSCRIBERS': 2,
+                       'APPLICATION_EVENTS_QUEUE_SIZE': 2}, **config)
+    memory_database = SQLAlchemy()
+    memory_database.init_app(app)
+    broker = EventBroker()
+    broker.init_app(app, memory_database)
+    return broker
+
+
+def test_broker_warns_without_subscribers(caplog):
+    make_broker(APPLICATION_EVENTS_MAX_SUBSCRIBERS=0)
+
+    assert 'APPLICATION_EVENTS_MAX_SUBSCRIBERS is 0' in caplog.text
+
+
+def test_broker_fans_out_events():
+    broker = make_broker()
+    first, second = broker.subscribe(), broker.subscribe()
+
+    broker.publish({'type': 'status_changed', 'person_id': 1})
+
+    assert broker.backend == 'memory'
+    assert first.get(0.1) == second.get(0.1) == \
+           {'type': 'status_changed', 'person_id': 1}
+    assert broker.subscribe() is None
+    broker.unsubscribe(first)
+    assert broker.subscribe() is not None
+    assert broker.stats()['published'] == 1
+
+
+def test_broker_closes_subscribers_that_fall_behind():
+    broker = make_broker()
+    subscription = broker.subscribe()
+
+    for person_id in range(3):
+        broker.publish({'type': 'application_created', 'person_id': person_id})
+
+    assert subscription.closed
+    assert [subscription.get(0.1) for _ in range(3)] == [
+        {'type': 'application_created', 'person_id': 0},
+        {'type': 'application_created', 'person_id': 1},
+        None]
+    assert broker.stats()['subscribers'] == 0
+    assert broker.stats()['closed_subscriptions'] == 1
+
+
+def test_subscription_get_times_out():
+    with pytest.raises(queue.Empty):
+        Subscription(1).get(0.01)
+
+
+def test_broker_unknown_backend():
+    with pytest.raises(ValueError):
+        make_broker(APPLICATION_EVENTS_BROKER='redis')
+
+
+def test_broker_listens_to_postgresql(app_with_client):
+    app, _ = app_with_client
+    setup_three_users(app)
+
+    with app.app_context():
+        if database.engine.dialect.name != 'postgresql':
+            pytest.skip('Notifications are only sent by PostgreSQL')
+
+    event_broker.max_subscribers = 1
+    subscription = event_broker.subscribe()
+    try:
+        deadline = time.monotonic() + 10
+        while not event_broker.stats()['listening'] and \
+                time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        setup_application_status_for_user1_in_db(app)
+        with app.app_context():
+            ApplicationStatus.query.one().status = 'Accepted'
+            database.session.commit()
+
+        created, changed = subscription.get(5), subscription.get(5)
+        assert created['type'] == 'application_created'
+        assert created['person_id'] == 1
+        assert created['status'] == 'Pending'
+        assert changed['type'] == 'status_changed'
+        assert changed['status'] == 'Accepted'
+
+        listener = event_broker._listener
+        event_broker.unsubscribe(subscription)
+        listener.join(5)
+        assert not listener.is_alive()
+        assert not event_broker.stats()['listening']
+    finally:
+        event_broker.stop()
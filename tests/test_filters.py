@@ -0,0 +1,44 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.utilities.filters import parse_filters
+
+
+def test_parse_filters_no_filters():
+    filters = parse_filters({})
+    assert not filters
+
+
+def test_parse_filters_all_filters():
+    filters = parse_filters({'status': 'Pending, Accepted',
+                             'competence_id': '2', 'min_years': '1.5',
+                             'available_from': '2024-03-01',
+                             'available_to': '2024-03-05'})
+
+    assert filters
+    assert filters.statuses == ['Pending', 'Accepted']
+    assert filters.competence_id == 2
+    assert filters.min_years == Decimal('1.5')
+    assert filters.available_from == date(2024, 3, 1)
+    assert filters.available_to == date(2024, 3, 5)
+
+
+def test_parse_filters_single_day_window():
+    filters = parse_filters({'available_to': '2024-03-05'})
+    assert filters.available_from == filters.available_to == date(2024, 3, 5)
+
+
+@pytest.mark.parametrize('args', [
+    {'competence_id': 'one'},
+    {'competence_id': '0'},
+    {'min_years': '-1'},
+    {'min_years': 'NaN'},
+    {'status': ','},
+    {'available_from': '01/03/2024'},
+    {'available_from': '2024-03-05', 'available_to': '2024-03-01'}
+])
+def test_parse_filters_invalid(args):
+    with pytest.raises(ValueError, match='INVALID_FILTER'):
+        parse_filters(args)
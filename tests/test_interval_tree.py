@@ -0,0 +1,44 @@
+import random
+
+from app.utilities.interval_tree import IntervalTree
+
+
+def generate_intervals(count, seed):
+    generator = random.Random(seed)
+    intervals = []
+    for value in range(count):
+        start = generator.randint(0, 1000)
+        intervals.append((start, start + generator.randint(0, 50), value))
+    return intervals
+
+
+def test_empty_tree():
+    tree = IntervalTree([])
+    assert tree.size == 0
+    assert tree.overlapping(0, 10) == []
+    assert tree.covering(0, 10) == []
+
+
+def test_overlapping_and_covering():
+    tree = IntervalTree([(1, 2, 'a'), (4, 5, 'b'), (2, 3, 'c'), (3, 4, 'd')])
+
+    assert sorted(tree.overlapping(2, 2)) == ['a', 'c']
+    assert sorted(tree.overlapping(4, 10)) == ['b', 'd']
+    assert tree.covering(2, 3) == ['c']
+    assert tree.covering(1, 5) == []
+
+
+def test_matches_naive_scan():
+    intervals = generate_intervals(2000, seed=1)
+    tree = IntervalTree(intervals)
+    generator = random.Random(2)
+
+    for _ in range(200):
+        start = generator.randint(-10, 1060)
+        end = start + generator.randint(0, 30)
+        assert sorted(tree.overlapping(start, end)) == sorted(
+                value for low, high, value in intervals
+                if low <= end and high >= start)
+        assert sorted(tree.covering(start, end)) == sorted(
+                value for low, high, value in intervals
+                if low <= start and high >= end)
@@ -0,0 +1,88 @@
+import dataclasses
+import datetime as dt
+import uuid
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from app.utilities.json_provider import InstrumentedJSONProvider
+
+
+@dataclasses.dataclass
+class Point:
+    y: int
+    x: int
+
+
+DOCUMENTS = [
+    {'personal_info': {'person_id': 1, 'name': 'Åsa', 'surname': 'Öberg',
+                       'pnr': '19900101-1234', 'email': None},
+     'competences': [{'competence_id': 1,
+                      'years_of_experience': Decimal('3.50')}],
+     'availabilities': [{'from_date': '2024-03-01',
+                         'to_date': '2024-03-02'}],
+     'status': 'unhandled'},
+    {'b': 1, 'a': [True, False, None, 0.75, -0.0, 1.0, 12345678.9]},
+    {'text': 'emoji \U0001f600, line separator  , delete \x7f, '
+             'control \x01\b\f\n\r\t "quoted" \\ /'},
+    {'date': dt.date(2024, 3, 1), 'datetime': dt.datetime(2024, 3, 1, 12),
+     'uuid': uuid.UUID(int=1), 'point': Point(2, 1)},
+    {'floats': [1e16, 1e-5, -1.14e35, 5e-324, 0.0001]},
+    {'big': 2 ** 70},
+    {2: 'integer key', 1: None},
+    [[], {}, '', 'plain']
+]
+
+
+@pytest.fixture
+def providers(app_with_client):
+    app, _ = app_with_client
+    return InstrumentedJSONProvider(app), DefaultJSONProvider(app)
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_dumps_matches_default_provider(providers, document):
+    provider, default_provider = providers
+
+    for kwargs in ({}, {'separators': (',', ':')}):
+        assert provider.dumps(document, **kwargs) == \
+               default_provider.dumps(document, **kwargs)
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_response_matches_default_provider(providers, document):
+    provider, default_provider = providers
+
+    with provider._app.test_request_context():
+        response = provider.response(document)
+        default_response = default_provider.response(document)
+
+    assert response.get_data() == default_response.get_data()
+    assert response.mimetype == default_response.mimetype
+
+
+def test_dumps_compact_uses_orjson(providers):
+    provider, _ = providers
+
+    assert provider.fast
+    assert provider.dumps_compact({'b': 'é', 'a': 1}) == \
+           b'{"a":1,"b":"\\u00e9"}'
+    assert provider.dumps_compact({'float': 1e16}) is None
+    for value in (1e-5, [-2e-7], 1.5e300):
+        assert provider.dumps_compact(value) is None
+    assert provider.dumps_compact(
+            {'name': 'Anne-Marie', 'email': 'berge2@example.com',
+             'years': [0.5, 12.0]}) == \
+           b'{"email":"berge2@example.com","name":"Anne-Marie",' \
+           b'"years":[0.5,12.0]}'
+
+
+def test_stdlib_serializer_setting(app_with_client):
+    app, _ = app_with_client
+    app.config['JSON_SERIALIZER'] = 'stdlib'
+
+    provider = InstrumentedJSONProvider(app)
+    assert not provider.fast
+    assert provider.dumps_compact({'a': 1}) is None
+    assert provider.dumps({'a': 1}, separators=(',', ':')) == '{"a":1}'
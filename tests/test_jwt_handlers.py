@@ -1,7 +1,11 @@
 import datetime
+import inspect
+from unittest.mock import patch
 
-from flask_jwt_extended import create_access_token
+import flask_jwt_extended.utils
+from flask_jwt_extended import JWTManager, create_access_token
 
+from app.extensions import jwt
 from tests.utilities.status_codes import StatusCodes
 from tests.utilities.utility_functions import generate_token_for_person_id_1, \
     generate_token_for_recruiter, post_request_applications_endpoint, \
@@ -55,3 +59,52 @@ def test_unauthorized_request(app_with_client):
     response = test_client.get('/api/applications/')
     assert response.status_code == StatusCodes.UNAUTHORIZED
     assert response.json['error'] == 'UNAUTHORIZED'
+
+
+def test_decode_jwt_from_config_signature():
+    # CachingJWTManager overrides this private method, so an upgrade of
+    # Flask-JWT-Extended that changes it must fail here.
+    assert list(inspect.signature(
+            JWTManager._decode_jwt_from_config).parameters) == [
+        'self', 'encoded_token', 'csrf_value', 'allow_expired']
+    assert '_decode_jwt_from_config(encoded_token, csrf_value, ' \
+           'allow_expired)' in \
+           inspect.getsource(flask_jwt_extended.utils.decode_token)
+
+
+def test_verified_claims_cached(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with patch('app.jwt_handlers.JWTManager._decode_jwt_from_config',
+               autospec=True,
+               side_effect=JWTManager._decode_jwt_from_config) as decode:
+        first_response = test_client.get('/api/admin/cache', headers=headers)
+        second_response = test_client.get('/api/admin/cache', headers=headers)
+
+    assert first_response.status_code == StatusCodes.OK
+    assert second_response.status_code == StatusCodes.OK
+    assert decode.call_count == 1
+    assert jwt.claims_cache.stats()['hits'] == 1
+
+
+def test_invalid_and_expired_tokens_not_cached(app_with_client):
+    app, test_client = app_with_client
+
+    with app.app_context():
+        expired_token = create_access_token(
+                identity=None,
+                additional_claims={'id': 1, 'role': 1},
+                expires_delta=datetime.timedelta(days=-1))
+    invalid_token = generate_token_for_recruiter(app) + 'invalid'
+
+    for token, error in ((expired_token, 'TOKEN_EXPIRED'),
+                         (invalid_token, 'INVALID_TOKEN')):
+        for _ in range(2):
+            response = post_request_applications_endpoint(test_client, token)
+            assert response.json['error'] == error
+
+    assert jwt.claims_cache.stats()['entries'] == 0
+    assert jwt.claims_cache.stats()['hits'] == 0
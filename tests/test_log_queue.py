@@ -0,0 +1,120 @@
+import logging
+import queue
+import sys
+
+import pytest
+from flask import Flask
+
+from app.utilities.log_queue import BoundedQueueHandler, LogQueue, \
+    SamplingFilter
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(message, *args, level=logging.INFO):
+    return logging.makeLogRecord({'msg': message, 'args': args,
+                                  'levelno': level,
+                                  'levelname': logging.getLevelName(level)})
+
+
+def make_app(**config):
+    app = Flask(__name__)
+    app.config.update(config)
+    return app
+
+
+def test_log_queue_writes_records_on_listener_thread():
+    log_queue = LogQueue()
+    output_handler = CollectingHandler()
+    log_queue.init_app(make_app(), output_handler)
+
+    logging.getLogger().setLevel(logging.INFO)
+    arguments = ['127.0.0.1']
+    logging.info('%s - Responding with applications.', arguments[0])
+    arguments[0] = 'changed'
+    log_queue.stop()
+
+    messages = [record.getMessage() for record in output_handler.records]
+    assert '127.0.0.1 - Responding with applications.' in messages
+    assert log_queue.stats()['queued'] == 0
+
+
+def test_log_queue_replaces_previous_pipeline():
+    log_queue = LogQueue()
+    root_handlers = len(logging.getLogger().handlers)
+
+    log_queue.init_app(make_app(), CollectingHandler())
+    log_queue.init_app(make_app(), CollectingHandler())
+    assert len(logging.getLogger().handlers) == root_handlers + 1
+
+    log_queue.stop()
+    assert len(logging.getLogger().handlers) == root_handlers
+
+
+def test_log_queue_disabled_attaches_output_handler():
+    log_queue = LogQueue()
+    output_handler = CollectingHandler()
+    log_queue.init_app(make_app(LOG_QUEUE_ENABLED=False), output_handler)
+
+    assert output_handler in logging.getLogger().handlers
+    log_queue.stop()
+    assert output_handler not in logging.getLogger().handlers
+
+
+def test_bounded_queue_handler_drops_and_reports():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue)
+
+    for number in range(4):
+        handler.handle(make_record('record %d', number))
+    assert handler.dropped == 2
+
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+    handler.handle(make_record('record %d', 4))
+
+    warning = log_queue.get_nowait()
+    assert warning.levelno == logging.WARNING
+    assert warning.getMessage() == 'Log queue full, dropped 2 records'
+    assert log_queue.get_nowait().getMessage() == 'record 4'
+
+
+def test_bounded_queue_handler_renders_message_and_traceback():
+    handler = BoundedQueueHandler(queue.Queue())
+
+    try:
+        raise ValueError('broken')
+    except ValueError:
+        record = make_record('%s - failed', '127.0.0.1', level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+
+    prepared = handler.prepare(record)
+    assert prepared.msg == '127.0.0.1 - failed'
+    assert prepared.args is None
+    assert prepared.exc_info is None
+    assert 'ValueError: broken' in prepared.exc_text
+    assert record.exc_info is not None
+
+
+def test_bounded_queue_handler_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), 'discard')
+
+
+def test_sampling_filter_only_samples_info():
+    sampling_filter = SamplingFilter(0)
+
+    assert not sampling_filter.filter(make_record('info'))
+    assert sampling_filter.filter(make_record('debug', level=logging.DEBUG))
+    assert sampling_filter.filter(make_record('warning',
+                                              level=logging.WARNING))
+    assert sampling_filter.sampled_out == 1
+
+    assert SamplingFilter(1).filter(make_record('info'))
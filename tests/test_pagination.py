@@ -0,0 +1,32 @@
+import pytest
+
+from app.utilities.pagination import decode_change_token, decode_cursor, \
+    encode_change_token, encode_cursor
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_decode_cursor_none():
+    assert decode_cursor(None) is None
+    assert decode_cursor('') is None
+
+
+def test_decode_cursor_invalid():
+    for cursor in ('not-a-cursor', encode_cursor(1)[:-2], 'e30',
+                   'eyJhZnRlciI6ICJ4In0'):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+def test_change_token_round_trip():
+    assert decode_change_token(encode_change_token(42, 7, 1700000000.5)) == \
+           (42, 7, 1700000000)
+
+
+def test_decode_change_token_invalid():
+    for token in ('not-a-token', encode_change_token(1, 0, 0)[:-2], 'e30',
+                  encode_cursor(1)):
+        with pytest.raises(ValueError):
+            decode_change_token(token)
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from app.extensions import database
+from app.utilities.pool_metrics import InstrumentedQueuePool, \
+    PoolStatistics, instrument_engine_options
+
+
+def create_pool(pool_size, max_overflow):
+    return InstrumentedQueuePool(lambda: sqlite3.connect(':memory:'),
+                                 pool_size=pool_size,
+                                 max_overflow=max_overflow, timeout=0.01)
+
+
+def test_pool_records_checkouts():
+    pool = create_pool(pool_size=1, max_overflow=1)
+
+    first_connection = pool.connect()
+    second_connection = pool.connect()
+    metrics = pool.metrics()
+
+    assert metrics['checkouts'] == 2
+    assert metrics['overflow_checkouts'] == 1
+    assert metrics['in_use'] == 2
+    assert metrics['peak_in_use'] == 2
+    assert sum(metrics['wait_ms_buckets'].values()) == 2
+
+    first_connection.close()
+    second_connection.close()
+    assert pool.metrics()['in_use'] == 0
+
+
+def test_pool_records_timeouts():
+    pool = create_pool(pool_size=1, max_overflow=0)
+    connection = pool.connect()
+
+    with pytest.raises(TimeoutError):
+        pool.connect()
+
+    metrics = pool.metrics()
+    assert metrics['timeouts'] == 1
+    assert metrics['max_wait_ms'] >= 10
+    connection.close()
+
+
+def test_pool_statistics_wait_buckets():
+    statistics = PoolStatistics()
+    statistics.record_checkout(0.0005, 1, False)
+    statistics.record_checkout(0.2, 1, False)
+    statistics.record_timeout(5)
+
+    buckets = statistics.as_dict()['wait_ms_buckets']
+    assert buckets['1'] == 1
+    assert buckets['500'] == 1
+    assert buckets['inf'] == 1
+
+
+def test_engine_uses_instrumented_pool(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        pool = database.engine.pool
+        assert isinstance(pool, InstrumentedQueuePool)
+        assert pool.size() == app.config['SQLALCHEMY_POOL_SIZE']
+
+
+def test_instrument_engine_options():
+    options = {'pool_size': 5, 'max_overflow': 1, 'pool_recycle': 1800}
+    instrument_engine_options(options, 'postgresql://localhost/recruiter')
+    assert options['poolclass'] is InstrumentedQueuePool
+    assert options['pool_size'] == 5
+
+    options = {'pool_size': 5, 'max_overflow': 1, 'pool_recycle': 1800}
+    instrument_engine_options(options, 'sqlite://')
+    assert options == {'pool_recycle': 1800}
+    engine = create_engine('sqlite://', **options)
+    assert not isinstance(engine.pool, InstrumentedQueuePool)
+    engine.dispose()
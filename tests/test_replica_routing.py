@@ -0,0 +1,159 @@
+import datetime as dt
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.app import create_app
+from app.extensions import database, replica_router
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.person import Person
+from app.repositories.applications_repository import \
+    get_application_status_chunks_from_db, get_personal_info_from_db, \
+    get_persons_from_db
+from app.utilities.replica_routing import REPLICA_READS
+from tests.utilities.status_codes import StatusCodes
+from tests.utilities.utility_functions import cleanup_db, \
+    generate_token_for_recruiter, setup_user1_in_db
+
+
+@pytest.fixture(scope='function')
+def create_app_with_replica(postgres, monkeypatch):
+    apps = []
+
+    def create(replica_url):
+        monkeypatch.setenv('DATABASE_URL', postgres.get_connection_url())
+        monkeypatch.setenv('DATABASE_REPLICA_URL', replica_url)
+        app = create_app()
+        app.config.update({'TESTING': True,
+                           'JWT_SECRET_KEY': 'your-test-secret-key'})
+        with app.app_context():
+            database.create_all(bind_key=None)
+        apps.append(app)
+        setup_user1_in_db(app)
+        return app
+
+    yield create
+
+    for app in apps:
+        with app.app_context():
+            cleanup_db(app)
+            database.session.remove()
+            database.drop_all(bind_key=None)
+    # Apps without a replica must not try to create its (empty) metadata.
+    database.metadatas.pop('replica', None)
+
+
+def setup_replica(app):
+    with app.app_context():
+        replica = database.engines['replica']
+        database.metadata.create_all(replica)
+        with replica.begin() as connection:
+            connection.execute(insert(Person), [
+                {'person_id': 1, 'name': 'replica', 'surname': 's1',
+                 'pnr': '1'}])
+            connection.execute(insert(ApplicationStatus), [
+                {'application_status_id': 1, 'person_id': 1,
+                 'status': 'Accepted'}])
+            connection.execute(insert(Availability), [
+                {'person_id': 1, 'from_date': dt.date(2024, 3, 1),
+                 'to_date': dt.date(2024, 3, 2)}])
+
+
+def test_reads_routed_to_replica(create_app_with_replica, tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/replica.db')
+    setup_replica(app)
+
+    with app.app_context():
+        assert get_personal_info_from_db(1).name == 'replica'
+        assert get_persons_from_db([1])[1].name == 'replica'
+        for chunk in get_application_status_chunks_from_db(10):
+            assert [entry.status for entry in chunk] == ['Accepted']
+            assert not database.session.info.get(REPLICA_READS)
+            assert database.session.get(Person, 1).name == 'user1'
+        assert database.session.get(Person, 1).name == 'user1'
+
+    stats = replica_router.stats()
+    assert stats['enabled']
+    assert stats['replica_reads'] == 3
+    assert stats['lag_seconds'] == 0
+
+
+def test_application_detail_read_from_replica(create_app_with_replica,
+                                              tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/replica.db')
+    setup_replica(app)
+
+    token = generate_token_for_recruiter(app)
+    response = app.test_client().get(
+            '/api/applications/1',
+            headers={'Authorization': f'Bearer {token}'})
+    batch_response = app.test_client().get(
+            '/api/applications/batch', query_string={'person_ids': '1'},
+            headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['personal_info']['name'] == 'replica'
+    assert response.json['status'] == 'Accepted'
+    assert batch_response.json == [response.json]
+
+
+def test_writes_never_routed_to_replica(create_app_with_replica, tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/replica.db')
+
+    with app.app_context():
+        session = database.session()
+        session.info[REPLICA_READS] = True
+        assert session.get_bind(clause=select(Person)) is \
+               database.engines['replica']
+        assert session.get_bind(clause=insert(Person)) is database.engine
+
+
+def test_reads_fall_back_to_primary_on_replica_failure(
+        create_app_with_replica, tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/missing/replica.db')
+
+    with app.app_context():
+        database.session.add(ApplicationStatus(1))
+        database.session.flush()
+        assert get_personal_info_from_db(1).name == 'user1'
+        assert get_personal_info_from_db(1).name == 'user1'
+        database.session.commit()
+        assert ApplicationStatus.query.count() == 1
+
+    stats = replica_router.stats()
+    assert not stats['healthy']
+    assert stats['failures'] >= 1
+    assert stats['fallbacks'] == 1
+    assert stats['replica_reads'] == 1
+    assert stats['primary_reads'] == 1
+
+
+def test_generator_reads_fall_back_to_primary_on_replica_failure(
+        create_app_with_replica, tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/missing/replica.db')
+
+    with app.app_context():
+        database.session.add(ApplicationStatus(1))
+        database.session.commit()
+
+        assert [[entry.status for entry in chunk] for chunk in
+                get_application_status_chunks_from_db(10)] == [['Pending']]
+
+    stats = replica_router.stats()
+    assert stats['failures'] >= 1
+    assert stats['fallbacks'] == 1
+
+
+def test_lagging_replica_steers_reads_to_primary(create_app_with_replica,
+                                                 tmp_path):
+    app = create_app_with_replica(f'sqlite:///{tmp_path}/replica.db')
+    setup_replica(app)
+    replica_router.max_lag = -1
+
+    with app.app_context():
+        assert get_personal_info_from_db(1).name == 'user1'
+
+    stats = replica_router.stats()
+    assert stats['healthy']
+    assert stats['primary_reads'] == 1
@@ -0,0 +1,90 @@
+import json
+import logging
+
+from app.extensions import request_metrics
+from tests.utilities.status_codes import StatusCodes
+from tests.utilities.utility_functions import generate_token_for_recruiter, \
+    post_request_applications_endpoint, \
+    setup_application_statuses_for_all_users, \
+    setup_availabilities_for_all_users, \
+    setup_competence_profiles_for_all_users, setup_three_users
+
+
+def setup_applications(app):
+    setup_three_users(app)
+    setup_application_statuses_for_all_users(app)
+    setup_availabilities_for_all_users(app)
+    setup_competence_profiles_for_all_users(app)
+
+
+def test_server_timing_header(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+    request_metrics.server_timing = True
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+
+    assert response.status_code == StatusCodes.OK
+    server_timing = response.headers['Server-Timing']
+    assert 'db;dur=' in server_timing
+    assert 'serialize;dur=' in server_timing
+    assert 'total;dur=' in server_timing
+
+
+def test_server_timing_header_disabled(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+    request_metrics.server_timing = False
+
+    token = generate_token_for_recruiter(app)
+    response = post_request_applications_endpoint(test_client, token)
+
+    assert 'Server-Timing' not in response.headers
+
+
+def test_request_metrics_logged(app_with_client, caplog):
+    app, test_client = app_with_client
+    setup_applications(app)
+
+    token = generate_token_for_recruiter(app)
+    with caplog.at_level(logging.INFO):
+        post_request_applications_endpoint(test_client, token)
+
+    lines = [record.getMessage() for record in caplog.records
+             if record.getMessage().startswith('request_metrics ')]
+    metrics = json.loads(lines[-1].split(' ', 1)[1])
+    assert metrics['route'] == '/api/applications/'
+    assert metrics['status'] == StatusCodes.OK
+    assert metrics['query_count'] > 0
+    assert metrics['db_ms'] >= metrics['slowest_query_ms']
+    assert metrics['total_ms'] >= metrics['db_ms']
+
+
+def test_slow_query_logged_without_parameters(app_with_client, caplog):
+    app, test_client = app_with_client
+    setup_applications(app)
+    request_metrics.slow_query_threshold = 0
+
+    token = generate_token_for_recruiter(app)
+    with caplog.at_level(logging.WARNING):
+        post_request_applications_endpoint(test_client, token)
+
+    slow_queries = [record.getMessage() for record in caplog.records
+                    if record.getMessage().startswith('Slow query')]
+    assert slow_queries
+    assert all('parameters redacted' in message for message in slow_queries)
+
+
+def test_route_stats_in_admin_metrics(app_with_client):
+    app, test_client = app_with_client
+    setup_applications(app)
+
+    token = generate_token_for_recruiter(app)
+    post_request_applications_endpoint(test_client, token)
+    response = test_client.get('/api/admin/metrics',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    stats = response.json['routes']['GET /api/applications/']
+    assert stats['requests'] == 1
+    assert stats['queries'] > 0
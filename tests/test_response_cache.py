@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+from app.utilities.response_cache import ResponseCache
+
+
+def test_response_cache_hit_and_miss():
+    cache = ResponseCache()
+    assert cache.get('key') is None
+
+    cache.set('key', b'body', 200)
+    entry = cache.get('key')
+    assert entry.body == b'body'
+    assert entry.status_code == 200
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+    assert stats['bytes'] == 4
+
+
+def test_response_cache_ttl_expiry():
+    cache = ResponseCache(ttl=10)
+
+    with patch('app.utilities.response_cache.time.monotonic') as mock:
+        mock.return_value = 100
+        cache.set('key', b'body', 200)
+        mock.return_value = 109
+        assert cache.get('key') is not None
+        mock.return_value = 110
+        assert cache.get('key') is None
+
+    assert cache.stats()['bytes'] == 0
+
+
+def test_response_cache_lru_eviction():
+    cache = ResponseCache(max_bytes=10)
+    cache.set('a', b'aaaa', 200)
+    cache.set('b', b'bbbb', 200)
+    cache.get('a')
+    cache.set('c', b'cccc', 200)
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_response_cache_rejects_oversized_body():
+    cache = ResponseCache(max_bytes=3)
+    cache.set('key', b'body', 200)
+    assert cache.get('key') is None
+
+
+def test_response_cache_invalidate():
+    cache = ResponseCache()
+    cache.set('a', b'a', 200)
+    cache.set('b', b'b', 200)
+
+    cache.invalidate('a')
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+
+    cache.invalidate()
+    assert cache.get('b') is None
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_response_cache_disabled():
+    cache = ResponseCache(enabled=False)
+    cache.set('key', b'body', 200)
+    assert cache.get('key') is None
@@ -1,6 +1,10 @@
 class StatusCodes:
     OK = 200
     PARTIAL_CONTENT = 206
+    NOT_MODIFIED = 304
+    BAD_REQUEST = 400
     UNAUTHORIZED = 401
     NOT_FOUND = 404
+    GONE = 410
     INTERNAL_SERVER_ERROR = 500
+    SERVICE_UNAVAILABLE = 503
@@ -1,6 +1,8 @@
 import datetime as dt
+from contextlib import contextmanager
 
 from flask_jwt_extended import create_access_token
+from sqlalchemy import event
 
 from app.extensions import database
 from app.models.application import ApplicationStatus
@@ -166,6 +168,23 @@ def cleanup_db(app):
     remove_users_from_db(app)
 
 
-def post_request_applications_endpoint(test_client, token):
+def post_request_applications_endpoint(test_client, token, query_string=None):
     return test_client.get('/api/applications/',
-                           headers={'Authorization': f'Bearer {token}'})
+                           headers={'Authorization': f'Bearer {token}'},
+                           query_string=query_string)
+
+
+@contextmanager
+def capture_queries(app):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = database.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)